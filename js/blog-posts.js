@@ -1,5 +1,4 @@
 import { hydrateListViewCounts } from './blog/list.js';
-import { processPostPage } from './blog/post-page.js';
 
 export const BlogPosts = {
     async loadList() {
@@ -17,5 +16,8 @@ export const BlogPosts = {
             hydrateListViewCounts(combinedContainer);
         }
     },
-    processPostPage
+    async processPostPage(slug) {
+        const { processPostPage } = await import('./blog/post-page.js');
+        await processPostPage(slug);
+    }
 };
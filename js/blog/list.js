@@ -1,18 +1,27 @@
 import { ViewCount } from '../viewcount.js';
 
 export function hydrateListViewCounts(container) {
-    const viewElements = container.querySelectorAll('[data-post-id]');
+    const viewElements = Array.from(container.querySelectorAll('[data-post-id]'));
     if (viewElements.length === 0) return;
 
-    // Show cached counts immediately (fast), then refresh from the API.
+    // The build bakes a snapshot into data-views; a newer cached count wins.
+    const render = (element, count) => {
+        const baked = Number(element.getAttribute('data-views')) || 0;
+        const formatted = ViewCount.format(Math.max(baked, count));
+        if (element.textContent !== formatted) {
+            element.textContent = formatted;
+        }
+    };
+
     viewElements.forEach((element) => {
-        const postSlug = element.getAttribute('data-post-id');
-        const cachedCount = ViewCount.getCached(postSlug);
-        element.textContent = ViewCount.format(cachedCount);
+        render(element, ViewCount.getCached(element.getAttribute('data-post-id')));
     });
 
-    viewElements.forEach((element) => {
-        const postSlug = element.getAttribute('data-post-id');
-        ViewCount.updateElement(element, postSlug);
+    // Refresh the whole list with a single request.
+    const postSlugs = [...new Set(viewElements.map((element) => element.getAttribute('data-post-id')))];
+    ViewCount.fetchMany(postSlugs).then((counts) => {
+        viewElements.forEach((element) => {
+            render(element, counts[element.getAttribute('data-post-id')] || 0);
+        });
     });
 }
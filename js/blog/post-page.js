@@ -1,6 +1,6 @@
 import { Links } from '../core.js';
 import { CodeBlocks } from '../code.js';
-import { Images, SectionBreadcrumb, Tables, TableOfContents } from '../content.js';
+import { Images, SectionBreadcrumb, TableOfContents } from '../content.js';
 import { Navigation } from '../navigation.js';
 import { PostMeta } from './post-meta.js';
 
@@ -26,11 +26,10 @@ export async function processPostPage(slug) {
 }
 
 async function enhanceContent(container, slug) {
-    TableOfContents.generate(container);
+    TableOfContents.init(container);
     SectionBreadcrumb.init(container);
     await CodeBlocks.processAll(container);
     CodeBlocks.processInline(container);
-    Tables.enhance(container);
     // Update theme-aware images and apply lazy/async attributes
     Images.processThemeAware(container);
     Links.ensurePointerForLinkOnlyListItems(container);
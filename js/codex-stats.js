@@ -1,6 +1,10 @@
 // Codex Stats — chart rendering for /codex-stats page.
 
-const DATA_URL = 'https://api.gusarich.com/api/codex-stats';
+// Columnar snapshot written by `generate_blog.py --codex-stats` (content-hashed
+// on export). Until one exists, the live API is aggregated in the browser.
+const DATA_URL = '/assets/codex-stats.json';
+const DATA_VERSION = 2; // Keep in sync with CODEX_STATS_VERSION (sitegen/config.py).
+const LIVE_DATA_URL = 'https://api.gusarich.com/api/codex-stats';
 const CHART_JS_URL = 'https://cdn.jsdelivr.net/npm/chart.js@4/dist/chart.umd.min.js';
 
 // Colorblind-safe palette (Paul Tol's muted qualitative).
@@ -72,63 +76,112 @@ function fmtFullDate(d) {
     return `${MONTHS[parseInt(parts[1], 10) - 1]} ${parseInt(parts[2], 10)}, ${parts[0]}`;
 }
 
-function localISODate(d) {
-    return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
+function addDaysIso(iso, days) {
+    const d = new Date(iso + 'T00:00:00Z');
+    d.setUTCDate(d.getUTCDate() + days);
+    return d.toISOString().slice(0, 10);
 }
 
-// --- Aggregation ---
+// --- Aggregation (fallback only; mirrors sitegen/codex_stats.py) ---
 
-function isoWeekStart(dateStr) {
-    const d = new Date(dateStr + 'T00:00:00');
-    const day = d.getDay();
-    const diff = (day === 0 ? -6 : 1) - day; // Monday = start of week
-    d.setDate(d.getDate() + diff);
-    return d.toISOString().slice(0, 10);
-}
+const MODES = ['daily', 'weekly', 'monthly'];
 
 function bucketKey(dayStr, mode) {
     if (mode === 'daily') return dayStr;
-    if (mode === 'weekly') return isoWeekStart(dayStr);
-    // monthly
-    return dayStr.slice(0, 7);
-}
-
-function bucketLabel(key, mode) {
-    if (mode === 'daily') return fmtDate(key);
     if (mode === 'weekly') {
-        // Show "Mon DD" of week start
-        return fmtDate(key);
+        const day = new Date(dayStr + 'T00:00:00Z').getUTCDay();
+        return addDaysIso(dayStr, day === 0 ? -6 : 1 - day); // Monday = start of week
     }
-    // monthly — "Jan 2026"
-    const parts = key.split('-');
-    return `${MONTHS[parseInt(parts[1], 10) - 1]} ${parts[0]}`;
+    // monthly
+    return dayStr.slice(0, 7);
 }
 
-function aggregateBuckets(days, mode) {
-    if (mode === 'daily') return days;
-
+function buildSeries(days, mode, models) {
     const map = new Map();
     for (const d of days) {
         const key = bucketKey(d.day, mode);
-        if (!map.has(key)) {
-            map.set(key, { day: key, tokens: 0, models: {} });
-        }
+        if (!map.has(key)) map.set(key, { tokens: 0, models: {} });
         const b = map.get(key);
         b.tokens += d.tokens;
         for (const [m, v] of Object.entries(d.models)) {
             b.models[m] = (b.models[m] || 0) + v;
         }
     }
+    const keys = [...map.keys()].sort(); // Source days aren't guaranteed to be in order
+    const buckets = keys.map(key => map.get(key));
+    return {
+        keys,
+        tokens: buckets.map(b => Math.round(b.tokens)),
+        models: models.map(m => buckets.map(b => Math.round(b.models[m] || 0))),
+    };
+}
 
-    const result = [];
-    for (const b of map.values()) {
-        b.tokens = Math.round(b.tokens);
-        for (const m of Object.keys(b.models)) {
-            b.models[m] = Math.round(b.models[m]);
+function buildActivityYear(year, tokensByDay) {
+    const first = `${year}-01-01`;
+    const firstDay = new Date(first + 'T00:00:00Z').getUTCDay();
+    const start = addDaysIso(first, firstDay === 0 ? -6 : 1 - firstDay);
+    const lastDay = new Date(`${year}-12-31T00:00:00Z`).getUTCDay();
+    const end = addDaysIso(`${year}-12-31`, lastDay === 0 ? 0 : 7 - lastDay);
+
+    const tokens = [];
+    for (let iso = start; iso <= end; iso = addDaysIso(iso, 1)) {
+        tokens.push(tokensByDay[iso] || 0);
+    }
+
+    // Intensity levels via quartiles of non-zero values
+    const nonZero = tokens.filter(t => t > 0).sort((a, b) => a - b);
+    const thresholds = [0.25, 0.5, 0.75].map(f => nonZero[Math.floor(nonZero.length * f)] || 0);
+    const levels = tokens.map(t => (t === 0 ? 0 : 1 + thresholds.filter(th => t > th).length)).join('');
+    return { start, tokens, levels };
+}
+
+function compactStats(raw) {
+    const days = (raw.days || []).filter(d => d.day).map(d => ({
+        day: d.day,
+        tokens: d.tokens || 0,
+        models: d.models || {},
+    }));
+    const totals = {};
+    for (const d of days) {
+        for (const [m, v] of Object.entries(d.models)) totals[m] = (totals[m] || 0) + v;
+    }
+    const models = Object.keys(totals).sort((a, b) => totals[b] - totals[a]);
+
+    const tokensByDay = {};
+    for (const d of days) tokensByDay[d.day] = d.tokens;
+    const activity = {};
+    for (const year of [...new Set(days.map(d => d.day.slice(0, 4)))].sort()) {
+        activity[year] = buildActivityYear(Number(year), tokensByDay);
+    }
+
+    return {
+        version: DATA_VERSION,
+        generatedAt: raw.generatedAt || (days.length ? days[days.length - 1].day : ''),
+        models,
+        series: Object.fromEntries(MODES.map(mode => [mode, buildSeries(days, mode, models)])),
+        activity,
+    };
+}
+
+function bucketLabel(key, mode) {
+    if (mode === 'daily' || mode === 'weekly') return fmtDate(key); // weekly: "Mon DD" of week start
+    // monthly — "Jan 2026"
+    const parts = key.split('-');
+    return `${MONTHS[parseInt(parts[1], 10) - 1]} ${parts[0]}`;
+}
+
+async function loadData() {
+    try {
+        const resp = await fetch(DATA_URL);
+        if (resp.ok) {
+            const data = await resp.json();
+            if (data.version === DATA_VERSION) return data;
         }
-        result.push(b);
+    } catch {
+        // No snapshot deployed yet; use the live API.
     }
-    return result;
+    const resp = await fetch(LIVE_DATA_URL);
+    return compactStats(await resp.json());
 }
 
 // --- Chart.js loading ---
@@ -223,182 +276,98 @@ function getActivityTooltip() {
     return activityTooltip;
 }
 
-function renderActivityGraph(days, generatedAt) {
-    const container = document.getElementById('activity-graph');
-    if (!container) return;
-
-    const dayMap = {};
-    for (const d of days) dayMap[d.day] = d.tokens;
-
-    const today = new Date((generatedAt || days[days.length - 1].day) + 'T00:00:00');
-    const years = [...new Set(days.map(d => d.day.slice(0, 4)))].sort();
-    let activeYear = years[years.length - 1];
-
-    function buildYear(year) {
-        const y = parseInt(year);
-        const jan1 = new Date(y, 0, 1);
-        const endDate = new Date(y, 11, 31);
-
-        // Extend to week boundaries (Mon–Sun)
-        const start = new Date(jan1);
-        while (start.getDay() !== 1) start.setDate(start.getDate() - 1);
-        const end = new Date(endDate);
-        if (end.getDay() !== 0) {
-            while (end.getDay() !== 0) end.setDate(end.getDate() + 1);
-        }
-
-        const allDays = [];
-        const cur = new Date(start);
-        while (cur <= end) {
-            const iso = localISODate(cur);
-            allDays.push({ date: iso, tokens: dayMap[iso] || 0 });
-            cur.setDate(cur.getDate() + 1);
+// Keep in sync with CODEX_STATS_SVG (sitegen/config.py) and render_activity_svg().
+const ACTIVITY_SVG = { cell: 13, gap: 2, labelW: 28, bodyGap: 6, monthsH: 15 };
+const ACTIVITY_DAY_LABELS = { 0: 'Mon', 2: 'Wed', 4: 'Fri' };
+
+function activitySvg(year, cells) {
+    const { cell, gap, labelW, bodyGap, monthsH } = ACTIVITY_SVG;
+    const step = cell + gap;
+    const weeks = Math.floor(cells.levels.length / 7);
+    const gridX = labelW + bodyGap;
+    const width = gridX + weeks * step - gap;
+    const height = monthsH + 7 * step - gap;
+
+    const parts = [
+        `<svg class="activity-svg" viewBox="0 0 ${width} ${height}" role="img" ` +
+        `aria-label="Codex activity in ${year}" data-year="${year}">`
+    ];
+    let prevMonth = null;
+    for (let w = 0; w < weeks; w++) {
+        const month = parseInt(addDaysIso(cells.start, w * 7).slice(5, 7), 10);
+        if (month !== prevMonth) {
+            parts.push(`<text class="activity-month-label" x="${gridX + w * step}" y="${monthsH - 5}">${MONTHS[month - 1]}</text>`);
+            prevMonth = month;
         }
-        return allDays;
     }
+    for (const [row, label] of Object.entries(ACTIVITY_DAY_LABELS)) {
+        parts.push(`<text x="0" y="${monthsH + row * step + cell - 3}">${label}</text>`);
+    }
+    let day = cells.start;
+    for (let i = 0; i < cells.levels.length; i++) {
+        parts.push(
+            `<rect x="${gridX + Math.floor(i / 7) * step}" y="${monthsH + (i % 7) * step}" width="${cell}" height="${cell}" ` +
+            `data-level="${cells.levels[i]}" data-date="${day}" data-tokens="${cells.tokens[i]}"/>`
+        );
+        day = addDaysIso(day, 1);
+    }
+    parts.push('</svg>');
+    return parts.join('');
+}
 
-    function render() {
-        container.innerHTML = '';
-
-        const allDays = buildYear(activeYear);
-
-        // Intensity levels via quartiles of non-zero values
-        const nonZero = allDays.filter(d => d.tokens > 0).map(d => d.tokens).sort((a, b) => a - b);
-        const q = (f) => nonZero[Math.floor(nonZero.length * f)] || 0;
-        const thresholds = [q(0.25), q(0.5), q(0.75)];
-        const level = (t) => {
-            if (t === 0) return 0;
-            if (t <= thresholds[0]) return 1;
-            if (t <= thresholds[1]) return 2;
-            if (t <= thresholds[2]) return 3;
-            return 4;
-        };
-
-        const numWeeks = allDays.length / 7;
-
-        // Month labels
-        const monthLabels = [];
-        let prevMonth = '';
-        for (let w = 0; w < numWeeks; w++) {
-            const m = allDays[w * 7].date.slice(0, 7);
-            if (m !== prevMonth) {
-                monthLabels.push({ label: MONTHS[parseInt(m.slice(5, 7), 10) - 1], col: w });
-                prevMonth = m;
-            }
-        }
-
-        // Graph wrapper
-        const graph = document.createElement('div');
-        graph.className = 'activity-graph';
-        container.appendChild(graph);
-
-        // Compute cell size to fit container without overflow
-        const cs = getComputedStyle(graph);
-        const contentW = graph.clientWidth
-            - parseFloat(cs.paddingLeft)
-            - parseFloat(cs.paddingRight);
-        const labelW = parseFloat(cs.getPropertyValue('--ag-label-w')) || 28;
-        const bodyGap = parseFloat(cs.getPropertyValue('--ag-body-gap')) || 6;
-        const gapSize = parseFloat(cs.getPropertyValue('--ag-gap')) || 2;
-        const gridW = contentW - labelW - bodyGap;
-        const cell = Math.max(4, Math.floor((gridW - (numWeeks - 1) * gapSize) / numWeeks));
-        graph.style.setProperty('--ag-cell', cell + 'px');
-
-        const monthsEl = document.createElement('div');
-        monthsEl.className = 'activity-months';
-        monthsEl.style.gridTemplateColumns = `repeat(${numWeeks}, var(--ag-cell))`;
-        for (const ml of monthLabels) {
-            const span = document.createElement('span');
-            span.className = 'activity-month-label';
-            span.textContent = ml.label;
-            span.style.gridColumnStart = ml.col + 1;
-            monthsEl.appendChild(span);
-        }
-        graph.appendChild(monthsEl);
-
-        const body = document.createElement('div');
-        body.className = 'activity-body';
+function activityGraphHtml(data, activeYear) {
+    const years = Object.keys(data.activity).sort();
+    const toggle = years.map(y =>
+        `<button class="codex-stats-toggle-btn${y === activeYear ? ' active' : ''}" data-year="${y}">${y}</button>`
+    ).join('');
+    const legend = [0, 1, 2, 3, 4].map(i => `<div class="activity-cell activity-legend-cell" data-level="${i}"></div>`).join('');
+    return `<div class="activity-graph">${activitySvg(activeYear, data.activity[activeYear])}</div>\n` +
+        '<div class="activity-footer">' +
+        `<div class="codex-stats-toggle">${toggle}</div>` +
+        `<div class="activity-legend"><span>Less</span>${legend}<span>More</span></div>` +
+        '</div>';
+}
 
-        const dayLabelsEl = document.createElement('div');
-        dayLabelsEl.className = 'activity-day-labels';
-        for (const text of ['Mon', '', 'Wed', '', 'Fri', '', '']) {
-            const span = document.createElement('span');
-            span.textContent = text;
-            dayLabelsEl.appendChild(span);
-        }
-        body.appendChild(dayLabelsEl);
-
-        const grid = document.createElement('div');
-        grid.className = 'activity-grid';
-        for (const day of allDays) {
-            const c = document.createElement('div');
-            c.className = 'activity-cell';
-            c.dataset.level = level(day.tokens);
-            c.dataset.date = day.date;
-            c.dataset.tokens = day.tokens;
-            grid.appendChild(c);
-        }
-        body.appendChild(grid);
-        graph.appendChild(body);
-
-        // Tooltip
-        const tooltip = getActivityTooltip();
-        grid.addEventListener('mouseover', (e) => {
-            const el = e.target.closest('.activity-cell');
-            if (!el) return;
-            const tokens = parseInt(el.dataset.tokens);
-            const dateStr = fmtFullDate(el.dataset.date);
-            tooltip.innerHTML = tokens > 0
-                ? `<strong>${fmtTokens(tokens)} tokens</strong> on ${dateStr}`
-                : `No tokens on ${dateStr}`;
-            tooltip.style.display = '';
-            const r = el.getBoundingClientRect();
-            tooltip.style.left = `${r.left + r.width / 2}px`;
-            tooltip.style.top = `${r.top - 8}px`;
-        });
-        graph.addEventListener('mouseleave', () => {
-            tooltip.style.display = 'none';
-        });
+// The graph is usually prerendered by generate_blog.py; this adds the tooltip
+// and year switching, and renders it when the page shipped without one.
+function initActivityGraph(data) {
+    const container = document.getElementById('activity-graph');
+    const years = Object.keys(data.activity).sort();
+    if (!container || !years.length) return;
 
-        // Footer: year toggle (left) + legend (right)
-        const footer = document.createElement('div');
-        footer.className = 'activity-footer';
+    if (!container.querySelector('.activity-svg')) {
+        container.innerHTML = activityGraphHtml(data, years[years.length - 1]);
+    }
 
-        const toggle = document.createElement('div');
-        toggle.className = 'codex-stats-toggle';
-        for (const y of years) {
-            const btn = document.createElement('button');
-            btn.className = 'codex-stats-toggle-btn' + (y === activeYear ? ' active' : '');
-            btn.textContent = y;
-            btn.addEventListener('click', () => {
-                if (y === activeYear) return;
-                activeYear = y;
-                render();
-            });
-            toggle.appendChild(btn);
-        }
-        footer.appendChild(toggle);
-
-        const legend = document.createElement('div');
-        legend.className = 'activity-legend';
-        const lessSpan = document.createElement('span');
-        lessSpan.textContent = 'Less';
-        legend.appendChild(lessSpan);
-        for (let i = 0; i <= 4; i++) {
-            const box = document.createElement('div');
-            box.className = 'activity-cell activity-legend-cell';
-            box.dataset.level = i;
-            legend.appendChild(box);
-        }
-        const moreSpan = document.createElement('span');
-        moreSpan.textContent = 'More';
-        legend.appendChild(moreSpan);
-        footer.appendChild(legend);
+    const tooltip = getActivityTooltip();
+    container.addEventListener('mouseover', (e) => {
+        const el = e.target.closest('rect[data-date]');
+        if (!el) return;
+        const tokens = parseInt(el.dataset.tokens);
+        const dateStr = fmtFullDate(el.dataset.date);
+        tooltip.innerHTML = tokens > 0
+            ? `<strong>${fmtTokens(tokens)} tokens</strong> on ${dateStr}`
+            : `No tokens on ${dateStr}`;
+        tooltip.style.display = '';
+        const r = el.getBoundingClientRect();
+        tooltip.style.left = `${r.left + r.width / 2}px`;
+        tooltip.style.top = `${r.top - 8}px`;
+    });
+    container.addEventListener('mouseleave', () => {
+        tooltip.style.display = 'none';
+    });
 
-        container.appendChild(footer);
-    }
+    container.addEventListener('click', (e) => {
+        const btn = e.target.closest('button[data-year]');
+        const graph = container.querySelector('.activity-graph');
+        if (!btn || !graph || !data.activity[btn.dataset.year]) return;
+        if (graph.querySelector(`.activity-svg[data-year="${btn.dataset.year}"]`)) return;
 
-    render();
+        graph.innerHTML = activitySvg(btn.dataset.year, data.activity[btn.dataset.year]);
+        container.querySelectorAll('.codex-stats-toggle-btn[data-year]').forEach((b) => {
+            b.classList.toggle('active', b === btn);
+        });
+    });
 }
 
 // --- Chart rendering ---
@@ -410,20 +379,19 @@ function destroyCharts() {
     charts.length = 0;
 }
 
-function renderCharts(buckets, mode) {
+function renderCharts(data, mode) {
     destroyCharts();
     fallbackIdx = 0;
     const theme = getThemeColors();
-    const labels = buckets.map(d => bucketLabel(d.day, mode));
+    const series = data.series[mode];
+    const labels = series.keys.map(key => bucketLabel(key, mode));
     const defaults = buildChartDefaults(theme);
 
     const tooltipTitle = (items) => {
-        const b = buckets[items[0].dataIndex];
-        if (mode === 'daily') return b.day;
-        if (mode === 'weekly') return `Week of ${b.day}`;
-        // monthly
-        const parts = b.day.split('-');
-        return `${MONTHS[parseInt(parts[1], 10) - 1]} ${parts[0]}`;
+        const key = series.keys[items[0].dataIndex];
+        if (mode === 'daily') return key;
+        if (mode === 'weekly') return `Week of ${key}`;
+        return bucketLabel(key, mode);
     };
 
     // 1) Tokens bar chart
@@ -434,7 +402,7 @@ function renderCharts(buckets, mode) {
             data: {
                 labels,
                 datasets: [{
-                    data: buckets.map(d => d.tokens),
+                    data: series.tokens,
                     backgroundColor: theme.tokenColor,
                     borderColor: theme.tokenBorder,
                     borderWidth: 1,
@@ -467,16 +435,8 @@ function renderCharts(buckets, mode) {
         }));
     }
 
-    // Shared: collect all models sorted by total tokens descending
-    const modelTotals = {};
-    for (const d of buckets) {
-        for (const [m, v] of Object.entries(d.models)) {
-            modelTotals[m] = (modelTotals[m] || 0) + v;
-        }
-    }
-    const sortedModels = Object.entries(modelTotals)
-        .sort((a, b) => b[1] - a[1])
-        .map(e => e[0]);
+    // Shared: models come sorted by total tokens descending; series.models[i]
+    // holds data.models[i]'s values per bucket.
 
     const modelLegend = {
         display: true,
@@ -495,11 +455,11 @@ function renderCharts(buckets, mode) {
     // 2) Stacked tokens-by-model bar chart
     const modelCtx = document.getElementById('chart-model-tokens');
     if (modelCtx) {
-        const datasets = sortedModels.map(model => {
+        const datasets = data.models.map((model, i) => {
             const c = colorFor(model);
             return {
                 label: model,
-                data: buckets.map(d => d.models[model] || 0),
+                data: series.models[i],
                 backgroundColor: c.bg,
                 borderColor: c.border,
                 borderWidth: 0.5,
@@ -548,17 +508,17 @@ function renderCharts(buckets, mode) {
     const distCtx = document.getElementById('chart-model-distribution');
     if (distCtx) {
         // Pre-compute per-bucket totals for percentage calculation
-        const bucketTotals = buckets.map(d =>
-            Object.values(d.models).reduce((s, v) => s + v, 0)
+        const bucketTotals = series.keys.map((_, j) =>
+            series.models.reduce((s, values) => s + values[j], 0)
         );
 
-        const datasets = sortedModels.map(model => {
+        const datasets = data.models.map((model, i) => {
             const c = colorFor(model);
             return {
                 label: model,
-                data: buckets.map((d, i) => {
-                    const total = bucketTotals[i];
-                    return total > 0 ? ((d.models[model] || 0) / total) * 100 : 0;
+                data: series.models[i].map((v, j) => {
+                    const total = bucketTotals[j];
+                    return total > 0 ? (v / total) * 100 : 0;
                 }),
                 backgroundColor: c.bg,
                 borderColor: c.border,
@@ -581,8 +541,7 @@ function renderCharts(buckets, mode) {
                             title: tooltipTitle,
                             label: item => {
                                 if (item.raw <= 0) return null;
-                                const bucket = buckets[item.dataIndex];
-                                const absTokens = bucket.models[item.dataset.label] || 0;
+                                const absTokens = series.models[item.datasetIndex][item.dataIndex];
                                 return `${item.dataset.label}: ${item.raw.toFixed(1)}% (${fmtTokens(absTokens)})`;
                             },
                         },
@@ -607,30 +566,44 @@ function renderCharts(buckets, mode) {
     }
 }
 
+// Charts sit below the fold; Chart.js is only fetched once they are near view.
+function whenNearViewport(el, callback) {
+    if (!('IntersectionObserver' in window)) {
+        callback();
+        return;
+    }
+    const observer = new IntersectionObserver((entries) => {
+        if (!entries.some(entry => entry.isIntersecting)) return;
+        observer.disconnect();
+        callback();
+    }, { rootMargin: '200px' });
+    observer.observe(el);
+}
+
 export const CodexStats = {
     async init() {
-        await loadChartJs();
-        const resp = await fetch(DATA_URL);
-        const data = await resp.json();
-
-        renderActivityGraph(data.days, data.generatedAt);
+        const data = await loadData();
+        initActivityGraph(data);
 
-        let mode = 'daily';
         const root = document.getElementById('codex-stats-root');
+        if (!root) return;
+
+        whenNearViewport(root, async () => {
+            await loadChartJs();
+
+            let mode = 'daily';
+            const update = () => {
+                renderToggle(root, mode, (newMode) => {
+                    mode = newMode;
+                    update();
+                });
+                renderCharts(data, mode);
+            };
 
-        const update = () => {
-            const buckets = aggregateBuckets(data.days, mode);
-            renderToggle(root, mode, (newMode) => {
-                mode = newMode;
-                update();
+            update();
+            document.addEventListener('theme-change', () => {
+                renderCharts(data, mode);
             });
-            renderCharts(buckets, mode);
-        };
-
-        update();
-        document.addEventListener('theme-change', () => {
-            const buckets = aggregateBuckets(data.days, mode);
-            renderCharts(buckets, mode);
         });
     },
 };
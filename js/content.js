@@ -3,114 +3,24 @@ import { Navigation } from './navigation.js';
 import { DarkMode } from './theme.js';
 
 export const TableOfContents = {
-    generate(container) {
-        const headings = container.querySelectorAll('h2, h3, h4');
-        if (headings.length === 0) return;
-
-        const tocItems = this.extractHeadings(headings);
-
-        // Only render the full TOC UI when there are enough headings, but always
-        // assign stable IDs so in-page links like #my-section work.
-        if (headings.length >= CONFIG.TOC.MIN_HEADINGS) {
-            const tocContainer = this.createContainer(tocItems);
-            this.insertIntoContent(container, tocContainer);
+    // The TOC markup, heading IDs and `#` anchor links are rendered at build
+    // time by generate_blog.py; this only wires up behavior.
+    init(container) {
+        const tocContainer = container.querySelector('.toc-container');
+        if (tocContainer) {
+            this.addToggleFunctionality(tocContainer);
         }
 
-        this.addHeadingLinks(container);
-    },
-
-    extractHeadings(headings) {
-        const items = [];
-        const usedIds = new Map();
-
-        headings.forEach((heading) => {
-            const baseId = heading.id || this.generateId(heading.textContent);
-            const uniqueId = this.makeUniqueId(baseId, usedIds);
-            heading.id = uniqueId;
-
-            items.push({
-                id: heading.id,
-                text: heading.textContent.trim(),
-                level: parseInt(heading.tagName.substring(1))
-            });
-        });
-
-        return items;
-    },
-
-    makeUniqueId(baseId, usedIds) {
-        const safeBase = baseId || 'section';
-        const count = usedIds.get(safeBase) || 0;
-        usedIds.set(safeBase, count + 1);
-        return count === 0 ? safeBase : `${safeBase}-${count}`;
-    },
-
-    generateId(text) {
-        const slug = text.trim()
-            .toLowerCase()
-            .replace(/[^\w\s-]/g, '')
-            .replace(/\s+/g, '-');
-        return slug || 'section';
-    },
-
-    createContainer(tocItems) {
-        const container = document.createElement('div');
-        container.className = 'toc-container';
-
-        const header = this.createHeader();
-        const content = this.createContent(tocItems);
-
-        container.appendChild(header);
-        container.appendChild(content);
-
-        this.addToggleFunctionality(container, header, content);
-
-        return container;
-    },
-
-    createHeader() {
-        const header = document.createElement('div');
-        header.className = 'toc-header';
-        header.innerHTML = `
-            <h3>Table of Contents</h3>
-            <button class="toc-toggle">Expand</button>
-        `;
-        return header;
-    },
-
-    createContent(tocItems) {
-        const content = document.createElement('div');
-        content.className = 'toc-content collapsed';
-        content.style.height = '0px';
-
-        const list = document.createElement('ul');
-        list.className = 'toc-list';
-
-        tocItems.forEach(item => {
-            const listItem = this.createListItem(item);
-            list.appendChild(listItem);
+        container.querySelectorAll('.heading-link').forEach((link) => {
+            this.makeHeadingClickable(link.parentElement);
         });
-
-        content.appendChild(list);
-        return content;
     },
 
-    createListItem(item) {
-        const listItem = document.createElement('li');
-        listItem.className = `toc-h${item.level}`;
-
-        const link = document.createElement('a');
-        link.href = `#${item.id}`;
-        link.textContent = item.text;
-
-        // No need for individual event handler - Navigation module handles it
-
-        listItem.appendChild(link);
-        return listItem;
-    },
-
-    addToggleFunctionality(container, header, content) {
+    addToggleFunctionality(container) {
+        const header = container.querySelector('.toc-header');
+        const content = container.querySelector('.toc-content');
         const toggle = container.querySelector('.toc-toggle');
+        if (!header || !content || !toggle) return;
 
         const toggleToc = (e) => {
             // Prevent double-triggering when clicking the button
@@ -155,26 +65,6 @@ export const TableOfContents = {
         });
     },
 
-    insertIntoContent(container, tocContainer) {
-        const firstHeading = container.querySelector('h2, h3');
-        if (firstHeading) {
-            container.insertBefore(tocContainer, firstHeading);
-        } else {
-            container.insertBefore(tocContainer, container.firstChild);
-        }
-    },
-
-    addHeadingLinks(container) {
-        const headings = container.querySelectorAll('h2, h3, h4');
-
-        headings.forEach(heading => {
-            if (!heading.id) return;
-
-            this.makeHeadingClickable(heading);
-            this.addLinkIcon(heading);
-        });
-    },
-
     makeHeadingClickable(heading) {
         heading.style.cursor = 'pointer';
 
@@ -188,18 +78,6 @@ export const TableOfContents = {
                 });
             }
         });
-    },
-
-    addLinkIcon(heading) {
-        const link = document.createElement('a');
-        link.className = 'heading-link';
-        link.href = `#${heading.id}`;
-        link.innerHTML = ' #';
-        link.setAttribute('aria-label', 'Anchor link');
-
-        heading.appendChild(link);
-
-        // No need for click handler - Navigation module handles it via delegation
     }
 };
 
@@ -403,24 +281,19 @@ export const Images = {
         imgs.forEach(img => {
             if (!img.hasAttribute('loading')) img.setAttribute('loading', 'lazy');
             if (!img.hasAttribute('decoding')) img.setAttribute('decoding', 'async');
+            if (img.hasAttribute('data-placeholder')) this.clearPlaceholderOnLoad(img);
         });
-    }
-};
-
-export const Tables = {
-    enhance(container) {
-        const tables = container.querySelectorAll('table');
-        if (!tables.length) return;
-
-        tables.forEach(table => {
-            if (table.closest('.table-responsive')) return;
-
-            const wrapper = document.createElement('div');
-            wrapper.className = 'table-responsive';
+    },
 
-            table.parentNode.insertBefore(wrapper, table);
-            wrapper.appendChild(table);
-        });
+    // The build inlines a blurred preview as a background; drop it once the
+    // real image is in so it can't show through transparent pixels.
+    clearPlaceholderOnLoad(img) {
+        const clear = () => {
+            img.style.removeProperty('background-image');
+            img.style.removeProperty('background-size');
+            img.removeAttribute('data-placeholder');
+        };
+        if (img.complete && img.naturalWidth) clear();
+        else img.addEventListener('load', clear, { once: true });
     }
 };
-
@@ -18,9 +18,6 @@ export const CONFIG = {
         ANIMATION_DURATION: 300,
         COPY_FEEDBACK_DURATION: 2000,
         INLINE_CODE_FEEDBACK_DURATION: 600
-    },
-    TOC: {
-        MIN_HEADINGS: 3
     }
 };
 
@@ -686,21 +686,27 @@ export const LLMTierlist = {
         const root = document.getElementById('llm-tierlist-root');
         if (!root) return;
 
-        root.replaceChildren(
-            createEl('div', { className: 'tierlist-loading text-muted', text: 'Loading…' })
-        );
+        // generate_blog.py prerenders the latest board; the data only adds the
+        // timeline and model details. DATA_URL is content-hashed on export.
+        const prerendered = root.querySelector('.tierlist-stage');
+        if (!prerendered) {
+            root.replaceChildren(
+                createEl('div', { className: 'tierlist-loading text-muted', text: 'Loading…' })
+            );
+        }
 
         try {
-            const response = await fetch(DATA_URL, { cache: 'no-store' });
+            const response = await fetch(DATA_URL);
             if (!response.ok) {
                 throw new Error(`Failed to load data: ${response.status}`);
             }
 
             const raw = await response.json();
             const data = normalizeTierlistData(raw);
-            this.render(root, data);
+            this.render(root, data, prerendered);
         } catch (error) {
             console.error('Failed to render /llm-tierlist:', error);
+            if (prerendered) return;
             root.replaceChildren(
                 createEl('div', {
                     className: 'tierlist-error text-muted',
@@ -710,7 +716,7 @@ export const LLMTierlist = {
         }
     },
 
-    render(root, data) {
+    render(root, data, prerendered = null) {
         root.replaceChildren();
 
         if (!data.snapshots.length || !data.tiers.length) {
@@ -728,10 +734,12 @@ export const LLMTierlist = {
 
         const deltaMaps = computeDeltas(snapshots, data.tiers);
 
-        const stage = createEl('div', {
-            className: 'tierlist-snapshot tierlist-stage',
-            attrs: { role: 'region', 'aria-label': 'Tier list' }
-        });
+        const stage =
+            prerendered ||
+            createEl('div', {
+                className: 'tierlist-snapshot tierlist-stage',
+                attrs: { role: 'region', 'aria-label': 'Tier list' }
+            });
 
         const timebarRow = createEl('div', { className: 'tierlist-timebar-row' });
 
@@ -846,7 +854,7 @@ export const LLMTierlist = {
             yearLines.appendChild(marker.line);
         });
 
-        const buildStageFragment = (snapshotIndex, { interactive }) => {
+        const buildStageFragment = (snapshotIndex) => {
             const snapshot = snapshots[snapshotIndex];
             if (!snapshot) return document.createDocumentFragment();
 
@@ -932,7 +940,8 @@ export const LLMTierlist = {
                             className: 'tierlist-model',
                             attrs: {
                                 type: 'button',
-                                'aria-haspopup': 'dialog'
+                                'aria-haspopup': 'dialog',
+                                'data-model-id': model.id
                             }
                         });
 
@@ -966,18 +975,6 @@ export const LLMTierlist = {
                             card.classList.add('tierlist-model-changed');
                         }
 
-                        if (interactive) {
-                            card.addEventListener('click', () => {
-                                openModelModal({
-                                    snapshot,
-                                    tier,
-                                    model,
-                                    delta: modelDelta,
-                                    triggerEl: card
-                                });
-                            });
-                        }
-
                         tierContent.appendChild(card);
                         renderedCards.push(card);
                     });
@@ -1030,9 +1027,39 @@ export const LLMTierlist = {
         };
 
         const renderStage = (snapshotIndex) => {
-            stage.replaceChildren(buildStageFragment(snapshotIndex, { interactive: true }));
+            stage.replaceChildren(buildStageFragment(snapshotIndex));
         };
 
+        // Cards are plain markup (prerendered or built above); one delegated
+        // listener opens the details for whichever snapshot is showing.
+        stage.addEventListener('click', (e) => {
+            const card = e.target.closest('.tierlist-model[data-model-id]');
+            const tierEl = card?.closest('[data-tier-id]');
+            if (!card || !tierEl) return;
+
+            const snapshot = snapshots[activeIndex];
+            const tier = data.tiers.find((t) => t.id === tierEl.getAttribute('data-tier-id'));
+            const modelId = card.getAttribute('data-model-id');
+            const modelRaw = (snapshot?.tiers?.[tier?.id] || []).find(
+                (m) => (m?.id ? String(m.id) : slugify(m?.name)) === modelId
+            );
+            if (!tier || !modelRaw) return;
+
+            openModelModal({
+                snapshot,
+                tier,
+                model: {
+                    id: modelId,
+                    name: String(modelRaw.name || 'Unnamed model'),
+                    vendor: modelRaw.vendor ? String(modelRaw.vendor) : '',
+                    summary: modelRaw.summary ? String(modelRaw.summary) : '',
+                    reasoning: normalizeReasoningToMarkdown(modelRaw.reasoning)
+                },
+                delta: deltaMaps[activeIndex]?.get(modelId),
+                triggerEl: card
+            });
+        });
+
         const findActiveIndexForDay = (day) => {
             const clamped = clampNumber(day, 0, daySpan);
             let lo = 0;
@@ -1056,7 +1083,13 @@ export const LLMTierlist = {
         let currentDay = clampNumber(daySpan, 0, daySpan);
         let bubbleDay = null;
 
-        renderStage(activeIndex);
+        // Keep the prerendered board when it already shows this snapshot.
+        const prerenderedId = prerendered
+            ?.querySelector('.tierlist-snapshot-header')
+            ?.getAttribute('data-snapshot-id');
+        if (prerenderedId !== snapshots[activeIndex]?.id) {
+            renderStage(activeIndex);
+        }
 
         let geometry = null;
 
@@ -1,10 +1,9 @@
 import { BlogPosts } from './blog-posts.js';
 import { CodeBlocks } from './code.js';
 import { Images } from './content.js';
-import { LLMTierlist } from './llm-tierlist.js';
-import { CodexStats } from './codex-stats.js';
 import { KeyboardShortcuts } from './modals.js';
 import { Navigation } from './navigation.js';
+import { OfflineCache } from './offline.js';
 import { RSSSubscribe } from './rss.js';
 import { DarkMode, THEME_CHANGE_EVENT } from './theme.js';
 
@@ -12,6 +11,7 @@ export async function run() {
     DarkMode.init();
     RSSSubscribe.init();
     KeyboardShortcuts.init();
+    OfflineCache.init();
     Navigation.setupHashLinkHandlers(document);
     Images.processThemeAware(document);
 
@@ -38,6 +38,9 @@ export async function run() {
 
     const tierlistMatch = window.location.pathname.match(/^\/llm-tierlist(?:\.html)?\/?$/);
     if (tierlistMatch) {
+        // Page-specific modules are loaded on demand (and inlined into that
+        // page's bundle by `generate_blog.py --bundle`).
+        const { LLMTierlist } = await import('./llm-tierlist.js');
         await LLMTierlist.init();
         Navigation.handleInitialHash();
         return;
@@ -45,6 +48,7 @@ export async function run() {
 
     const codexStatsMatch = window.location.pathname.match(/^\/codex-stats(?:\.html)?\/?$/);
     if (codexStatsMatch) {
+        const { CodexStats } = await import('./codex-stats.js');
         await CodexStats.init();
         return;
     }
@@ -0,0 +1,14 @@
+export const OfflineCache = {
+    init() {
+        // Only exports built with `--service-worker` carry this tag, so local
+        // servers never install a worker over the working tree.
+        const meta = document.querySelector('meta[name="service-worker"]');
+        if (!meta || !('serviceWorker' in navigator)) return;
+
+        window.addEventListener('load', () => {
+            navigator.serviceWorker.register(meta.content).catch((error) => {
+                console.error('Service worker registration failed:', error);
+            });
+        }, { once: true });
+    }
+};
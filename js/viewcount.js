@@ -37,6 +37,30 @@ export const ViewCount = {
         }
     },
 
+    // One batched request for a whole list: GET /api/viewcount?ids=a,b,c
+    // returns {"views": {slug: count}}. If the batched endpoint fails, falls
+    // back to one request per post (which uses cached counts on failure).
+    async fetchMany(postSlugs) {
+        if (postSlugs.length === 0) return {};
+        try {
+            const ids = postSlugs.map(encodeURIComponent).join(',');
+            const response = await fetch(`${CONFIG.API.VIEWCOUNT_BASE}/api/viewcount?ids=${ids}`);
+            if (!response.ok) throw new Error('Failed to fetch view counts');
+
+            const data = await response.json();
+            if (!data?.views || typeof data.views !== 'object') throw new Error('Malformed view counts');
+
+            const cache = this.getCache();
+            Object.assign(cache, data.views);
+            this.saveCache(cache);
+            return Object.fromEntries(postSlugs.map((slug) => [slug, cache[slug] || 0]));
+        } catch (error) {
+            console.error('Error fetching view counts, falling back to per-post requests:', error);
+            const counts = await Promise.all(postSlugs.map((slug) => this.fetch(slug)));
+            return Object.fromEntries(postSlugs.map((slug, i) => [slug, counts[i]]));
+        }
+    },
+
     getCached(postSlug) {
         const cache = this.getCache();
         return cache[postSlug] || 0;
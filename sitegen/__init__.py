@@ -0,0 +1,7 @@
+"""Stages of the static site generator driven by generate_blog.py.
+
+Each module is one stage (content, previews, feeds, sitemap, pages, export
+and the export sub-stages). Importing any of them has no side effects and
+does not load markdown or Pillow; those are imported by the functions that
+need them (see deps.require).
+"""
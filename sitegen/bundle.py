@@ -0,0 +1,751 @@
+"""Pure-Python JS/CSS bundles with source maps (export only)."""
+
+import json
+import pathlib
+import posixpath
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    BUNDLER_VERSION,
+    BUNDLES_CSS_DIR,
+    BUNDLES_JS_DIR,
+    BUNDLE_CACHE_DIR,
+    CSS_BUNDLE_ENTRY,
+    CSS_BUNDLE_NAME,
+    JS_BUNDLES,
+    JS_BUNDLE_ENTRY,
+    PAGE_BUNDLES,
+    ROOT_DIR,
+)
+from .files import hash_file
+from .export import (
+    ExportOverlay,
+    iter_publishable_files,
+    load_deploy_ignore,
+    read_export_file,
+)
+from .fingerprint import resolve_asset_ref, rewrite_asset_refs
+from .profiling import timed
+
+
+# (kind, text, source index or -1 for generated code, line, col, space_before, newline_before)
+JsToken = Tuple[str, str, int, int, int, bool, bool]
+# (generated line, generated col, source index, source line, source col)
+SourceMapping = Tuple[int, int, int, int, int]
+
+BASE64_DIGITS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+JS_REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+}
+CSS_IMPORT_RE = re.compile(
+    r"""@import\s+(?:url\(\s*(['"]?)(?P<url>[^'")\s]+)\1\s*\)|(['"])(?P<str>[^'"]+)\3)\s*(?P<media>[^;]*);"""
+)
+
+
+def _is_js_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "_$#" or ord(ch) > 127
+
+
+def _tokenize_js(source: str, src_index: int) -> List[JsToken]:
+    """Split JS into tokens, dropping comments and remembering where whitespace was.
+
+    Strings, template literals and regex literals are kept verbatim; template
+    `${...}` expressions are tokenized as code.
+    """
+    tokens: List[JsToken] = []
+    i, n = 0, len(source)
+    line, line_start = 0, 0
+    space = newline = False
+    template_braces: List[int] = []  # open `{` count inside each active `${`
+
+    def regex_allowed() -> bool:
+        if not tokens:
+            return True
+        kind, text = tokens[-1][0], tokens[-1][1]
+        if kind == "punct":
+            return text not in ")]}"
+        if kind == "tmpl":
+            return text.endswith("${")
+        if kind == "word":
+            return text in JS_REGEX_KEYWORDS
+        return False
+
+    while i < n:
+        ch = source[i]
+        if ch == "\n":
+            space = newline = True
+            i += 1
+            line, line_start = line + 1, i
+            continue
+        if ch.isspace() or ch == "﻿":
+            space = True
+            i += 1
+            continue
+
+        start, tok_line, tok_col = i, line, i - line_start
+
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+            space = True
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            if end < 0:
+                raise ValueError(f"Unterminated comment at line {line + 1}")
+            comment = source[i:end + 2]
+            if "\n" in comment:
+                newline = True
+                line += comment.count("\n")
+                line_start = i + comment.rfind("\n") + 1
+            space = True
+            i = end + 2
+            continue
+
+        if ch in "'\"":
+            i += 1
+            while i < n and source[i] != ch:
+                if source[i] == "\\":
+                    i += 1
+                    if i < n and source[i] == "\n":
+                        line, line_start = line + 1, i + 1
+                elif source[i] == "\n":
+                    raise ValueError(f"Unterminated string at line {line + 1}")
+                i += 1
+            i += 1
+            kind = "str"
+        elif ch == "`" or (ch == "}" and template_braces and template_braces[-1] == 0):
+            if ch == "}":
+                template_braces.pop()
+            i += 1
+            while i < n:
+                if source[i] == "\\":
+                    i += 2
+                    continue
+                if source[i] == "`":
+                    i += 1
+                    break
+                if source.startswith("${", i):
+                    i += 2
+                    template_braces.append(0)
+                    break
+                if source[i] == "\n":
+                    line, line_start = line + 1, i + 1
+                i += 1
+            kind = "tmpl"
+        elif _is_js_word_char(ch):
+            while i < n and _is_js_word_char(source[i]):
+                i += 1
+            kind = "word"
+        elif ch == "/" and regex_allowed():
+            i += 1
+            in_class = False
+            while i < n:
+                if source[i] == "\\":
+                    i += 2
+                    continue
+                if source[i] == "\n":
+                    raise ValueError(f"Unterminated regex at line {line + 1}")
+                if source[i] == "[":
+                    in_class = True
+                elif source[i] == "]":
+                    in_class = False
+                elif source[i] == "/" and not in_class:
+                    break
+                i += 1
+            i += 1
+            while i < n and source[i].isalpha():
+                i += 1
+            kind = "regex"
+        else:
+            if template_braces:
+                if ch == "{":
+                    template_braces[-1] += 1
+                elif ch == "}":
+                    template_braces[-1] -= 1
+            i += 1
+            kind = "punct"
+
+        tokens.append((kind, source[start:i], src_index, tok_line, tok_col, space, newline))
+        space = newline = False
+
+    return tokens
+
+
+def _js_needs_space(prev: str, text: str) -> bool:
+    a, b = prev[-1], text[0]
+    if _is_js_word_char(a) and _is_js_word_char(b):
+        return True
+    if a in "+-" and b in "+-":
+        return True
+    if a == "/" and b == "/":
+        return True
+    # `1 .toString()` must not become `1.toString()`.
+    return b == "." and prev[0].isdigit()
+
+
+def _minify_js_tokens(tokens: List[JsToken]) -> Tuple[str, List[SourceMapping]]:
+    """Join tokens with the least whitespace that keeps the same parse.
+
+    Line breaks are kept unless the neighbouring punctuation makes automatic
+    semicolon insertion impossible, so ASI-dependent code stays intact.
+    """
+    out: List[str] = []
+    mappings: List[SourceMapping] = []
+    gen_line = gen_col = 0
+    prev: Optional[str] = None
+
+    for kind, text, src, line, col, space, newline in tokens:
+        sep = ""
+        if prev is not None:
+            if newline and prev[-1] not in "{([;,=:" and text[0] not in "})];,.":
+                sep = "\n"
+            elif (space or newline) and _js_needs_space(prev, text):
+                sep = " "
+        if sep == "\n":
+            gen_line, gen_col = gen_line + 1, 0
+        else:
+            gen_col += len(sep)
+        out.append(sep)
+
+        if src >= 0:
+            mappings.append((gen_line, gen_col, src, line, col))
+        out.append(text)
+        if "\n" in text:
+            gen_line += text.count("\n")
+            gen_col = len(text) - text.rfind("\n") - 1
+        else:
+            gen_col += len(text)
+        prev = text
+
+    return "".join(out), mappings
+
+
+def _vlq(value: int) -> str:
+    value = ((-value) << 1) | 1 if value < 0 else value << 1
+    encoded = ""
+    while True:
+        digit, value = value & 31, value >> 5
+        encoded += BASE64_DIGITS[digit | (32 if value else 0)]
+        if not value:
+            return encoded
+
+
+def _render_source_map(
+    output_relpath: str,
+    sources: List[str],
+    contents: List[str],
+    mappings: List[SourceMapping],
+) -> str:
+    """Render a v3 source map; `sources` are repo-relative paths."""
+    out_dir = posixpath.dirname(output_relpath)
+    lines: List[str] = []
+    segments: List[str] = []
+    current_line = prev_col = prev_src = prev_src_line = prev_src_col = 0
+
+    for gen_line, gen_col, src, src_line, src_col in mappings:
+        while current_line < gen_line:
+            lines.append(",".join(segments))
+            segments, prev_col = [], 0
+            current_line += 1
+        segments.append(
+            _vlq(gen_col - prev_col)
+            + _vlq(src - prev_src)
+            + _vlq(src_line - prev_src_line)
+            + _vlq(src_col - prev_src_col)
+        )
+        prev_col, prev_src, prev_src_line, prev_src_col = gen_col, src, src_line, src_col
+    lines.append(",".join(segments))
+
+    source_map = {
+        "version": 3,
+        "file": posixpath.basename(output_relpath),
+        "sources": [posixpath.relpath(path, out_dir or ".") for path in sources],
+        "sourcesContent": contents,
+        "names": [],
+        "mappings": ";".join(lines),
+    }
+    return json.dumps(source_map, separators=(",", ":"))
+
+
+def _resolve_module_specifier(spec: str, from_relpath: str, kind: str) -> str:
+    if not spec.startswith(("./", "../", "/")):
+        raise ValueError(f"{from_relpath}: unsupported {kind} specifier {spec!r}")
+    return resolve_asset_ref(spec, from_relpath)
+
+
+def _static_import_end(tokens: List[JsToken], i: int) -> int:
+    """Index just past a static `import ... from '...';` statement."""
+    j = i + 1
+    while tokens[j][0] != "str":
+        j += 1
+    j += 1
+    if j < len(tokens) and tokens[j][1] == ";":
+        j += 1
+    return j
+
+
+def _is_static_import(tokens: List[JsToken], i: int) -> bool:
+    if tokens[i][1] != "import" or (i > 0 and tokens[i - 1][1] == "."):
+        return False
+    return i + 1 < len(tokens) and tokens[i + 1][1] not in ("(", ".")
+
+
+def _js_static_deps(tokens: List[JsToken], relpath: str) -> List[str]:
+    deps = []
+    for i in range(len(tokens)):
+        if _is_static_import(tokens, i):
+            spec = next(t for t in tokens[i + 1:] if t[0] == "str")[1][1:-1]
+            deps.append(_resolve_module_specifier(spec, relpath, "import"))
+    return deps
+
+
+def _is_dynamic_import(tokens: List[JsToken], i: int) -> bool:
+    return (
+        tokens[i][1] == "import"
+        and i + 3 < len(tokens)
+        and tokens[i + 1][1] == "("
+        and tokens[i + 2][0] == "str"
+        and tokens[i + 3][1] == ")"
+    )
+
+
+def _js_dynamic_deps(tokens: List[JsToken], relpath: str) -> List[str]:
+    return [
+        _resolve_module_specifier(tokens[i + 2][1][1:-1], relpath, "dynamic import")
+        for i in range(len(tokens))
+        if _is_dynamic_import(tokens, i)
+    ]
+
+
+def _js_import_bindings(clause: List[JsToken]) -> Tuple[Optional[str], Optional[str], List[Tuple[str, str]]]:
+    """Parse an import clause into (default, namespace, [(imported, local)])."""
+    default = namespace = None
+    named: List[Tuple[str, str]] = []
+    k = 0
+    while k < len(clause):
+        text = clause[k][1]
+        if text == "*":
+            namespace = clause[k + 2][1]
+            k += 3
+        elif text == "{":
+            k += 1
+            while clause[k][1] != "}":
+                if clause[k][1] == ",":
+                    k += 1
+                    continue
+                imported = local = clause[k][1]
+                if k + 2 < len(clause) and clause[k + 1][1] == "as":
+                    local = clause[k + 2][1]
+                    k += 2
+                named.append((imported, local))
+                k += 1
+            k += 1
+        elif text == ",":
+            k += 1
+        else:
+            default = text
+            k += 1
+    return default, namespace, named
+
+
+def _transform_js_module(
+    tokens: List[JsToken],
+    relpath: str,
+    module_ids: Dict[str, int],
+) -> Tuple[List[JsToken], List[JsToken]]:
+    """Rewrite one ES module into (prologue, body) tokens for a bundle factory.
+
+    Static imports become `__require(id)` destructuring, exports are collected
+    into a returned object, and dynamic imports of bundled modules resolve to
+    the bundled copy. Dynamic imports of modules left out of the bundle (which
+    share no module with it) are pointed at their absolute URL.
+    """
+    prologue: List[str] = []
+    exports: List[Tuple[str, str]] = []  # (exported, local)
+    body: List[JsToken] = []
+    i = 0
+
+    def generated(code: str) -> List[JsToken]:
+        return _tokenize_js(code, -1)
+
+    while i < len(tokens):
+        tok = tokens[i]
+        text = tok[1]
+
+        if _is_static_import(tokens, i):
+            end = _static_import_end(tokens, i)
+            clause = [t for t in tokens[i + 1:end] if t[0] != "str" and t[1] not in ("from", ";")]
+            spec = next(t for t in tokens[i + 1:end] if t[0] == "str")[1][1:-1]
+            dep_id = module_ids[_resolve_module_specifier(spec, relpath, "import")]
+            default, namespace, named = _js_import_bindings(clause)
+            if namespace:
+                prologue.append(f"const {namespace} = __require({dep_id});")
+            if default:
+                prologue.append(f"const {default} = __require({dep_id}).default;")
+            if named:
+                fields = ", ".join(
+                    imported if imported == local else f"{imported}: {local}"
+                    for imported, local in named
+                )
+                prologue.append(f"const {{ {fields} }} = __require({dep_id});")
+            if not (namespace or default or named):
+                prologue.append(f"__require({dep_id});")
+            i = end
+            continue
+
+        if _is_dynamic_import(tokens, i):
+            spec_token = tokens[i + 2]
+            target = _resolve_module_specifier(spec_token[1][1:-1], relpath, "dynamic import")
+            if target in module_ids:
+                replacement = generated(f"Promise.resolve().then(() => __require({module_ids[target]}))")
+                first = replacement[0]
+                body.append(first[:2] + tok[2:])
+                body.extend(replacement[1:])
+            else:
+                quote = spec_token[1][0]
+                body.append(tok)
+                body.append(tokens[i + 1])
+                body.append(spec_token[:1] + (f"{quote}/{target}{quote}",) + spec_token[2:])
+                body.append(tokens[i + 3])
+            i += 4
+            continue
+
+        if text == "export" and (i == 0 or tokens[i - 1][1] != "."):
+            nxt = tokens[i + 1][1]
+            if nxt in ("const", "let", "var", "class"):
+                exports.append((tokens[i + 2][1], tokens[i + 2][1]))
+            elif nxt == "function" or (nxt == "async" and tokens[i + 2][1] == "function"):
+                k = i + 1
+                while tokens[k][1] in ("async", "function", "*"):
+                    k += 1
+                exports.append((tokens[k][1], tokens[k][1]))
+            elif nxt == "default":
+                body.extend(generated("const __default ="))
+                exports.append(("default", "__default"))
+                i += 2
+                continue
+            elif nxt == "{":
+                k = i + 2
+                while tokens[k][1] != "}":
+                    if tokens[k][1] == ",":
+                        k += 1
+                        continue
+                    local = exported = tokens[k][1]
+                    if tokens[k + 1][1] == "as":
+                        exported = tokens[k + 2][1]
+                        k += 2
+                    exports.append((exported, local))
+                    k += 1
+                end = k + 1
+                if end < len(tokens) and tokens[end][1] == "from":
+                    raise ValueError(f"{relpath}: re-exports are not supported by the bundler")
+                if end < len(tokens) and tokens[end][1] == ";":
+                    end += 1
+                i = end
+                continue
+            else:
+                raise ValueError(f"{relpath}: unsupported export form `export {nxt}`")
+            # Drop the `export` keyword but keep the declaration's position.
+            nxt_token = tokens[i + 1]
+            body.append(nxt_token[:5] + (tok[5], tok[6]))
+            i += 2
+            continue
+
+        body.append(tok)
+        i += 1
+
+    fields = ", ".join(local if exported == local else f"{exported}: {local}" for exported, local in exports)
+    return generated("\n".join(prologue)), body + generated(f"\nreturn {{ {fields} }};")
+
+
+def _walk_static_imports(queue: List[str], order: List[str], tokens: Dict[str, List[JsToken]]):
+    """Add the modules in `queue` and everything they statically import."""
+    while queue:
+        relpath = queue.pop(0)
+        if relpath in tokens:
+            continue
+        path = ROOT_DIR / relpath
+        if not path.exists():
+            raise ValueError(f"Bundle input not found: {relpath}")
+        tokens[relpath] = _tokenize_js(path.read_text(encoding="utf-8"), len(order))
+        order.append(relpath)
+        queue.extend(_js_static_deps(tokens[relpath], relpath))
+
+
+def _collect_js_modules(entries: List[str]) -> Tuple[List[str], Dict[str, List[JsToken]], List[str]]:
+    """Return bundle modules (entry first, then discovery order), their tokens,
+    and the modules of dynamically imported chunks left out of the bundle.
+
+    A dynamic import whose target shares a module with the bundle is pulled in
+    as well: loaded from its URL, it would get its own copy of the shared
+    module, splitting module-level state such as the theme or the view-count
+    cache. Targets that share nothing stay separate chunks.
+    """
+    order: List[str] = []
+    tokens: Dict[str, List[JsToken]] = {}
+    _walk_static_imports(list(entries), order, tokens)
+    while True:
+        separate: Dict[str, List[JsToken]] = {}
+        shared = []
+        for target in dict.fromkeys(dep for relpath in order for dep in _js_dynamic_deps(tokens[relpath], relpath)):
+            if target in tokens:
+                continue
+            closure: Dict[str, List[JsToken]] = {}
+            _walk_static_imports([target], [], closure)
+            if closure.keys() & tokens.keys():
+                shared.append(target)
+            separate.update(closure)
+        if not shared:
+            return order, tokens, sorted(separate)
+        _walk_static_imports(shared, order, tokens)
+
+
+def _build_js_bundle(name: str, inline_dynamic: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    """Bundle JS_BUNDLE_ENTRY plus the page's dynamic chunks into one classic script."""
+    output_relpath = f"{BUNDLES_JS_DIR}/{name}.js"
+    order, module_tokens, separate = _collect_js_modules([JS_BUNDLE_ENTRY] + inline_dynamic)
+    module_ids = {relpath: index for index, relpath in enumerate(order)}
+
+    tokens = _tokenize_js(
+        "(() => {\n'use strict';\n"
+        "const __factories = [];\n"
+        "const __modules = [];\n"
+        "const __require = (id) => {\n"
+        "    if (!(id in __modules)) __modules[id] = __factories[id]();\n"
+        "    return __modules[id];\n"
+        "};\n",
+        -1,
+    )
+    for relpath in order:
+        prologue, body = _transform_js_module(module_tokens[relpath], relpath, module_ids)
+        tokens += _tokenize_js(f"\n__factories[{module_ids[relpath]}] = () => {{\n", -1)
+        tokens += prologue
+        if body:
+            body[0] = body[0][:6] + (True,)
+        tokens += body
+        tokens += _tokenize_js("\n};\n", -1)
+    # Same bootstrap as blog.js, minus the extra module request.
+    tokens += _tokenize_js(
+        "\nconst start = async () => {\n"
+        "    try {\n"
+        "        const { run } = __require(0);\n"
+        "        await run();\n"
+        "    } catch (error) {\n"
+        "        console.error('Failed to initialize site JS:', error);\n"
+        "    }\n"
+        "};\n"
+        "if (document.readyState === 'loading') {\n"
+        "    document.addEventListener('DOMContentLoaded', () => {\n"
+        "        void start();\n"
+        "    });\n"
+        "} else {\n"
+        "    void start();\n"
+        "}\n"
+        "})();\n",
+        -1,
+    )
+
+    code, mappings = _minify_js_tokens(tokens)
+    map_name = posixpath.basename(output_relpath) + ".map"
+    contents = [(ROOT_DIR / relpath).read_text(encoding="utf-8") for relpath in order]
+    return {
+        output_relpath: f"{code}\n//# sourceMappingURL={map_name}\n",
+        output_relpath + ".map": _render_source_map(output_relpath, order, contents, mappings),
+    }, order + separate  # Separate chunks are inputs too: a new shared import pulls them in
+
+
+def css_segments(relpath: str, seen: set, remote: List[str]) -> List[Tuple[Optional[str], str]]:
+    """Flatten local @imports depth-first into (relpath, css) segments.
+
+    Remote imports (fonts) are collected into `remote` so they can be hoisted
+    to the top of the bundle, as CSS requires. Media-qualified imports are
+    wrapped in an @media block (segment relpath None).
+    """
+    if relpath in seen:
+        return []
+    seen.add(relpath)
+    text = (ROOT_DIR / relpath).read_text(encoding="utf-8")
+    segments: List[Tuple[Optional[str], str]] = []
+
+    def inline_import(match: re.Match) -> str:
+        url = match.group("url") or match.group("str")
+        media = match.group("media").strip()
+        if url.startswith(("http:", "https:", "//")):
+            remote.append(match.group(0))
+            return ""
+        target = resolve_asset_ref(url, relpath)
+        if media:
+            segments.append((None, f"@media {media}{{"))
+        segments.extend(css_segments(target, seen, remote))
+        if media:
+            segments.append((None, "}"))
+        return ""
+
+    own = CSS_IMPORT_RE.sub(inline_import, text)
+    segments.append((relpath, own))
+    return segments
+
+
+def minify_css(css: str, src_index: int, gen_line: int) -> Tuple[str, List[SourceMapping]]:
+    """Strip comments and redundant whitespace, mapping each rule/declaration start."""
+    out: List[str] = []
+    mappings: List[SourceMapping] = []
+    i, n = 0, len(css)
+    line, line_start = 0, 0
+    pending_space = pending_semicolon = False
+    statement_start = True
+    gen_col = 0
+
+    def emit(text: str, at_line: int, at_col: int):
+        nonlocal gen_col, statement_start
+        if statement_start and src_index >= 0:
+            mappings.append((gen_line, gen_col, src_index, at_line, at_col))
+        statement_start = False
+        out.append(text)
+        gen_col += len(text)
+
+    while i < n:
+        ch = css[i]
+        if css.startswith("/*", i):
+            end = css.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            comment = css[i:end]
+            if "\n" in comment:
+                line += comment.count("\n")
+                line_start = i + comment.rfind("\n") + 1
+            pending_space = True
+            i = end
+            continue
+        if ch.isspace():
+            if ch == "\n":
+                line, line_start = line + 1, i + 1
+            pending_space = True
+            i += 1
+            continue
+
+        col = i - line_start
+        if pending_semicolon:
+            pending_semicolon = False
+            if ch != "}":
+                emit(";", line, col)
+                statement_start = True
+        if pending_space and out:
+            last = out[-1][-1]
+            if last not in "{};,>:(" and ch not in "{};,>)!":
+                emit(" ", line, col)
+        pending_space = False
+
+        if ch in "'\"":
+            end = i + 1
+            while end < n and css[end] != ch:
+                end += 2 if css[end] == "\\" else 1
+            emit(css[i:end + 1], line, col)
+            i = end + 1
+            continue
+        if ch == ";":
+            pending_semicolon = True
+            i += 1
+            continue
+        emit(ch, line, col)
+        if ch in "{}":
+            statement_start = True
+        i += 1
+
+    if pending_semicolon:
+        out.append(";")
+    return "".join(out), mappings
+
+
+def _build_css_bundle() -> Tuple[Dict[str, str], List[str]]:
+    output_relpath = f"{BUNDLES_CSS_DIR}/{CSS_BUNDLE_NAME}.css"
+    remote: List[str] = []
+    segments = css_segments(CSS_BUNDLE_ENTRY, set(), remote)
+    sources = [relpath for relpath, _ in segments if relpath]
+    contents = [(ROOT_DIR / relpath).read_text(encoding="utf-8") for relpath in sources]
+
+    lines = list(remote)
+    mappings: List[SourceMapping] = []
+    for relpath, css in segments:
+        src_index = sources.index(relpath) if relpath else -1
+        minified, segment_mappings = minify_css(css, src_index, len(lines))
+        if minified:
+            lines.append(minified)
+            mappings += segment_mappings
+
+    map_name = posixpath.basename(output_relpath) + ".map"
+    lines.append(f"/*# sourceMappingURL={map_name} */")
+    return {
+        output_relpath: "\n".join(lines) + "\n",
+        output_relpath + ".map": _render_source_map(output_relpath, sources, contents, mappings),
+    }, sources
+
+
+def _cached_bundle(name: str, build) -> Dict[str, str]:
+    """Return a bundle's outputs, rebuilding only when one of its inputs changed."""
+    cache_path = BUNDLE_CACHE_DIR / f"{name}.json"
+    if cache_path.exists():
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        inputs = cached.get("inputs", {})
+        if cached.get("version") == BUNDLER_VERSION and all(
+            (ROOT_DIR / relpath).exists() and hash_file(ROOT_DIR / relpath) == sha256
+            for relpath, sha256 in inputs.items()
+        ):
+            return cached["outputs"]
+
+    outputs, inputs = build()
+    BUNDLE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({
+            "version": BUNDLER_VERSION,
+            "inputs": {relpath: hash_file(ROOT_DIR / relpath) for relpath in inputs},
+            "outputs": outputs,
+        }),
+        encoding="utf-8",
+    )
+    print(f"  ✓ Built bundle {name}")
+    return outputs
+
+
+def _bundle_for_page(relpath: str) -> str:
+    if relpath in PAGE_BUNDLES:
+        return PAGE_BUNDLES[relpath]
+    if relpath.startswith("blog/") and relpath.count("/") == 1:
+        return "post"
+    return "home"
+
+
+@timed("export: bundle")
+def bundle_assets(overlay: ExportOverlay, skip_dirs: Tuple[pathlib.Path, ...] = ()) -> Dict[str, str]:
+    """Add per-page JS bundles and the CSS bundle to `overlay` and point pages at them."""
+    bundles: Dict[str, str] = {}
+    for name, inline_dynamic in JS_BUNDLES.items():
+        outputs = _cached_bundle(
+            f"js-{name}", lambda name=name, inline=inline_dynamic: _build_js_bundle(name, inline)
+        )
+        for relpath, text in outputs.items():
+            overlay[relpath] = text.encode("utf-8")
+        bundles[name] = f"{BUNDLES_JS_DIR}/{name}.js"
+
+    css_bundle = f"{BUNDLES_CSS_DIR}/{CSS_BUNDLE_NAME}.css"
+    for relpath, text in _cached_bundle(f"css-{CSS_BUNDLE_NAME}", _build_css_bundle).items():
+        overlay[relpath] = text.encode("utf-8")
+
+    rewritten_pages = 0
+    for relpath in iter_publishable_files(load_deploy_ignore(), skip_dirs):
+        if not relpath.endswith(".html"):
+            continue
+        mapping = {
+            "blog.js": bundles[_bundle_for_page(relpath)],
+            CSS_BUNDLE_ENTRY: css_bundle,
+        }
+        html = read_export_file(relpath, overlay).decode("utf-8")
+        rewritten = rewrite_asset_refs(html, relpath, mapping)
+        if rewritten != html:
+            overlay[relpath] = rewritten.encode("utf-8")
+            rewritten_pages += 1
+
+    print(f"  ✓ Bundled {len(bundles)} JS bundles + 1 CSS bundle, rewrote {rewritten_pages} pages")
+    return bundles
@@ -0,0 +1,204 @@
+"""Codex stats: pre-aggregated series and a prerendered activity graph.
+
+`--codex-stats SOURCE` (API URL or JSON file with `{generatedAt, days: [{day,
+tokens, models}]}`) is reduced to CODEX_STATS_JSON, a columnar file holding
+the daily/weekly/monthly series and per-year activity cells. The page renders
+the latest year's graph as inline SVG from that file; js/codex-stats.js loads
+it (fingerprinted on export) and only lazy-loads Chart.js for the charts.
+"""
+
+import hashlib
+import json
+import pathlib
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from .config import (
+    CODEX_STATS_JSON,
+    CODEX_STATS_SVG,
+    CODEX_STATS_TIMEOUT,
+    CODEX_STATS_VERSION,
+)
+from .files import write_if_changed
+from .profiling import timed
+
+MONTH_ABBRS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+DAY_LABELS = {0: "Mon", 2: "Wed", 4: "Fri"}
+
+
+def _round(value: float) -> int:
+    # Math.round, which the page used to apply to bucket sums.
+    return int(value + 0.5) if value >= 0 else -int(-value + 0.5)
+
+
+def _bucket_key(day: str, mode: str) -> str:
+    if mode == "weekly":
+        parsed = date.fromisoformat(day)
+        return (parsed - timedelta(days=parsed.weekday())).isoformat()  # Monday
+    if mode == "monthly":
+        return day[:7]
+    return day
+
+
+def _series(days: List[Dict], mode: str, models: List[str]) -> Dict:
+    buckets: Dict[str, Dict] = {}
+    for entry in days:
+        bucket = buckets.setdefault(_bucket_key(entry["day"], mode), {"tokens": 0, "models": {}})
+        bucket["tokens"] += entry["tokens"]
+        for model, tokens in entry["models"].items():
+            bucket["models"][model] = bucket["models"].get(model, 0) + tokens
+    keys = sorted(buckets)  # Source days aren't guaranteed to be in order
+    return {
+        "keys": keys,
+        "tokens": [_round(buckets[key]["tokens"]) for key in keys],
+        # Model-major, in the order of the top-level `models` list.
+        "models": [[_round(buckets[key]["models"].get(model, 0)) for key in keys] for model in models],
+    }
+
+
+def _activity_year(year: int, tokens_by_day: Dict[str, int]) -> Dict:
+    """Mon-Sun weeks covering `year`, with a 0-4 intensity level per day."""
+    first, last = date(year, 1, 1), date(year, 12, 31)
+    start = first - timedelta(days=first.weekday())
+    end = last + timedelta(days=6 - last.weekday())
+    tokens = [tokens_by_day.get((start + timedelta(days=i)).isoformat(), 0) for i in range((end - start).days + 1)]
+
+    # Levels split the year's non-zero days into quartiles.
+    non_zero = sorted(t for t in tokens if t > 0)
+    thresholds = [non_zero[int(len(non_zero) * f)] if non_zero else 0 for f in (0.25, 0.5, 0.75)]
+
+    def level(t: int) -> str:
+        if t == 0:
+            return "0"
+        return str(1 + sum(t > threshold for threshold in thresholds))
+
+    return {"start": start.isoformat(), "tokens": tokens, "levels": "".join(level(t) for t in tokens)}
+
+
+def compact_codex_stats(raw: Dict, source_hash: str) -> Dict:
+    days = [
+        {
+            "day": str(entry["day"]),
+            "tokens": entry.get("tokens") or 0,
+            "models": {str(m): v for m, v in (entry.get("models") or {}).items()},
+        }
+        for entry in raw.get("days") or []
+        if entry.get("day")
+    ]
+    totals: Dict[str, float] = {}
+    for entry in days:
+        for model, tokens in entry["models"].items():
+            totals[model] = totals.get(model, 0) + tokens
+    models = sorted(totals, key=lambda model: -totals[model])
+
+    tokens_by_day = {entry["day"]: entry["tokens"] for entry in days}
+    years = sorted({entry["day"][:4] for entry in days})
+    return {
+        "version": CODEX_STATS_VERSION,
+        "source": source_hash,
+        "generatedAt": raw.get("generatedAt") or (days[-1]["day"] if days else ""),
+        "models": models,
+        "series": {mode: _series(days, mode, models) for mode in ("daily", "weekly", "monthly")},
+        "activity": {year: _activity_year(int(year), tokens_by_day) for year in years},
+    }
+
+
+def _read_source(source: str) -> bytes:
+    if source.startswith(("http://", "https://")):
+        import urllib.request  # Only needed when refreshing from the API
+
+        with urllib.request.urlopen(source, timeout=CODEX_STATS_TIMEOUT) as response:
+            return response.read()
+    return pathlib.Path(source).read_bytes()
+
+
+def _load_compact() -> Optional[Dict]:
+    if not CODEX_STATS_JSON.exists():
+        return None
+    try:
+        data = json.loads(CODEX_STATS_JSON.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    return data if data.get("version") == CODEX_STATS_VERSION else None
+
+
+@timed("codex stats")
+def update_codex_stats(source: str):
+    """Refresh CODEX_STATS_JSON from `source`; a no-op when the data is unchanged."""
+    try:
+        payload = _read_source(source)
+        raw = json.loads(payload)
+    except (OSError, ValueError) as e:  # URLError is an OSError
+        print(f"  ⚠ Warning: Codex stats unavailable from {source} ({e}); keeping {CODEX_STATS_JSON.name}")
+        return
+
+    source_hash = hashlib.sha256(payload).hexdigest()
+    existing = _load_compact()
+    if existing and existing.get("source") == source_hash:
+        return
+
+    compact = compact_codex_stats(raw, source_hash)
+    CODEX_STATS_JSON.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(
+        CODEX_STATS_JSON,
+        json.dumps(compact, separators=(",", ":")),
+        str(CODEX_STATS_JSON.relative_to(CODEX_STATS_JSON.parents[1])),
+    )
+
+
+def render_activity_svg(year: str, cells: Dict) -> str:
+    """Inline SVG heatmap for one year; keep in sync with activitySvg() in js/codex-stats.js."""
+    cell, gap, label_w, body_gap, months_h = (
+        CODEX_STATS_SVG[key] for key in ("cell", "gap", "label_w", "body_gap", "months_h")
+    )
+    step = cell + gap
+    start = date.fromisoformat(cells["start"])
+    weeks = len(cells["levels"]) // 7
+    grid_x = label_w + body_gap
+    width = grid_x + weeks * step - gap
+    height = months_h + 7 * step - gap
+
+    parts = [
+        f'<svg class="activity-svg" viewBox="0 0 {width} {height}" role="img" '
+        f'aria-label="Codex activity in {year}" data-year="{year}">'
+    ]
+    previous_month = None
+    for week in range(weeks):
+        month = (start + timedelta(days=week * 7)).month
+        if month != previous_month:
+            parts.append(f'<text class="activity-month-label" x="{grid_x + week * step}" y="{months_h - 5}">{MONTH_ABBRS[month - 1]}</text>')
+            previous_month = month
+    for row, label in DAY_LABELS.items():
+        parts.append(f'<text x="0" y="{months_h + row * step + cell - 3}">{label}</text>')
+    for i, (level, tokens) in enumerate(zip(cells["levels"], cells["tokens"])):
+        day = (start + timedelta(days=i)).isoformat()
+        parts.append(
+            f'<rect x="{grid_x + (i // 7) * step}" y="{months_h + (i % 7) * step}" width="{cell}" height="{cell}" '
+            f'data-level="{level}" data-date="{day}" data-tokens="{tokens}"/>'
+        )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def render_activity_graph() -> str:
+    """Prerendered activity section contents ("" until CODEX_STATS_JSON exists)."""
+    compact = _load_compact()
+    if not compact:
+        print(f"  ⚠ Warning: No {CODEX_STATS_JSON.name} snapshot; run with --codex-stats SOURCE and commit it")
+        return ""
+    if not compact["activity"]:
+        return ""
+    years = sorted(compact["activity"])
+    active = years[-1]
+    toggle = "".join(
+        f'<button class="codex-stats-toggle-btn{" active" if year == active else ""}" data-year="{year}">{year}</button>'
+        for year in years
+    )
+    legend = "".join(f'<div class="activity-cell activity-legend-cell" data-level="{i}"></div>' for i in range(5))
+    return (
+        f'<div class="activity-graph">{render_activity_svg(active, compact["activity"][active])}</div>\n'
+        '<div class="activity-footer">'
+        f'<div class="codex-stats-toggle">{toggle}</div>'
+        f'<div class="activity-legend"><span>Less</span>{legend}<span>More</span></div>'
+        "</div>"
+    )
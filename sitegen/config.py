@@ -0,0 +1,189 @@
+"""Paths, site settings and tuning constants shared by every stage."""
+
+import pathlib
+from datetime import timedelta, timezone
+from typing import Optional
+
+
+ROOT_DIR = pathlib.Path(__file__).parent.parent
+BLOG_DIR = ROOT_DIR / "blog"
+TEMPLATES_DIR = ROOT_DIR / "templates"
+
+SITE_URL = "https://gusarich.com"
+
+BLOG_POST_TEMPLATE_FILE = TEMPLATES_DIR / "blog-post.html"
+HOME_TEMPLATE_FILE = TEMPLATES_DIR / "home.html"
+BLOG_INDEX_TEMPLATE_FILE = TEMPLATES_DIR / "blog-index.html"
+NOT_FOUND_TEMPLATE_FILE = TEMPLATES_DIR / "404.html"
+
+PARTIALS_DIR = TEMPLATES_DIR / "partials"
+THEME_INIT_PARTIAL = PARTIALS_DIR / "theme-init.html"
+ANALYTICS_PARTIAL = PARTIALS_DIR / "analytics.html"
+
+POSTS_JSON = BLOG_DIR / "posts.json"
+SITEMAP_XML = ROOT_DIR / "sitemap.xml"
+BUILD_MANIFEST = ROOT_DIR / ".build-manifest.json"  # Committed: per-URL source hash + lastmod history
+BUILD_MANIFEST_VERSION = 2  # v2 hashes sources, not rendered pages; older histories reseed from sitemap.xml
+INDEX_HTML = ROOT_DIR / "index.html"
+INDEX_MD = ROOT_DIR / "index.md"
+BLOG_MD = ROOT_DIR / "blog.md"
+LLMS_TXT = ROOT_DIR / "llms.txt"
+LLMS_FULL_TXT = ROOT_DIR / "llms-full.txt"
+NOT_FOUND_HTML = ROOT_DIR / "404.html"
+BLOG_INDEX_HTML = ROOT_DIR / "blog.html"
+BLOG_INDEX_REDIRECT_HTML = BLOG_DIR / "index.html"
+CODEX_STATS_REDIRECT_HTML = ROOT_DIR / "codex-stats" / "index.html"
+
+# LLM tier list: the latest board is prerendered from the JSON; js/llm-tierlist.js
+# fetches the same file (fingerprinted on export) for the timeline and details.
+TIERLIST_TEMPLATE_FILE = TEMPLATES_DIR / "llm-tierlist.html"
+TIERLIST_HTML = ROOT_DIR / "llm-tierlist.html"
+TIERLIST_JSON = ROOT_DIR / "assets" / "llm-tierlist.json"
+TIERLIST_MAX_MODELS_PER_TIER = 2
+
+# Codex stats: `--codex-stats SOURCE` pre-aggregates the data into a columnar
+# JSON; the page prerenders the activity graph from it as inline SVG.
+CODEX_STATS_TEMPLATE_FILE = TEMPLATES_DIR / "codex-stats.html"
+CODEX_STATS_HTML = ROOT_DIR / "codex-stats.html"
+CODEX_STATS_JSON = ROOT_DIR / "assets" / "codex-stats.json"
+CODEX_STATS_VERSION = 2
+CODEX_STATS_TIMEOUT = 30
+CODEX_STATS_SVG = {"cell": 13, "gap": 2, "label_w": 28, "body_gap": 6, "months_h": 15}  # Matches pages.css
+
+# Resource hints: post pages prefetch their next/previous posts, the home page
+# its featured posts and /blog its newest PREFETCH_BLOG_TOP entries.
+# tools/serve.py reads PRELOAD_MANIFEST for Link preload headers.
+PREFETCH_BLOG_TOP = 3
+PREFETCH_EAGERNESS = "moderate"  # Speculation Rules: prefetch on hover/pointerdown
+PRELOAD_MANIFEST = ROOT_DIR / "preload-manifest.json"
+
+# Sitemap protocol limits; past either one, sitemap.xml becomes an index over shards.
+SITEMAP_MAX_URLS = 50_000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+SITEMAP_SHARD_DIR = "sitemaps"
+SITEMAP_URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+SITEMAP_URLSET_CLOSE = "</urlset>\n"
+
+# Feeds: RSS, Atom and JSON Feed share items; pages past the first go to FEED_ARCHIVE_DIR.
+FEED_FILES = {"rss": "feed.xml", "atom": "atom.xml", "json": "feed.json"}
+FEED_ARCHIVE_DIR = "feeds"
+FEED_PAGE_SIZE: Optional[int] = 20  # Items per feed page; None keeps every post in one feed
+FEED_TITLE = "Daniil Sedov — Blog"
+FEED_DESCRIPTION = "Personal notes on compilers, blockchain, and AI research."
+FEED_AUTHOR = "Daniil Sedov"
+FEED_DEFAULT_TZ = timezone(timedelta(hours=3))
+POST_CONTENT_OPEN = '<div id="blog-post-content" class="blog-post-content">'
+
+# Deploy export
+DEPLOYIGNORE_FILE = ROOT_DIR / ".deployignore"
+EXPORT_MANIFEST_NAME = ".deploy-manifest.json"
+EXPORT_DELETIONS_NAME = ".deploy-deletions.txt"
+EXPORT_MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Asset fingerprinting (export only; the committed tree keeps stable names)
+FINGERPRINT_ASSET_GLOBS = [
+    "styles.css", "tokens.css", "blog.js", "css/**/*.css", "js/**/*.js",
+    "assets/llm-tierlist.json", "assets/codex-stats.json",
+]
+FINGERPRINT_HASH_LENGTH = 10
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+HEADERS_FILE_NAME = "_headers"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Service worker (export only): precaches the site shell, recent posts and
+# feeds; entries carry a content revision so deploys refetch only changes.
+SW_TEMPLATE_FILE = TEMPLATES_DIR / "sw.js"
+SW_FILE_NAME = "sw.js"
+PRECACHE_MANIFEST_NAME = "precache-manifest.json"
+PRECACHE_MANIFEST_VERSION = 1
+SW_PRECACHE_PAGES = ["index.html", "blog.html", "404.html", "llm-tierlist.html", "codex-stats.html"]
+SW_PRECACHE_FILES = ["blog/posts.json", "feed.xml", "atom.xml", "feed.json"]
+SW_RECENT_POSTS = 5  # Newest posts precached as HTML + markdown
+SW_RUNTIME_MAX_ENTRIES = 50  # Other pages/assets kept after a visit
+SW_CACHE_CONTROL = "no-cache"
+
+# Frontend bundling (export only). Every page runs js/main.js; page-specific
+# modules it imports dynamically are inlined into that page's bundle.
+BUILD_CACHE_DIR = ROOT_DIR / ".build-cache"
+BUNDLE_CACHE_DIR = BUILD_CACHE_DIR / "bundles"
+BUNDLER_VERSION = 2
+JS_BUNDLE_ENTRY = "js/main.js"
+JS_BUNDLES = {
+    "home": [],
+    "post": ["js/blog/post-page.js"],
+    "llm-tierlist": ["js/llm-tierlist.js"],
+    "codex-stats": ["js/codex-stats.js"],
+}
+PAGE_BUNDLES = {
+    "llm-tierlist.html": "llm-tierlist",
+    "codex-stats.html": "codex-stats",
+}
+CSS_BUNDLE_ENTRY = "styles.css"
+CSS_BUNDLE_NAME = "site"
+BUNDLES_JS_DIR = "js/bundles"
+BUNDLES_CSS_DIR = "css/bundles"
+
+# Critical CSS (export only): rules matching the first elements of <body>
+# are inlined per template type; the full stylesheet loads asynchronously.
+CRITICAL_CSS_CACHE_DIR = BUILD_CACHE_DIR / "critical-css"
+CRITICAL_CSS_VERSION = 1
+CRITICAL_FOLD_ELEMENTS = 80
+CRITICAL_CSS_PAGES = {
+    "index.html": "home",
+    "blog.html": "blog-index",
+    "404.html": "404",
+    "llm-tierlist.html": "llm-tierlist",
+    "codex-stats.html": "codex-stats",
+}
+
+# HTML minification (export only); outputs are cached by input hash.
+HTML_MINIFY_CACHE_DIR = BUILD_CACHE_DIR / "html-min"
+HTML_MINIFIER_VERSION = 2  # Bump when the output changes, to invalidate the cache
+
+# --profile report (JSON, for CI comparisons between commits)
+PROFILE_JSON = BUILD_CACHE_DIR / "profile.json"
+
+# Image optimization (export only): PNGs are recompressed losslessly, and every
+# image is exported as a hardlink into a content-addressed store, so identical
+# files across posts share one copy.
+IMAGE_STORE_DIR = BUILD_CACHE_DIR / "image-store"
+IMAGE_OPTIMIZE_INDEX = BUILD_CACHE_DIR / "image-optimize.json"
+IMAGE_OPTIMIZER_VERSION = 2
+IMAGE_ASSET_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+# View-count snapshots (`--views`): ids per batched API request, request timeout in seconds
+VIEWCOUNT_BATCH_LIMIT = 100
+VIEWCOUNT_TIMEOUT = 10
+
+# Markdown conversion / post-processing
+MARKDOWN_EXTENSIONS = ["tables", "attr_list", "md_in_html", "fenced_code"]
+MAX_REFERENCE_LINKS = 20  # Supports [1]..[19]
+TOC_MIN_HEADINGS = 3  # Fewer headings still get anchors, but no TOC
+WORDS_PER_MINUTE = 230
+
+# Post images: intrinsic sizes come from file headers; the blurred placeholder
+# is the only step that decodes pixels, and it is cached by image hash.
+IMAGE_CACHE_FILE = BUILD_CACHE_DIR / "images.json"
+IMAGE_CACHE_VERSION = 1
+IMAGE_PLACEHOLDER_SIZE = 16  # Longest side, in pixels
+IMAGE_PLACEHOLDER_QUALITY = 40
+
+# Preview generation constants
+PREVIEW_WIDTH, PREVIEW_HEIGHT = 1200, 630
+PREVIEW_PADDING_X = 80
+PREVIEW_TITLE_SIZE = 74
+PREVIEW_FOOT_SIZE = 36
+PREVIEW_TOP_Y = 140
+
+PREVIEW_BG_COLOR = (10, 16, 28)
+PREVIEW_STRIPE_COLOR = (18, 30, 48)
+PREVIEW_STRIPE_SPACING = 70
+PREVIEW_STRIPE_BLUR = 4
+PREVIEW_BG_DIM_ALPHA = 0.35
+
+IBM_PLEX_BOLD = pathlib.Path("~/Library/Fonts/IBMPlexSans-Bold.ttf").expanduser()
+IBM_PLEX_REGULAR = pathlib.Path("~/Library/Fonts/IBMPlexSans-Regular.ttf").expanduser()
@@ -0,0 +1,232 @@
+"""Frontmatter, dates and markdown -> post HTML (markdown is imported on first use)."""
+
+import re
+from datetime import datetime
+from html import escape as html_escape, unescape as html_unescape
+from typing import Dict, List, Optional, Tuple
+
+from .config import MARKDOWN_EXTENSIONS, MAX_REFERENCE_LINKS, TOC_MIN_HEADINGS
+from .deps import require
+from .profiling import stage
+
+
+def parse_frontmatter(content: str) -> Tuple[Dict, str]:
+    """Parse frontmatter from markdown content."""
+    if not content.startswith("---"):
+        return {}, content
+
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return {}, content
+
+    _, frontmatter_block, body = parts
+
+    frontmatter = {}
+    for line in frontmatter_block.strip().splitlines():
+        if ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        frontmatter[key.strip()] = value.strip().strip('"')
+
+    return frontmatter, body.strip()
+
+# ------------------------------------------------------------------
+# Date Formatting
+# ------------------------------------------------------------------
+def format_date_display(date_str: str) -> str:
+    """Format date for display (e.g., '26 March 2025')."""
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    day = date.day
+    month = date.strftime("%B")
+    year = date.year
+    # Use non-breaking spaces
+    return f"{day}&nbsp;{month}&nbsp;{year}"
+
+def format_date_markdown(date_str: str) -> str:
+    """Format date for markdown (e.g., '26 March 2025')."""
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    return f"{date.day} {date.strftime('%B %Y')}"
+
+def format_date_iso(date_str: str, datetime_str: Optional[str] = None) -> str:
+    """Format date to ISO 8601 with timezone."""
+    # If we have a full datetime, use it directly
+    if datetime_str:
+        return datetime_str
+    # Otherwise format from date only
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    # Assuming GMT+3 as per the site
+    return date.strftime("%Y-%m-%dT%H:%M:%S+03:00")
+
+# ------------------------------------------------------------------
+# Markdown Processing
+# ------------------------------------------------------------------
+def process_markdown_content(content: str) -> str:
+    """Convert markdown to HTML with proper formatting."""
+    markdown = require("markdown")
+    with stage("markdown"):
+        # Configure markdown extensions
+        md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        html = md.convert(content)
+
+    with stage("post-processing"):
+        return postprocess_markdown_html(html)
+
+
+def postprocess_markdown_html(html: str) -> str:
+    """Site-specific fixes, references, tables, anchors and TOC on converted markdown."""
+    # Remove extra newline before </code></pre>
+    html = re.sub(r'\n</code></pre>', '</code></pre>', html)
+    
+    # Replace &amp; with & in headings (h1-h6) - but preserve the ID attributes!
+    def fix_heading_ampersands(match):
+        heading_content = match.group(0)
+        # Only replace &amp; inside the heading text, not in attributes
+        # This preserves the id="heading-X" attributes
+        heading_content = heading_content.replace('&amp;', '&')
+        return heading_content
+    
+    # Note: This regex preserves heading attributes including IDs
+    html = re.sub(r'<h[1-6][^>]*>.*?</h[1-6]>', fix_heading_ampersands, html, flags=re.DOTALL)
+    
+    # Convert reference numbers like [1], [2] etc. to clickable links
+    for i in range(1, MAX_REFERENCE_LINKS):
+        html = html.replace(f'[{i}]', f'<a href="#ref-{i}" class="reference-link">[{i}]</a>')
+    
+    # But don't replace inside code blocks - undo replacements there
+    def restore_in_code(match):
+        code_block = match.group(0)
+        # Restore reference links back to plain text in code blocks
+        for i in range(1, MAX_REFERENCE_LINKS):
+            code_block = code_block.replace(f'<a href="#ref-{i}" class="reference-link">[{i}]</a>', f'[{i}]')
+        return code_block
+    
+    html = re.sub(r'<code>.*?</code>', restore_in_code, html, flags=re.DOTALL)
+    html = re.sub(r'<pre>.*?</pre>', restore_in_code, html, flags=re.DOTALL)
+    
+    # Add IDs to reference list items for linking
+    ref_counter = 1
+    def add_ref_id(match):
+        nonlocal ref_counter
+        ref_item = match.group(0)
+        result = ref_item.replace('<li class="reference-item">', f'<li class="reference-item" id="ref-{ref_counter}">')
+        ref_counter += 1
+        return result
+    
+    html = re.sub(r'<li class="reference-item">.*?</li>', add_ref_id, html, flags=re.DOTALL)
+    
+    # Open all non-anchor links in a new tab.
+    # Keep in-page anchors like #section working normally.
+    def add_link_attrs(match):
+        full_match = match.group(0)
+        href = match.group(1).strip()
+
+        if not href:
+            return full_match
+
+        # Skip in-page navigation and special schemes.
+        if href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+            return full_match
+
+        # Ensure target/rel are present.
+        if 'target=' not in full_match:
+            full_match = full_match.replace('>', ' target="_blank" rel="noopener">')
+        elif 'rel=' not in full_match:
+            full_match = full_match.replace('>', ' rel="noopener">')
+
+        return full_match
+    
+    html = re.sub(r'<a href="([^"]+)"[^>]*>', add_link_attrs, html)
+
+    html = wrap_tables(html)
+    html, headings = add_heading_anchors(html)
+    if len(headings) >= TOC_MIN_HEADINGS:
+        html = insert_toc(html, headings)
+    
+    return html
+
+
+def _html_to_text(html: str) -> str:
+    return html_unescape(re.sub(r"<[^>]+>", " ", html))
+
+
+def _text_content(html: str) -> str:
+    """Like the DOM's textContent: tags are dropped without adding spaces."""
+    return html_unescape(re.sub(r"<[^>]+>", "", html))
+
+
+def _heading_id(text: str) -> str:
+    """Slug a heading the way the old client-side TOC did, so existing #links keep working."""
+    slug = re.sub(r"[^A-Za-z0-9_\s-]", "", text.strip().lower())
+    slug = re.sub(r"\s+", "-", slug)
+    return slug or "section"
+
+
+def add_heading_anchors(html: str) -> Tuple[str, List[Dict]]:
+    """Give every h2-h4 a stable unique ID and a trailing `#` anchor link.
+
+    Returns the new HTML and the headings as {id, text, level} in document order.
+    """
+    used_ids: Dict[str, int] = {}
+    headings: List[Dict] = []
+
+    def anchor_heading(match: re.Match) -> str:
+        level, attrs, inner = match.group(1), match.group(2) or "", match.group(3)
+        text = " ".join(_text_content(inner).split())
+
+        id_match = re.search(r'\sid="([^"]*)"', attrs)
+        base_id = (id_match.group(1) if id_match else "") or _heading_id(text)
+        count = used_ids.get(base_id, 0)
+        used_ids[base_id] = count + 1
+        heading_id = base_id if count == 0 else f"{base_id}-{count}"
+
+        attrs = re.sub(r'\sid="[^"]*"', "", attrs) + f' id="{heading_id}"'
+        headings.append({"id": heading_id, "text": text, "level": int(level)})
+        return (
+            f'<h{level}{attrs}>{inner}'
+            f'<a class="heading-link" href="#{heading_id}" aria-label="Anchor link"> #</a>'
+            f'</h{level}>'
+        )
+
+    html = re.sub(r"<h([2-4])(\s[^>]*)?>(.*?)</h\1>", anchor_heading, html, flags=re.DOTALL)
+    return html, headings
+
+
+def insert_toc(html: str, headings: List[Dict]) -> str:
+    """Insert the collapsible table of contents before the first h2/h3."""
+    items = "\n".join(
+        f'            <li class="toc-h{h["level"]}"><a href="#{h["id"]}">{html_escape(h["text"], quote=False)}</a></li>'
+        for h in headings
+    )
+    toc = f"""<div class="toc-container">
+    <div class="toc-header">
+        <h3>Table of Contents</h3>
+        <button class="toc-toggle">Expand</button>
+    </div>
+    <div class="toc-content collapsed">
+        <ul class="toc-list">
+{items}
+        </ul>
+    </div>
+</div>
+"""
+    first_heading = re.search(r"<h[23][\s>]", html)
+    position = first_heading.start() if first_heading else 0
+    return html[:position] + toc + html[position:]
+
+
+def wrap_tables(html: str) -> str:
+    """Wrap tables in a horizontally scrollable container."""
+    return re.sub(
+        r"<table\b.*?</table>",
+        lambda m: f'<div class="table-responsive">\n{m.group(0)}\n</div>',
+        html,
+        flags=re.DOTALL,
+    )
+
+
+def content_word_count(html: str) -> int:
+    """Count prose words in rendered post HTML (code blocks, TOC and anchors excluded)."""
+    prose = re.sub(r"<pre\b.*?</pre>", " ", html, flags=re.DOTALL)
+    prose = re.sub(r'<div class="toc-container">.*?</ul>\s*</div>\s*</div>', " ", prose, flags=re.DOTALL)
+    prose = re.sub(r'<a class="heading-link"[^>]*>.*?</a>', " ", prose)
+    return len(_html_to_text(prose).split())
@@ -0,0 +1,308 @@
+"""Inline above-the-fold CSS per template, load the rest async (export only)."""
+
+import hashlib
+import json
+import pathlib
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    CRITICAL_CSS_CACHE_DIR,
+    CRITICAL_CSS_PAGES,
+    CRITICAL_CSS_VERSION,
+    CRITICAL_FOLD_ELEMENTS,
+    CSS_BUNDLE_ENTRY,
+    ROOT_DIR,
+    TEMPLATES_DIR,
+)
+from .files import hash_file
+from .export import (
+    ExportOverlay,
+    iter_publishable_files,
+    load_deploy_ignore,
+    read_export_file,
+)
+from .bundle import css_segments, minify_css
+from .profiling import timed
+
+
+# (tag, id, classes, attrs, parent index or -1)
+FoldElement = Tuple[str, str, frozenset, Dict[str, str], int]
+
+HTML_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "source", "track", "wbr",
+}
+STYLESHEET_LINK_RE = re.compile(r"""<link\s+rel="stylesheet"\s+href="([^"]+)"\s*/?>""")
+CSS_COMPOUND_PART_RE = re.compile(
+    r"""(?P<tag>\*|[a-zA-Z][\w-]*)|\#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)"""
+    r"""|\[(?P<attr>[\w-]+)(?:(?P<op>[~|^$*]?=)(?P<val>"[^"]*"|'[^']*'|[^\]]*))?\s*[is]?\]"""
+    r"""|::?(?P<pseudo>[\w-]+)(?:\((?P<args>(?:[^()]|\([^()]*\))*)\))?"""
+)
+
+
+class _FoldParser(HTMLParser):
+    """Collect the first CRITICAL_FOLD_ELEMENTS elements of <body> (plus html/body)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements: List[FoldElement] = []
+        self.stack: List[int] = []
+        self.in_body = False
+        self.body_elements = 0
+
+    def handle_starttag(self, tag, attrs):
+        attr_map = {name: value or "" for name, value in attrs}
+        if tag == "html":
+            # Theme init adds `dark-mode` before first paint.
+            classes = frozenset(attr_map.get("class", "").split()) | {"dark-mode"}
+        else:
+            classes = frozenset(attr_map.get("class", "").split())
+
+        if tag == "body":
+            self.in_body = True
+        elif tag != "html":
+            if not self.in_body or self.body_elements >= CRITICAL_FOLD_ELEMENTS:
+                return
+            self.body_elements += 1
+
+        parent = self.stack[-1] if self.stack else -1
+        self.elements.append((tag, attr_map.get("id", ""), classes, attr_map, parent))
+        if tag not in HTML_VOID_TAGS:
+            self.stack.append(len(self.elements) - 1)
+
+    def handle_endtag(self, tag):
+        # Pop back to the matching element; stray end tags are ignored.
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.elements[self.stack[depth]][0] == tag:
+                del self.stack[depth:]
+                return
+
+
+def _fold_elements(html: str) -> List[FoldElement]:
+    parser = _FoldParser()
+    parser.feed(html)
+    return parser.elements
+
+
+def _split_top_level(text: str, sep: str) -> List[str]:
+    parts, depth, current = [], 0, ""
+    for ch in text:
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        if ch == sep and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+    parts.append(current)
+    return parts
+
+
+def _compound_matches(compound: str, element: FoldElement) -> bool:
+    tag, element_id, classes, attrs, _ = element
+    for match in CSS_COMPOUND_PART_RE.finditer(compound):
+        if match.group("tag") and match.group("tag") not in ("*", tag):
+            return False
+        if match.group("id") and match.group("id") != element_id:
+            return False
+        if match.group("cls") and match.group("cls") not in classes:
+            return False
+        if match.group("attr"):
+            name = match.group("attr")
+            if name not in attrs:
+                return False
+            # Only exact `[a="b"]` is checked; substring operators may match.
+            if match.group("op") == "=" and attrs[name] != match.group("val").strip().strip("'\""):
+                return False
+        if match.group("pseudo") == "root" and tag != "html":
+            return False
+        # Other pseudo-classes (:hover, :not(), ...) and pseudo-elements may
+        # apply to the element at some point, so they don't rule it out.
+    return True
+
+
+def _selector_matches(selector: str, elements: List[FoldElement]) -> bool:
+    """Whether `selector` can match an above-the-fold element.
+
+    Descendant and child combinators are checked against the ancestor chain;
+    sibling combinators only require the compound itself to match something.
+    """
+    parts = re.split(r"\s*([>+~])\s*|\s+", selector.strip())
+    compounds: List[str] = []
+    combinators: List[str] = []
+    pending = " "
+    for part in parts:
+        if part is None or part == "":
+            continue
+        if part in ">+~":
+            pending = part
+            continue
+        if compounds:
+            combinators.append(pending)
+        compounds.append(part)
+        pending = " "
+    if not compounds:
+        return False
+
+    def matches_from(index: int, compound_index: int) -> bool:
+        if compound_index < 0:
+            return True
+        combinator = combinators[compound_index]
+        compound = compounds[compound_index]
+        if combinator in "+~":
+            return any(_compound_matches(compound, e) for e in elements) and matches_from(index, compound_index - 1)
+        parent = elements[index][4]
+        while parent >= 0:
+            if _compound_matches(compound, elements[parent]) and matches_from(parent, compound_index - 1):
+                return True
+            if combinator == ">":
+                return False
+            parent = elements[parent][4]
+        return False
+
+    return any(
+        _compound_matches(compounds[-1], element) and matches_from(i, len(compounds) - 2)
+        for i, element in enumerate(elements)
+    )
+
+
+def _parse_css_blocks(css: str) -> List[Tuple[str, Optional[str]]]:
+    """Split CSS into top-level (prelude, block body) pairs; body is None for `@x ...;`."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    blocks: List[Tuple[str, Optional[str]]] = []
+    i, n, start = 0, len(css), 0
+    while i < n:
+        ch = css[i]
+        if ch in "'\"":
+            end = css.find(ch, i + 1)
+            i = n if end < 0 else end + 1
+            continue
+        if ch == ";":
+            blocks.append((css[start:i].strip(), None))
+            start = i = i + 1
+            continue
+        if ch == "{":
+            depth, j = 1, i + 1
+            while j < n and depth:
+                if css[j] in "'\"":
+                    end = css.find(css[j], j + 1)
+                    j = n if end < 0 else end + 1
+                    continue
+                depth += {"{": 1, "}": -1}.get(css[j], 0)
+                j += 1
+            blocks.append((css[start:i].strip(), css[i + 1:j - 1]))
+            start = i = j
+            continue
+        i += 1
+    return [(prelude, body) for prelude, body in blocks if prelude]
+
+
+def _critical_rules(css: str, elements: List[FoldElement]) -> List[str]:
+    rules = []
+    for prelude, body in _parse_css_blocks(css):
+        if body is None:
+            continue  # @import/@charset: the full stylesheet keeps those
+        if prelude.startswith("@"):
+            at_rule = prelude.split()[0].lower()
+            if at_rule in ("@media", "@supports", "@layer"):
+                nested = _critical_rules(body, elements)
+                if nested:
+                    rules.append(f"{prelude}{{{''.join(nested)}}}")
+            elif at_rule == "@font-face":
+                rules.append(f"{prelude}{{{body}}}")
+            continue
+        selectors = [
+            s.strip() for s in _split_top_level(prelude, ",")
+            if _selector_matches(s, elements)
+        ]
+        if selectors:
+            rules.append(f"{','.join(selectors)}{{{body}}}")
+    return rules
+
+
+def _critical_css_template(relpath: str) -> Optional[str]:
+    """Template type a rendered page belongs to (None for pages without one)."""
+    if relpath in CRITICAL_CSS_PAGES:
+        return CRITICAL_CSS_PAGES[relpath]
+    # blog/<slug>.html next to its blog/<slug>.md; blog/index.html is a redirect stub.
+    if relpath.startswith("blog/") and relpath.count("/") == 1 and relpath.endswith(".html"):
+        if (ROOT_DIR / relpath).with_suffix(".md").exists():
+            return "blog-post"
+    return None
+
+
+def compute_critical_css(template_type: str, pages: List[str], css: str, overlay: ExportOverlay) -> str:
+    """Critical CSS for one template type, cached per template, CSS and fold structure."""
+    elements: List[FoldElement] = []
+    for relpath in pages:
+        elements += _fold_elements(read_export_file(relpath, overlay).decode("utf-8"))
+
+    template_path = TEMPLATES_DIR / f"{template_type}.html"
+    template_hash = hash_file(template_path) if template_path.exists() else ""
+    signatures = sorted({
+        f"{tag}#{element_id}.{'.'.join(sorted(classes))}[{','.join(sorted(attrs))}]"
+        for tag, element_id, classes, attrs, _ in elements
+    })
+    cache_key = hashlib.sha256(json.dumps([
+        CRITICAL_CSS_VERSION,
+        template_type,
+        template_hash,
+        hashlib.sha256(css.encode("utf-8")).hexdigest(),
+        signatures,
+    ]).encode("utf-8")).hexdigest()
+
+    cache_path = CRITICAL_CSS_CACHE_DIR / f"{template_type}.json"
+    if cache_path.exists():
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("key") == cache_key:
+            return cached["css"]
+
+    critical, _ = minify_css("".join(_critical_rules(css, elements)), -1, 0)
+    critical = critical.replace("</style", "<\\/style")
+    CRITICAL_CSS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps({"key": cache_key, "css": critical}), encoding="utf-8")
+    print(f"  ✓ Computed critical CSS for {template_type} ({len(critical):,} bytes)")
+    return critical
+
+
+def _deferred_stylesheet_html(critical_css: str, href: str) -> str:
+    return (
+        f"<style>{critical_css}</style>\n"
+        f"<link rel=\"preload\" href=\"{href}\" as=\"style\" "
+        f"onload=\"this.onload=null;this.rel='stylesheet'\" />\n"
+        f"<noscript><link rel=\"stylesheet\" href=\"{href}\" /></noscript>"
+    )
+
+
+@timed("export: critical css")
+def inline_critical_css(overlay: ExportOverlay, skip_dirs: Tuple[pathlib.Path, ...] = ()):
+    """Inline per-template critical CSS and load the full stylesheet without blocking."""
+    remote: List[str] = []
+    css = "\n".join(text for _, text in css_segments(CSS_BUNDLE_ENTRY, set(), remote))
+
+    pages_by_template: Dict[str, List[str]] = {}
+    for relpath in iter_publishable_files(load_deploy_ignore(), skip_dirs):
+        template_type = _critical_css_template(relpath) if relpath.endswith(".html") else None
+        if template_type:
+            pages_by_template.setdefault(template_type, []).append(relpath)
+
+    rewritten_pages = 0
+    for template_type, pages in sorted(pages_by_template.items()):
+        critical = compute_critical_css(template_type, pages, css, overlay)
+        for relpath in pages:
+            html = read_export_file(relpath, overlay).decode("utf-8")
+            match = STYLESHEET_LINK_RE.search(html)
+            if not match:
+                continue
+            line_start = html.rfind("\n", 0, match.start()) + 1
+            indent = html[line_start:match.start()]
+            replacement = _deferred_stylesheet_html(critical, match.group(1)).replace("\n", "\n" + indent)
+            html = html[:match.start()] + replacement + html[match.end():]
+            overlay[relpath] = html.encode("utf-8")
+            rewritten_pages += 1
+
+    print(f"  ✓ Inlined critical CSS into {rewritten_pages} pages")
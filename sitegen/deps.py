@@ -0,0 +1,18 @@
+"""Heavy third-party dependencies, imported by the stages that use them."""
+
+import importlib
+import sys
+
+
+def require(module: str):
+    """Import `module` on first use, or exit with an install hint if it's missing.
+
+    markdown and Pillow are only needed to render posts and images, so page-only
+    runs and tools that import the stage modules never pay for them.
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        print("Error: Missing required library. Please install with:")
+        print("  pip3 install markdown pillow")
+        sys.exit(1)
@@ -0,0 +1,282 @@
+"""Deploy export: .deployignore rules, content-hashed manifest, delta export."""
+
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shutil
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    DEPLOYIGNORE_FILE,
+    EXPORT_DELETIONS_NAME,
+    EXPORT_MANIFEST_NAME,
+    EXPORT_MANIFEST_VERSION,
+    ROOT_DIR,
+)
+from .files import hash_file
+from .profiling import stage, timed
+
+
+IgnoreRule = Tuple[re.Pattern, bool, bool]  # (regex, negated, dir_only)
+ExportOverlay = Dict[str, bytes]  # relpath -> exported bytes replacing/adding to the tree
+ExportLinks = Dict[str, pathlib.Path]  # relpath -> file hardlinked in place of the tree copy
+
+
+def _compile_ignore_pattern(line: str) -> Optional[IgnoreRule]:
+    """Compile one .gitignore-style line into a regex over repo-relative paths."""
+    pattern = line.rstrip()
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    # A slash anywhere but the end anchors the pattern to the repo root.
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    if not pattern:
+        return None
+
+    body = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            body += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            body += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            body += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            body += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body += "[" + pattern[i + 1:end].replace("\\", "\\\\") + "]"
+            i = end + 1
+        else:
+            body += re.escape(pattern[i])
+            i += 1
+
+    prefix = "^" if anchored else "^(?:.*/)?"
+    return re.compile(prefix + body + "$"), negated, dir_only
+
+
+def load_deploy_ignore() -> List[IgnoreRule]:
+    if not DEPLOYIGNORE_FILE.exists():
+        return []
+    rules = []
+    for line in DEPLOYIGNORE_FILE.read_text(encoding="utf-8").splitlines():
+        rule = _compile_ignore_pattern(line)
+        if rule:
+            rules.append(rule)
+    return rules
+
+
+def _is_ignored(relpath: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    ignored = False
+    for regex, negated, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        if regex.match(relpath):
+            ignored = not negated
+    return ignored
+
+
+def iter_publishable_files(
+    rules: List[IgnoreRule],
+    skip_dirs: Tuple[pathlib.Path, ...] = (),
+):
+    """Yield repo-relative POSIX paths of every file that ships with the site.
+
+    Directories holding a deploy manifest are earlier exports (e.g. `dist/`
+    while exporting `dist2/ --since dist/...`) and are never published.
+    """
+    skip = {str(path) for path in skip_dirs}
+    for dirpath, dirnames, filenames in os.walk(ROOT_DIR):
+        rel_dir = pathlib.Path(dirpath).relative_to(ROOT_DIR).as_posix()
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if str(pathlib.Path(dirpath, d).resolve()) not in skip
+            and not (pathlib.Path(dirpath, d) / EXPORT_MANIFEST_NAME).exists()
+            and not _is_ignored(rel_dir + d, True, rules)
+        )
+        for name in sorted(filenames):
+            relpath = rel_dir + name
+            if not _is_ignored(relpath, False, rules):
+                yield relpath
+
+
+def _load_deploy_manifest(path: pathlib.Path) -> Dict[str, Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != EXPORT_MANIFEST_VERSION:
+        print(f"Error: Unsupported deploy manifest version in {path}")
+        sys.exit(1)
+    return manifest.get("files", {})
+
+
+@timed("export: manifest")
+def build_deploy_manifest(
+    previous: Optional[Dict[str, Dict]] = None,
+    skip_dirs: Tuple[pathlib.Path, ...] = (),
+    overlay: Optional[ExportOverlay] = None,
+    links: Optional[ExportLinks] = None,
+) -> Dict[str, Dict]:
+    """Hash every publishable file.
+
+    Hashes from `previous` are reused when size and mtime are unchanged, so
+    repeated exports from the same checkout don't re-read every image.
+    Overlay entries are hashed from their in-memory bytes instead, and linked
+    entries take the hash their content-addressed store name already carries.
+    """
+    previous = previous or {}
+    overlay = overlay or {}
+    links = links or {}
+    rules = load_deploy_ignore()
+    files: Dict[str, Dict] = {}
+
+    for relpath in iter_publishable_files(rules, skip_dirs):
+        if relpath in overlay:
+            continue
+        if relpath in links:
+            files[relpath] = {
+                "sha256": links[relpath].stem,
+                "size": links[relpath].stat().st_size,
+            }
+            continue
+        stat = (ROOT_DIR / relpath).stat()
+        old = previous.get(relpath)
+        if old and old.get("size") == stat.st_size and old.get("mtime_ns") == stat.st_mtime_ns:
+            sha256 = old["sha256"]
+        else:
+            sha256 = hash_file(ROOT_DIR / relpath)
+        files[relpath] = {
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    for relpath, data in overlay.items():
+        files[relpath] = {
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+        }
+
+    return dict(sorted(files.items()))
+
+
+def _link_or_copy(src: pathlib.Path, dst: pathlib.Path):
+    """Hardlink `src` (a write-once content-addressed store file) or copy it."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Cross-device or unsupported filesystem: fall back to a real copy.
+        shutil.copy2(src, dst)
+
+
+def read_export_file(relpath: str, overlay: ExportOverlay) -> bytes:
+    """Return the bytes a file will be exported with (overlay wins over the tree)."""
+    if relpath in overlay:
+        return overlay[relpath]
+    return (ROOT_DIR / relpath).read_bytes()
+
+
+def export_site(
+    export_dir: pathlib.Path,
+    since: Optional[pathlib.Path] = None,
+    fingerprint: bool = False,
+    bundle: bool = False,
+    critical_css: bool = False,
+    minify_html: bool = False,
+    optimize_images: bool = False,
+    service_worker: bool = False,
+):
+    """Export the publishable tree to `export_dir`.
+
+    With `since`, only files added or changed relative to that manifest are
+    exported, and removed paths are listed in the deletions file.
+    """
+    export_dir = export_dir.resolve()
+    if export_dir.exists() and any(export_dir.iterdir()):
+        print(f"Error: Export directory is not empty: {export_dir}")
+        sys.exit(1)
+    if since and not since.exists():
+        print(f"Error: Deploy manifest not found: {since}")
+        sys.exit(1)
+
+    # Stage modules import helpers from here, so they are loaded on demand.
+    overlay: ExportOverlay = {}
+    links: ExportLinks = {}
+    if optimize_images:
+        from .images import optimize_image_assets
+        optimize_image_assets(links, skip_dirs=(export_dir,))
+    if bundle:
+        from .bundle import bundle_assets
+        bundle_assets(overlay, skip_dirs=(export_dir,))
+    if critical_css:
+        from .critical_css import inline_critical_css
+        inline_critical_css(overlay, skip_dirs=(export_dir,))
+    if fingerprint:
+        from .fingerprint import fingerprint_assets
+        fingerprint_assets(overlay, skip_dirs=(export_dir,))
+    # Last: earlier stages match quoted attributes that minification unquotes.
+    if minify_html:
+        from .minify_html import minify_html_pages
+        minify_html_pages(overlay, skip_dirs=(export_dir,))
+    # After minification: precache revisions hash the final page bytes.
+    if service_worker:
+        from .service_worker import generate_service_worker
+        generate_service_worker(overlay, skip_dirs=(export_dir,))
+
+    previous = _load_deploy_manifest(since) if since else {}
+    current = build_deploy_manifest(
+        previous, skip_dirs=(export_dir,), overlay=overlay, links=links
+    )
+
+    added = [p for p in current if p not in previous]
+    changed = [
+        p for p in current
+        if p in previous and previous[p]["sha256"] != current[p]["sha256"]
+    ]
+    deleted = sorted(p for p in previous if p not in current)
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+    with stage("export: copy"):
+        for relpath in added + changed:
+            if relpath in overlay:
+                (export_dir / relpath).parent.mkdir(parents=True, exist_ok=True)
+                (export_dir / relpath).write_bytes(overlay[relpath])
+            elif relpath in links:
+                _link_or_copy(links[relpath], export_dir / relpath)
+            else:
+                # Tree files are copied: the generator rewrites them in place,
+                # which would silently change a hardlinked export.
+                (export_dir / relpath).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(ROOT_DIR / relpath, export_dir / relpath)
+
+    manifest = {"version": EXPORT_MANIFEST_VERSION, "files": current}
+    with open(export_dir / EXPORT_MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    (export_dir / EXPORT_DELETIONS_NAME).write_text(
+        "".join(f"{p}\n" for p in deleted), encoding="utf-8"
+    )
+
+    exported_bytes = sum(current[p]["size"] for p in added + changed)
+    total_bytes = sum(entry["size"] for entry in current.values())
+    print(
+        f"  ✓ Exported {len(added)} added, {len(changed)} changed, {len(deleted)} deleted "
+        f"({exported_bytes:,} of {total_bytes:,} bytes) to {export_dir}"
+    )
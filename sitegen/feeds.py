@@ -0,0 +1,247 @@
+"""posts.json and the RSS/Atom/JSON feeds."""
+
+import json
+import posixpath
+import re
+from datetime import datetime
+from email.utils import format_datetime
+from html import escape as html_escape
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    BLOG_DIR,
+    FEED_ARCHIVE_DIR,
+    FEED_AUTHOR,
+    FEED_DEFAULT_TZ,
+    FEED_DESCRIPTION,
+    FEED_FILES,
+    FEED_PAGE_SIZE,
+    FEED_TITLE,
+    POSTS_JSON,
+    POST_CONTENT_OPEN,
+    ROOT_DIR,
+    SITE_URL,
+)
+from .files import write_if_changed
+from .profiling import timed
+
+
+@timed("posts.json")
+def update_posts_json(posts_data: List[Dict]):
+    """Update the posts.json file with current posts."""
+    posts_sorted = sorted(posts_data, key=lambda x: x['date'])
+
+    with open(POSTS_JSON, 'w', encoding='utf-8') as f:
+        json.dump(posts_sorted, f, indent=4)
+    
+    print(f"  ✓ Updated posts.json with {len(posts_sorted)} posts")
+
+def _post_datetime(post: Dict) -> datetime:
+    """Publication time of a post; date-only posts default to 09:30 GMT+3."""
+    if post.get("datetime"):
+        return datetime.strptime(post["datetime"], "%Y-%m-%dT%H:%M:%S%z")
+    return datetime.strptime(post["date"], "%Y-%m-%d").replace(
+        hour=9, minute=30, tzinfo=FEED_DEFAULT_TZ
+    )
+
+
+def _rendered_post_content(slug: str) -> Optional[str]:
+    """Pull the article body back out of the rendered blog/<slug>.html, ready for feeds.
+
+    Feed readers don't run the site's JS or CSS, so the TOC, heading anchors and
+    image placeholders are dropped, and site-relative URLs are made absolute.
+    """
+    page_path = BLOG_DIR / f"{slug}.html"
+    if not page_path.exists():
+        return None
+    page = page_path.read_text(encoding="utf-8")
+    start = page.find(POST_CONTENT_OPEN)
+    end = page.find("</article>", start)
+    if start == -1 or end == -1:
+        return None
+    body = page[start + len(POST_CONTENT_OPEN):end]
+    body = body[:body.rfind("</div>")].strip()
+
+    body = re.sub(r'<div class="toc-container">.*?</ul>\s*</div>\s*</div>\n?', "", body, flags=re.DOTALL)
+    body = re.sub(r' ?<a class="heading-link"[^>]*>.*?</a>', "", body)
+    body = re.sub(r' style="background-image: url\(data:[^)]*\); background-size: cover;"', "", body)
+    body = re.sub(r'; background-image: url\(data:[^)]*\); background-size: cover;', ";", body)
+    body = body.replace(" data-placeholder", "")
+    body = re.sub(r'\b(href|src)="/(?!/)', rf'\1="{SITE_URL}/', body)
+    body = re.sub(r'\bhref="#', f'href="{SITE_URL}/blog/{slug}#', body)
+    return body
+
+
+def _feed_page_path(kind: str, page: int) -> str:
+    """Site-relative path of feed page `page` (1-based) for `kind` in FEED_FILES."""
+    if page == 1:
+        return FEED_FILES[kind]
+    stem, ext = posixpath.splitext(posixpath.basename(FEED_FILES[kind]))
+    return f"{FEED_ARCHIVE_DIR}/{stem}-{page}{ext}"
+
+
+def _paging_links(kind: str, page: int, pages: int) -> List[Tuple[str, str]]:
+    """RFC 5005 paged-feed links as (rel, absolute URL) pairs."""
+    if pages == 1:
+        return []
+    links = [("first", _feed_page_path(kind, 1)), ("last", _feed_page_path(kind, pages))]
+    if page > 1:
+        links.append(("previous", _feed_page_path(kind, page - 1)))
+    if page < pages:
+        links.append(("next", _feed_page_path(kind, page + 1)))
+    return [(rel, f"{SITE_URL}/{path}") for rel, path in links]
+
+
+def _cdata(text: str) -> str:
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def _rss_page(items: List[Dict], page: int, pages: int) -> str:
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/">\n',
+        "  <channel>\n",
+        f"    <title>{html_escape(FEED_TITLE, quote=False)}</title>\n",
+        f"    <link>{SITE_URL}/</link>\n",
+        f"    <description>{html_escape(FEED_DESCRIPTION, quote=False)}</description>\n",
+        "    <language>en-us</language>\n",
+        f'    <atom:link href="{SITE_URL}/{_feed_page_path("rss", page)}" rel="self" type="application/rss+xml"/>\n',
+    ]
+    for rel, href in _paging_links("rss", page, pages):
+        out.append(f'    <atom:link href="{href}" rel="{rel}" type="application/rss+xml"/>\n')
+    if items:
+        out.append(f"    <lastBuildDate>{format_datetime(items[0]['published'])}</lastBuildDate>\n")
+    out.append("\n")
+
+    for item in items:
+        out.append("    <item>\n")
+        out.append(f"      <title>{html_escape(item['title'], quote=False)}</title>\n")
+        out.append(f"      <link>{item['url']}</link>\n")
+        out.append(f'      <guid isPermaLink="false">{item["id"]}</guid>\n')
+        out.append(f"      <pubDate>{format_datetime(item['published'])}</pubDate>\n")
+        out.append(f"      <category>{html_escape(item['type'], quote=False)}</category>\n")
+        out.append(f"      <description>{_cdata(item['summary'])}</description>\n")
+        if item["content"]:
+            out.append(f"      <content:encoded>{_cdata(item['content'])}</content:encoded>\n")
+        out.append("    </item>\n\n")
+
+    out.append("  </channel>\n</rss>\n")
+    return "".join(out)
+
+
+def _atom_page(items: List[Dict], page: int, pages: int) -> str:
+    updated = items[0]["published"].isoformat() if items else datetime.now(FEED_DEFAULT_TZ).isoformat()
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="en-us">\n',
+        f"  <title>{html_escape(FEED_TITLE, quote=False)}</title>\n",
+        f"  <subtitle>{html_escape(FEED_DESCRIPTION, quote=False)}</subtitle>\n",
+        f"  <id>{SITE_URL}/</id>\n",
+        f'  <link href="{SITE_URL}/"/>\n',
+        f'  <link href="{SITE_URL}/{_feed_page_path("atom", page)}" rel="self" type="application/atom+xml"/>\n',
+    ]
+    for rel, href in _paging_links("atom", page, pages):
+        out.append(f'  <link href="{href}" rel="{rel}" type="application/atom+xml"/>\n')
+    out.append(f"  <updated>{updated}</updated>\n")
+    out.append(f"  <author><name>{html_escape(FEED_AUTHOR, quote=False)}</name></author>\n\n")
+
+    for item in items:
+        published = item["published"].isoformat()
+        out.append("  <entry>\n")
+        out.append(f"    <title>{html_escape(item['title'], quote=False)}</title>\n")
+        out.append(f'    <link href="{item["url"]}"/>\n')
+        out.append(f"    <id>{item['url']}</id>\n")
+        out.append(f"    <published>{published}</published>\n")
+        out.append(f"    <updated>{published}</updated>\n")
+        out.append(f'    <category term="{html_escape(item["type"])}"/>\n')
+        out.append(f'    <summary type="text">{html_escape(item["summary"], quote=False)}</summary>\n')
+        if item["content"]:
+            out.append(f'    <content type="html">{html_escape(item["content"], quote=False)}</content>\n')
+        out.append("  </entry>\n\n")
+
+    out.append("</feed>\n")
+    return "".join(out)
+
+
+def _json_feed_page(items: List[Dict], page: int, pages: int) -> str:
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": FEED_TITLE,
+        "home_page_url": f"{SITE_URL}/",
+        "feed_url": f"{SITE_URL}/{_feed_page_path('json', page)}",
+        "description": FEED_DESCRIPTION,
+        "language": "en-US",
+        "authors": [{"name": FEED_AUTHOR, "url": f"{SITE_URL}/"}],
+    }
+    if page < pages:
+        feed["next_url"] = f"{SITE_URL}/{_feed_page_path('json', page + 1)}"
+    feed["items"] = []
+    for item in items:
+        entry = {
+            "id": item["id"],
+            "url": item["url"],
+            "title": item["title"],
+            "summary": item["summary"],
+            "date_published": item["published"].isoformat(),
+            "tags": [item["type"]],
+        }
+        if item["content"]:
+            entry["content_html"] = item["content"]
+        else:
+            entry["content_text"] = item["summary"]
+        feed["items"].append(entry)
+    return json.dumps(feed, indent=2, ensure_ascii=False) + "\n"
+
+
+FEED_RENDERERS = {"rss": _rss_page, "atom": _atom_page, "json": _json_feed_page}
+
+
+@timed("feeds")
+def generate_feeds(posts_data: List[Dict]):
+    """Generate RSS, Atom and JSON Feed outputs from posts data in one pass.
+
+    Item bodies come from the already-rendered post pages. With FEED_PAGE_SIZE
+    set, older posts spill into RFC 5005 paged archives under FEED_ARCHIVE_DIR.
+    """
+    posts_sorted = sorted(posts_data, key=lambda x: x['date'], reverse=True)
+    items = [
+        {
+            "id": post["id"],
+            "url": f"{SITE_URL}/blog/{post['id']}",
+            "title": post["title"],
+            "summary": post.get("summary", ""),
+            "type": post.get("type", "research"),
+            "published": _post_datetime(post),
+            "content": _rendered_post_content(post["id"]),
+        }
+        for post in posts_sorted
+    ]
+
+    page_size = FEED_PAGE_SIZE or max(len(items), 1)
+    pages = max(1, -(-len(items) // page_size))
+    written = set()
+    for page in range(1, pages + 1):
+        page_items = items[(page - 1) * page_size:page * page_size]
+        for kind, render in FEED_RENDERERS.items():
+            relpath = _feed_page_path(kind, page)
+            path = ROOT_DIR / relpath
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(path, render(page_items, page, pages), relpath)
+            written.add(relpath)
+
+    # Drop archive pages left over from a longer feed.
+    archive_dir = ROOT_DIR / FEED_ARCHIVE_DIR
+    if archive_dir.is_dir():
+        for stale in archive_dir.iterdir():
+            relpath = f"{FEED_ARCHIVE_DIR}/{stale.name}"
+            if relpath not in written:
+                stale.unlink()
+                print(f"  ✓ Removed {relpath}")
+        if not any(archive_dir.iterdir()):
+            archive_dir.rmdir()
+
+    print(
+        f"  ✓ Generated {', '.join(FEED_FILES.values())} with {len(items)} items "
+        f"across {pages} page{'s' if pages != 1 else ''}"
+    )
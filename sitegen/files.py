@@ -0,0 +1,24 @@
+"""Small file helpers shared by the build stages."""
+
+import hashlib
+import pathlib
+
+from .config import HASH_CHUNK_SIZE
+
+
+def hash_file(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_if_changed(path: pathlib.Path, content: str, label: str):
+    existing = path.read_text(encoding="utf-8") if path.exists() else ""
+    normalized = content if content.endswith("\n") else content + "\n"
+    if existing == normalized:
+        return
+
+    path.write_text(normalized, encoding="utf-8")
+    print(f"  ✓ Updated {label}")
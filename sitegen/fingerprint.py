@@ -0,0 +1,155 @@
+"""Content-hashed CSS/JS/JSON asset URLs (export only)."""
+
+import fnmatch
+import hashlib
+import json
+import pathlib
+import posixpath
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    ASSET_MANIFEST_NAME,
+    FINGERPRINT_ASSET_GLOBS,
+    FINGERPRINT_HASH_LENGTH,
+    HEADERS_FILE_NAME,
+    IMMUTABLE_CACHE_CONTROL,
+    ROOT_DIR,
+)
+from .export import (
+    ExportOverlay,
+    iter_publishable_files,
+    load_deploy_ignore,
+    read_export_file,
+)
+from .profiling import timed
+
+
+# Quoted references such as `import ... from './core.js'`, `@import url('tokens.css')`,
+# `new URL('js/main.js', ...)`, `href="/styles.css"` or `fetch('/assets/data.json')`.
+QUOTED_ASSET_REF_RE = re.compile(r"""(['"])((?:\.{1,2}/|/)?[\w./-]+\.(?:css|js|json))\1""")
+# Unquoted CSS `url(...)` references.
+CSS_URL_REF_RE = re.compile(r"""url\(\s*((?:\.{1,2}/|/)?[\w./-]+\.css)\s*\)""")
+
+
+def resolve_asset_ref(ref: str, from_relpath: str) -> str:
+    if ref.startswith("/"):
+        return ref.lstrip("/")
+    base = posixpath.dirname(from_relpath)
+    return posixpath.normpath(posixpath.join(base, ref))
+
+
+def _asset_ref_to(target: str, original_ref: str, from_relpath: str) -> str:
+    """Reference `target` in the same style (absolute, ./relative, bare) as `original_ref`."""
+    if original_ref.startswith("/"):
+        return "/" + target
+    new_ref = posixpath.relpath(target, posixpath.dirname(from_relpath) or ".")
+    if original_ref.startswith(("./", "../")) and not new_ref.startswith("../"):
+        new_ref = "./" + new_ref
+    return new_ref
+
+
+def _fingerprinted_name(relpath: str, data: bytes) -> str:
+    stem, ext = posixpath.splitext(relpath)
+    digest = hashlib.sha256(data).hexdigest()[:FINGERPRINT_HASH_LENGTH]
+    return f"{stem}.{digest}{ext}"
+
+
+def rewrite_asset_refs(
+    text: str,
+    from_relpath: str,
+    mapping: Dict[str, str],
+    found: Optional[set] = None,
+) -> str:
+    """Swap references to known assets for the paths in `mapping`.
+
+    References keep their style, so `./core.js` stays relative and
+    `/styles.css` stays absolute. Resolved targets are collected into `found`.
+    """
+    def replace_ref(match: re.Match, ref_group: int) -> str:
+        ref = match.group(ref_group)
+        target = resolve_asset_ref(ref, from_relpath)
+        if found is not None and target in mapping:
+            found.add(target)
+        replacement = mapping.get(target)
+        if not replacement:
+            return match.group(0)
+        new_ref = _asset_ref_to(replacement, ref, from_relpath)
+        start, end = match.span(ref_group)
+        offset = match.start(0)
+        full = match.group(0)
+        return full[: start - offset] + new_ref + full[end - offset:]
+
+    text = QUOTED_ASSET_REF_RE.sub(lambda m: replace_ref(m, 2), text)
+    if from_relpath.endswith(".css"):
+        text = CSS_URL_REF_RE.sub(lambda m: replace_ref(m, 1), text)
+    return text
+
+
+@timed("export: fingerprint")
+def fingerprint_assets(overlay: ExportOverlay, skip_dirs: Tuple[pathlib.Path, ...] = ()) -> Dict[str, str]:
+    """Add content-hashed copies of the CSS/JS/JSON assets to `overlay`.
+
+    Assets are hashed after their own references are rewritten, so a change in
+    `js/core.js` also renames every module that imports it. Rendered HTML pages
+    are rewritten to point at the hashed names. Returns {asset: hashed_asset}.
+    """
+    assets = set()
+    for pattern in FINGERPRINT_ASSET_GLOBS:
+        for path in ROOT_DIR.glob(pattern):
+            if path.is_file():
+                assets.add(path.relative_to(ROOT_DIR).as_posix())
+        # Bundles only exist in the overlay.
+        assets.update(p for p in overlay if fnmatch.fnmatch(p, pattern))
+
+    identity = {relpath: relpath for relpath in assets}
+    sources = {
+        relpath: read_export_file(relpath, overlay).decode("utf-8")
+        for relpath in assets
+    }
+    hashed: Dict[str, str] = {}
+    visiting: List[str] = []
+
+    def visit(relpath: str):
+        if relpath in hashed:
+            return
+        if relpath in visiting:
+            cycle = " -> ".join(visiting[visiting.index(relpath):] + [relpath])
+            print(f"Error: Cannot fingerprint circular asset references: {cycle}")
+            sys.exit(1)
+
+        visiting.append(relpath)
+        deps: set = set()
+        rewrite_asset_refs(sources[relpath], relpath, identity, found=deps)
+        for dep in sorted(deps):
+            visit(dep)
+        data = rewrite_asset_refs(sources[relpath], relpath, hashed).encode("utf-8")
+        hashed[relpath] = _fingerprinted_name(relpath, data)
+        overlay[hashed[relpath]] = data
+        visiting.pop()
+
+    for relpath in sorted(assets):
+        visit(relpath)
+
+    rewritten_pages = 0
+    for relpath in iter_publishable_files(load_deploy_ignore(), skip_dirs):
+        if not relpath.endswith(".html"):
+            continue
+        html = read_export_file(relpath, overlay).decode("utf-8")
+        rewritten = rewrite_asset_refs(html, relpath, hashed)
+        if rewritten != html:
+            overlay[relpath] = rewritten.encode("utf-8")
+            rewritten_pages += 1
+
+    asset_manifest = {asset: f"/{hashed[asset]}" for asset in sorted(hashed)}
+    overlay[ASSET_MANIFEST_NAME] = (json.dumps(asset_manifest, indent=2) + "\n").encode("utf-8")
+
+    headers = "".join(
+        f"/{hashed[asset]}\n  Cache-Control: {IMMUTABLE_CACHE_CONTROL}\n"
+        for asset in sorted(hashed)
+    )
+    overlay[HEADERS_FILE_NAME] = headers.encode("utf-8")
+
+    print(f"  ✓ Fingerprinted {len(hashed)} assets, rewrote {rewritten_pages} pages")
+    return hashed
@@ -0,0 +1,135 @@
+"""Resource hints: speculative prefetch of likely next pages, and the preload
+manifest tools/serve.py turns into `Link` headers / 103 Early Hints."""
+
+import json
+import posixpath
+import re
+from typing import Dict, List, Optional
+
+from .config import BLOG_DIR, POSTS_JSON, PREFETCH_EAGERNESS, PRELOAD_MANIFEST, ROOT_DIR
+from .files import write_if_changed
+from .profiling import timed
+
+# Render-blocking references in a page's <head>, and @imports in stylesheets.
+HEAD_RE = re.compile(r"<head\b.*?</head>", flags=re.DOTALL | re.IGNORECASE)
+STYLESHEET_LINK_RE = re.compile(r"""<link\b[^>]*\brel=["']?stylesheet\b[^>]*>""", flags=re.IGNORECASE)
+SCRIPT_SRC_RE = re.compile(r"""<script\b[^>]*\bsrc=["']?([^"'\s>]+)""", flags=re.IGNORECASE)
+HREF_RE = re.compile(r"""\bhref=["']?([^"'\s>]+)""", flags=re.IGNORECASE)
+CSS_IMPORT_RE = re.compile(r"""@import\s+(?:url\(\s*)?["']?([^"')\s;]+)""")
+# Module URLs a classic bootstrap script loads (blog.js -> js/main.js).
+JS_MODULE_REF_RE = re.compile(r"""(['"])((?:\.{1,2}/|/)?[\w./-]+\.js)\1""")
+
+
+def render_prefetch_hints(urls: List[str]) -> str:
+    """Speculation Rules for `urls`, plus `<link rel="prefetch">` where unsupported."""
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return ""
+    rules = {"prefetch": [{"source": "list", "urls": urls, "eagerness": PREFETCH_EAGERNESS}]}
+    return (
+        '<script type="speculationrules">\n'
+        f"    {json.dumps(rules)}\n"
+        "</script>\n"
+        "<script>\n"
+        "    if (!HTMLScriptElement.supports?.('speculationrules')) {\n"
+        f"        for (const href of {json.dumps(urls)}) {{\n"
+        "            const link = document.createElement('link');\n"
+        "            link.rel = 'prefetch';\n"
+        "            link.href = href;\n"
+        "            document.head.append(link);\n"
+        "        }\n"
+        "    }\n"
+        "</script>"
+    )
+
+
+def _post_sort_key(post: Dict):
+    return (str(post.get("date") or ""), str(post.get("datetime") or ""))
+
+
+def load_post_order() -> List[Dict]:
+    """Post ids and dates from posts.json (empty before the first full build)."""
+    if not POSTS_JSON.exists():
+        return []
+    try:
+        return json.loads(POSTS_JSON.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+
+def adjacent_post_ids(slug: str, frontmatter: Dict, posts: List[Dict]) -> List[str]:
+    """Ids of the next (newer) and previous (older) posts around `slug` by date."""
+    current = {"id": slug, "date": frontmatter.get("date", ""), "datetime": frontmatter.get("datetime")}
+    order = sorted([p for p in posts if p["id"] != slug] + [current], key=_post_sort_key)
+    index = order.index(current)
+    neighbors = order[index + 1:index + 2] + order[max(0, index - 1):index]
+    return [post["id"] for post in neighbors]
+
+
+def adjacent_post_urls(slug: str, frontmatter: Dict, posts: List[Dict]) -> List[str]:
+    """URLs of the next (newer) and previous (older) posts around `slug` by date."""
+    return [f"/blog/{post_id}" for post_id in adjacent_post_ids(slug, frontmatter, posts)]
+
+
+def _local_ref(ref: str, from_relpath: str) -> Optional[str]:
+    ref = ref.split("#", 1)[0].split("?", 1)[0]
+    if not ref or "//" in ref or ":" in ref:
+        return None
+    if ref.startswith("/"):
+        return ref.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(from_relpath), ref))
+
+
+def _stylesheet_preloads(relpath: str, seen: set) -> List[Dict]:
+    """`relpath` and the local stylesheets it @imports, depth first."""
+    if relpath in seen or not (ROOT_DIR / relpath).is_file():
+        return []
+    seen.add(relpath)
+    preloads = [{"href": "/" + relpath, "rel": "preload", "as": "style"}]
+    css = (ROOT_DIR / relpath).read_text(encoding="utf-8")
+    for ref in CSS_IMPORT_RE.findall(css):
+        target = _local_ref(ref, relpath)
+        if target:
+            preloads += _stylesheet_preloads(target, seen)
+    return preloads
+
+
+def page_preloads(relpath: str, html: str) -> List[Dict]:
+    """Critical CSS/JS for one page: its stylesheets (with @imports) and scripts."""
+    head_match = HEAD_RE.search(html)
+    if not head_match:
+        return []
+    head = head_match.group(0)
+    preloads: List[Dict] = []
+    seen: set = set()
+
+    for link in STYLESHEET_LINK_RE.findall(head):
+        href = HREF_RE.search(link)
+        target = _local_ref(href.group(1), relpath) if href else None
+        if target:
+            preloads += _stylesheet_preloads(target, seen)
+
+    for src in SCRIPT_SRC_RE.findall(head):
+        target = _local_ref(src, relpath)
+        if not target or target in seen or not (ROOT_DIR / target).is_file():
+            continue
+        seen.add(target)
+        preloads.append({"href": "/" + target, "rel": "preload", "as": "script"})
+        for _, ref in JS_MODULE_REF_RE.findall((ROOT_DIR / target).read_text(encoding="utf-8")):
+            module = _local_ref(ref, target)
+            if module and module not in seen and (ROOT_DIR / module).is_file():
+                seen.add(module)
+                preloads.append({"href": "/" + module, "rel": "modulepreload"})
+    return preloads
+
+
+@timed("preload manifest")
+def update_preload_manifest():
+    """Write PRELOAD_MANIFEST: {page relpath: [{href, rel, as?}]} for every rendered page."""
+    manifest = {}
+    for path in sorted([*ROOT_DIR.glob("*.html"), *BLOG_DIR.glob("*.html")]):
+        relpath = path.relative_to(ROOT_DIR).as_posix()
+        preloads = page_preloads(relpath, path.read_text(encoding="utf-8"))
+        if preloads:
+            manifest[relpath] = preloads
+    write_if_changed(PRELOAD_MANIFEST, json.dumps(manifest, indent=2) + "\n", PRELOAD_MANIFEST.name)
@@ -0,0 +1,313 @@
+"""Post image attributes/placeholders and the --optimize-images export stage."""
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import posixpath
+import re
+from html import unescape as html_unescape
+from typing import Dict, List, Optional, Set, Tuple
+
+from .config import (
+    BLOG_DIR,
+    IMAGE_ASSET_EXTENSIONS,
+    IMAGE_CACHE_FILE,
+    IMAGE_CACHE_VERSION,
+    IMAGE_OPTIMIZER_VERSION,
+    IMAGE_OPTIMIZE_INDEX,
+    IMAGE_PLACEHOLDER_QUALITY,
+    IMAGE_PLACEHOLDER_SIZE,
+    IMAGE_STORE_DIR,
+    ROOT_DIR,
+)
+from .deps import require
+from .files import hash_file
+from .export import ExportLinks, iter_publishable_files, load_deploy_ignore
+from .minify_html import HTML_ATTR_RE
+from .profiling import timed
+
+
+def read_image_size(path: pathlib.Path) -> Optional[Tuple[int, int]]:
+    """Return (width, height) from a PNG/JPEG/GIF/WebP header without decoding pixels."""
+    with path.open("rb") as f:
+        head = f.read(32)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return int.from_bytes(head[6:8], "little"), int.from_bytes(head[8:10], "little")
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8X":
+                return 1 + int.from_bytes(head[24:27], "little"), 1 + int.from_bytes(head[27:30], "little")
+            if chunk == b"VP8L":
+                bits = int.from_bytes(head[21:25], "little")
+                return 1 + (bits & 0x3FFF), 1 + ((bits >> 14) & 0x3FFF)
+            if chunk == b"VP8 ":
+                return (
+                    int.from_bytes(head[26:28], "little") & 0x3FFF,
+                    int.from_bytes(head[28:30], "little") & 0x3FFF,
+                )
+            return None
+        if head[:2] != b"\xff\xd8":
+            return None
+
+        # JPEG: walk marker segments until a start-of-frame marker.
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            while marker[1] == 0xFF:
+                marker = marker[:1] + f.read(1)
+            code = marker[1]
+            if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+                continue
+            length = int.from_bytes(f.read(2), "big")
+            if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                frame = f.read(5)
+                return int.from_bytes(frame[3:5], "big"), int.from_bytes(frame[1:3], "big")
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def _image_placeholder(path: pathlib.Path) -> Optional[str]:
+    """Render a tiny blurred WebP data URI for an image, flattened onto white."""
+    import base64
+    import io
+
+    Image = require("PIL.Image")
+    ImageFilter = require("PIL.ImageFilter")
+
+    try:
+        with Image.open(path) as img:
+            img.draft("RGB", (IMAGE_PLACEHOLDER_SIZE * 4, IMAGE_PLACEHOLDER_SIZE * 4))
+            img = img.convert("RGBA")
+            img.thumbnail((IMAGE_PLACEHOLDER_SIZE, IMAGE_PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    except OSError:
+        return None
+    flat = Image.new("RGB", img.size, "white")
+    flat.paste(img, mask=img.getchannel("A"))
+    flat = flat.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    flat.save(buffer, "WEBP", quality=IMAGE_PLACEHOLDER_QUALITY, method=6)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def load_image_cache() -> Dict[str, Dict]:
+    if IMAGE_CACHE_FILE.exists():
+        cached = json.loads(IMAGE_CACHE_FILE.read_text(encoding="utf-8"))
+        if cached.get("version") == IMAGE_CACHE_VERSION:
+            return cached.get("images", {})
+    return {}
+
+
+def save_image_cache(images: Dict[str, Dict]):
+    IMAGE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    IMAGE_CACHE_FILE.write_text(
+        json.dumps({"version": IMAGE_CACHE_VERSION, "images": images}, sort_keys=True),
+        encoding="utf-8",
+    )
+
+
+def _resolve_image_src(src: str) -> Optional[pathlib.Path]:
+    src = html_unescape(src).split("#", 1)[0].split("?", 1)[0]
+    if not src or re.match(r"^[a-z][a-z0-9+.-]*:|^//", src, flags=re.IGNORECASE):
+        return None
+    if src.startswith("/"):
+        path = ROOT_DIR / src.lstrip("/")
+    else:
+        path = BLOG_DIR / src  # Posts are served from /blog/<slug>
+    path = path.resolve()
+    if ROOT_DIR.resolve() not in path.parents or not path.is_file():
+        return None
+    return path
+
+
+def add_image_attributes(html: str, image_cache: Dict[str, Dict]) -> str:
+    """Fill in missing width/height/loading/decoding on post images and add a blurred placeholder.
+
+    Explicit attributes written in the markdown always win. ``image_cache`` maps
+    an image's sha256 to its size and placeholder and is updated in place.
+    """
+
+    def replace(match: re.Match) -> str:
+        tag = match.group(0)
+        attrs = {
+            m.group(1).lower(): (m.group(2) or "").strip("\"'")
+            for m in HTML_ATTR_RE.finditer(match.group(1))
+        }
+        additions = []
+        path = _resolve_image_src(attrs.get("src", ""))
+        info = None
+        if path is not None:
+            sha256 = hash_file(path)
+            info = image_cache.get(sha256)
+            if info is None:
+                size = read_image_size(path)
+                info = {
+                    "width": size[0] if size else None,
+                    "height": size[1] if size else None,
+                    "placeholder": _image_placeholder(path),
+                }
+                image_cache[sha256] = info
+
+        if info and info["width"] and "width" not in attrs and "height" not in attrs:
+            additions.append(f'width="{info["width"]}" height="{info["height"]}"')
+        if "loading" not in attrs:
+            additions.append('loading="lazy"')
+        if "decoding" not in attrs:
+            additions.append('decoding="async"')
+        if info and info["placeholder"] and "data-placeholder" not in attrs:
+            placeholder_style = f"background-image: url({info['placeholder']}); background-size: cover;"
+            if "style" in attrs:
+                style = attrs["style"].rstrip().rstrip(";")
+                tag = re.sub(
+                    r"""(\sstyle\s*=\s*)("[^"]*"|'[^']*'|[^\s"'=<>`]+)""",
+                    lambda m: f'{m.group(1)}"{style}; {placeholder_style}"',
+                    tag,
+                    count=1,
+                    flags=re.IGNORECASE,
+                )
+            else:
+                additions.append(f'style="{placeholder_style}"')
+            additions.append("data-placeholder")
+        if not additions:
+            return tag
+
+        end = re.search(r"\s*/?>$", tag)
+        return f"{tag[:end.start()]} {' '.join(additions)}{tag[end.start():]}"
+
+    return re.sub(r"<img\b((?:[^>\"']|\"[^\"]*\"|'[^']*')*)/?>", replace, html, flags=re.IGNORECASE)
+
+# ------------------------------------------------------------------
+# Image optimization (lossless PNG recompression + content-addressed store)
+# ------------------------------------------------------------------
+# Colour chunks Pillow reads but never writes back; dropping them can shift colours.
+PNG_COLOR_CHUNKS = {b"gAMA", b"cHRM", b"sRGB", b"cICP"}
+
+
+def _png_chunk_types(data: bytes) -> Set[bytes]:
+    types = set()
+    pos = 8  # Past the signature
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], "big")
+        types.add(data[pos + 4:pos + 8])
+        pos += 12 + length  # Length, type, data, CRC
+    return types
+
+
+def _optimize_png(data: bytes) -> bytes:
+    """Recompress a PNG at maximum zlib effort without changing a single pixel.
+
+    Ancillary chunks (text, timestamps, EXIF) are dropped; an ICC profile is
+    kept because it affects rendering. Files with gAMA, cHRM, sRGB or cICP
+    chunks are returned as is, since Pillow can't write those back. A palette
+    is tried only when converting back reproduces the original pixels exactly.
+    Returns the smallest encoding, which may be the input itself.
+    """
+    import io
+
+    if _png_chunk_types(data) & PNG_COLOR_CHUNKS:
+        return data
+
+    Image = require("PIL.Image")
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        icc_profile = img.info.get("icc_profile")
+        candidates = [img]
+        if img.mode in ("RGB", "RGBA") and img.getcolors(256) is not None:
+            paletted = img.quantize(colors=256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+            if paletted.convert(img.mode).tobytes() == img.tobytes():
+                candidates.insert(0, paletted)
+
+        best = data
+        for candidate in candidates:
+            buffer = io.BytesIO()
+            save_args = {"optimize": True, "icc_profile": icc_profile}
+            if "transparency" in candidate.info:
+                save_args["transparency"] = candidate.info["transparency"]
+            candidate.save(buffer, "PNG", **save_args)
+            if buffer.tell() < len(best):
+                best = buffer.getvalue()
+    return best
+
+
+def _image_store_path(sha256: str, ext: str) -> pathlib.Path:
+    return IMAGE_STORE_DIR / sha256[:2] / f"{sha256}{ext}"
+
+
+def _store_image(data: bytes, ext: str) -> pathlib.Path:
+    path = _image_store_path(hashlib.sha256(data).hexdigest(), ext)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return path
+
+
+@timed("export: optimize images")
+def optimize_image_assets(links: ExportLinks, skip_dirs: Tuple[pathlib.Path, ...] = ()):
+    """Link every publishable image to an optimized, deduplicated store object.
+
+    Each distinct source hash is processed once, PNGs in parallel worker
+    processes; results are remembered in IMAGE_OPTIMIZE_INDEX so later exports
+    only touch new or edited images.
+    """
+    rules = load_deploy_ignore()
+    sources: Dict[str, List[str]] = {}  # source sha256 -> relpaths with that content
+    for relpath in iter_publishable_files(rules, skip_dirs):
+        if relpath.lower().endswith(IMAGE_ASSET_EXTENSIONS):
+            sources.setdefault(hash_file(ROOT_DIR / relpath), []).append(relpath)
+
+    index: Dict[str, str] = {}  # source sha256 -> stored sha256
+    if IMAGE_OPTIMIZE_INDEX.exists():
+        cached = json.loads(IMAGE_OPTIMIZE_INDEX.read_text(encoding="utf-8"))
+        if cached.get("version") == IMAGE_OPTIMIZER_VERSION:
+            index = cached.get("images", {})
+
+    def extension(sha256: str) -> str:
+        return posixpath.splitext(sources[sha256][0])[1].lower()
+
+    pending = [
+        sha256 for sha256 in sources
+        if sha256 not in index or not _image_store_path(index[sha256], extension(sha256)).exists()
+    ]
+    pngs = [sha256 for sha256 in pending if extension(sha256) == ".png"]
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        futures = {
+            executor.submit(_optimize_png, (ROOT_DIR / sources[sha256][0]).read_bytes()): sha256
+            for sha256 in pngs
+        }
+        for future in concurrent.futures.as_completed(futures):
+            sha256 = futures[future]
+            try:
+                data = future.result()
+            except (OSError, ValueError) as e:
+                print(f"  ⚠ Warning: Could not optimize {sources[sha256][0]}: {e}")
+                data = (ROOT_DIR / sources[sha256][0]).read_bytes()
+            index[sha256] = _store_image(data, ".png").stem
+    for sha256 in pending:
+        if sha256 not in pngs:
+            data = (ROOT_DIR / sources[sha256][0]).read_bytes()
+            index[sha256] = _store_image(data, extension(sha256)).stem
+
+    IMAGE_OPTIMIZE_INDEX.parent.mkdir(parents=True, exist_ok=True)
+    IMAGE_OPTIMIZE_INDEX.write_text(
+        json.dumps({"version": IMAGE_OPTIMIZER_VERSION, "images": index}, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+
+    source_bytes = stored_bytes = duplicates = 0
+    for sha256, relpaths in sources.items():
+        store_path = _image_store_path(index[sha256], extension(sha256))
+        source_bytes += (ROOT_DIR / relpaths[0]).stat().st_size * len(relpaths)
+        stored_bytes += store_path.stat().st_size
+        duplicates += len(relpaths) - 1
+        for relpath in relpaths:
+            links[relpath] = store_path
+
+    print(
+        f"  ✓ Optimized {len(sources)} images ({len(pngs)} recompressed, "
+        f"{len(sources) - len(pending)} cached, {duplicates} duplicates linked), "
+        f"saved {source_bytes - stored_bytes:,} of {source_bytes:,} bytes"
+    )
@@ -0,0 +1,162 @@
+"""HTML minification (export only)."""
+
+import hashlib
+import pathlib
+import re
+from typing import Tuple
+
+from .config import (
+    BLOG_DIR,
+    BLOG_INDEX_HTML,
+    HTML_MINIFIER_VERSION,
+    HTML_MINIFY_CACHE_DIR,
+    INDEX_HTML,
+    NOT_FOUND_HTML,
+)
+from .export import (
+    ExportOverlay,
+    iter_publishable_files,
+    load_deploy_ignore,
+    read_export_file,
+)
+from .critical_css import HTML_VOID_TAGS
+from .profiling import timed
+
+
+HTML_TOKEN_RE = re.compile(
+    r"""(?P<comment><!--.*?-->)"""
+    r"""|(?P<decl><![^>]*>)"""
+    r"""|(?P<tag></?(?P<name>[a-zA-Z][\w:-]*)(?P<attrs>(?:\s+[^\s"'>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*)\s*(?P<close>/?)>)"""
+    r"""|(?P<text>[^<]+|<)""",
+    flags=re.DOTALL,
+)
+HTML_ATTR_RE = re.compile(r"""\s+([^\s"'>/=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'=<>`]+))?""")
+HTML_UNQUOTED_VALUE_RE = re.compile(r"""^[^\s"'=<>`]+$""")
+# Elements whose contents are copied byte-for-byte.
+HTML_PRESERVE_TAGS = {"pre", "code", "textarea", "script", "style"}
+HTML_PRESERVE_END_RE = {name: re.compile(rf"</{name}\b", flags=re.IGNORECASE) for name in HTML_PRESERVE_TAGS}
+# Whitespace next to these never renders, so it can be dropped entirely.
+HTML_BLOCK_TAGS = {
+    "html", "head", "body", "title", "meta", "link", "script", "style", "noscript",
+    "main", "header", "footer", "nav", "section", "article", "aside", "div", "p",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "dl", "dt", "dd",
+    "table", "thead", "tbody", "tfoot", "tr", "td", "th", "caption", "colgroup", "col",
+    "blockquote", "figure", "figcaption", "hr", "br", "pre", "form", "details", "summary",
+}
+
+
+def _minify_html_tag(match: re.Match) -> str:
+    name = match.group("name")
+    if match.group(0).startswith("</"):
+        return f"</{name}>"
+
+    self_closing = match.group("close") == "/" and name.lower() not in HTML_VOID_TAGS
+    parts = [f"<{name}"]
+    for attr in HTML_ATTR_RE.finditer(match.group("attrs")):
+        attr_name, value = attr.group(1), attr.group(2)
+        if value is None:
+            parts.append(f" {attr_name}")
+            continue
+        inner = value[1:-1] if value[0] in "'\"" else value
+        # Foreign (SVG) self-closing tags keep quotes so `/>` can't join the value.
+        if not self_closing and HTML_UNQUOTED_VALUE_RE.match(inner):
+            parts.append(f" {attr_name}={inner}")
+        else:
+            parts.append(f" {attr_name}={value}")
+    parts.append("/>" if self_closing else ">")
+    return "".join(parts)
+
+
+def _iter_minified_html(html: str):
+    """Yield minified HTML pieces in a single forward pass.
+
+    Comments are dropped, whitespace runs collapse to one space (or vanish
+    next to block-level tags), attribute quotes are removed where optional,
+    and <pre>/<code>/<textarea>/<script>/<style> elements pass through untouched.
+    """
+    pos, n = 0, len(html)
+    pending_space = False
+    after_block = True
+
+    while pos < n:
+        match = HTML_TOKEN_RE.match(html, pos)
+        pos = match.end()
+
+        if match.group("comment") is not None:
+            continue
+
+        if match.group("text") is not None:
+            text = match.group("text")
+            collapsed = re.sub(r"\s+", " ", text)
+            if collapsed.startswith(" "):
+                collapsed = collapsed[1:]
+                if not after_block:
+                    pending_space = True
+            if not collapsed:
+                continue
+            if pending_space:
+                yield " "
+            pending_space = collapsed.endswith(" ")
+            yield collapsed.rstrip(" ")
+            after_block = False
+            continue
+
+        name = (match.group("name") or "").lower()
+        is_block = not name or name in HTML_BLOCK_TAGS
+        if pending_space and not is_block:
+            yield " "
+        pending_space = False
+        after_block = is_block
+
+        if match.group("decl") is not None:
+            yield match.group("decl")
+            continue
+
+        is_end = match.group(0).startswith("</")
+        if name in HTML_PRESERVE_TAGS and not is_end and match.group("close") != "/":
+            end_match = HTML_PRESERVE_END_RE[name].search(html, pos)
+            end = n if not end_match else html.index(">", end_match.start()) + 1
+            yield match.group(0) + html[pos:end]
+            pos = end
+            continue
+
+        yield _minify_html_tag(match)
+
+
+def _is_rendered_page(relpath: str) -> bool:
+    if relpath in (INDEX_HTML.name, BLOG_INDEX_HTML.name, NOT_FOUND_HTML.name):
+        return True
+    parts = relpath.split("/")
+    return (
+        len(parts) == 2
+        and parts[0] == BLOG_DIR.name
+        and parts[1].endswith(".html")
+        and (BLOG_DIR / f"{parts[1][:-5]}.md").exists()
+    )
+
+
+@timed("export: minify html")
+def minify_html_pages(overlay: ExportOverlay, skip_dirs: Tuple[pathlib.Path, ...] = ()):
+    """Minify rendered pages, reusing cached output for pages whose bytes are unchanged."""
+    minified_pages = reused = saved_bytes = 0
+    for relpath in iter_publishable_files(load_deploy_ignore(), skip_dirs):
+        if not _is_rendered_page(relpath):
+            continue
+        data = read_export_file(relpath, overlay)
+        cache_key = hashlib.sha256(f"{HTML_MINIFIER_VERSION}:".encode("utf-8") + data).hexdigest()
+        cache_path = HTML_MINIFY_CACHE_DIR / f"{cache_key}.html"
+        if cache_path.exists():
+            minified = cache_path.read_bytes()
+            reused += 1
+        else:
+            minified = "".join(_iter_minified_html(data.decode("utf-8"))).encode("utf-8")
+            HTML_MINIFY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(minified)
+        overlay[relpath] = minified
+        minified_pages += 1
+        saved_bytes += len(data) - len(minified)
+
+    print(
+        f"  ✓ Minified {minified_pages} pages ({reused} cached), "
+        f"saved {saved_bytes:,} bytes"
+    )
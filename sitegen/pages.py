@@ -0,0 +1,312 @@
+"""Generated pages (home, /blog/, LLM tier list, Codex stats, 404) and text endpoints (/index.md, /blog.md, /llms*.txt)."""
+
+import pathlib
+from typing import Dict, List, Tuple
+
+from .config import (
+    BLOG_DIR,
+    BLOG_INDEX_HTML,
+    BLOG_INDEX_REDIRECT_HTML,
+    BLOG_INDEX_TEMPLATE_FILE,
+    BLOG_MD,
+    CODEX_STATS_HTML,
+    CODEX_STATS_REDIRECT_HTML,
+    CODEX_STATS_TEMPLATE_FILE,
+    HOME_TEMPLATE_FILE,
+    INDEX_HTML,
+    INDEX_MD,
+    LLMS_FULL_TXT,
+    LLMS_TXT,
+    NOT_FOUND_HTML,
+    NOT_FOUND_TEMPLATE_FILE,
+    PREFETCH_BLOG_TOP,
+    SITE_URL,
+    TIERLIST_HTML,
+    TIERLIST_TEMPLATE_FILE,
+)
+from .files import write_if_changed
+from .content import format_date_display, format_date_markdown, parse_frontmatter
+from .templates import apply_template, load_common_partials
+from .codex_stats import render_activity_graph
+from .hints import render_prefetch_hints, update_preload_manifest
+from .profiling import timed
+from .tierlist import load_tierlist_stage
+from .viewcounts import format_views
+
+
+# Keep the homepage list curated (order matters).
+HOME_FEATURED_SLUGS = [
+    "things-got-too-easy",
+    "ton-vanity",
+    "ai-in-2026",
+    "billions-of-tokens-later",
+    "fuzzing-with-llms",
+]
+
+
+def _post_type_emoji(post_type: str) -> Tuple[str, str]:
+    """Return (emoji, label) for a post type."""
+    post_type = (post_type or "").strip().lower()
+    if post_type == "essay":
+        return "✍️", "Essay"
+    if post_type == "project":
+        return "🛠️", "Project"
+    return "🔬", "Research"
+
+
+def _render_post_preview_html(post: Dict) -> str:
+    emoji, type_label = _post_type_emoji(post.get("type", "research"))
+    date_html = format_date_display(post["date"])
+    slug = post["id"]
+
+    views = post.get("views", 0)
+    views_html = format_views(views)
+
+    return f"""<article class="blog-post-preview">
+    <h3><span class="post-type-emoji" title="{type_label}">{emoji}</span><a href="/blog/{slug}">{post['title']}</a></h3>
+    <div class="post-meta">
+        <span class="post-date">{date_html}</span>
+        <span class="post-meta-sep">·</span>
+        <span class="post-views" data-post-id="{slug}" data-views="{views}">{views_html}</span>
+    </div>
+</article>"""
+
+
+def render_redirect_html(target_path: str, canonical_url: str) -> str:
+    return (
+        "<!DOCTYPE html>\n"
+        "<meta charset=\"utf-8\">\n"
+        "<title>Redirecting…</title>\n"
+        f"<link rel=\"canonical\" href=\"{canonical_url}\">\n"
+        f"<meta http-equiv=\"refresh\" content=\"0; url={target_path}\">\n"
+        f"<script>location.replace('{target_path}')</script>\n"
+        f"<noscript><a href=\"{target_path}\">Click here</a></noscript>\n"
+    )
+
+
+# ------------------------------------------------------------------
+# Text endpoints (/index.md, /blog.md, /llms*.txt)
+# ------------------------------------------------------------------
+def _blog_post_md_url(slug: str) -> str:
+    return f"/blog/{slug}.md"
+
+
+def looks_like_blog_post(markdown_path: pathlib.Path) -> bool:
+    try:
+        with markdown_path.open("r", encoding="utf-8") as f:
+            return f.readline().strip() == "---"
+    except OSError:
+        return False
+
+
+def _render_index_markdown(posts_by_slug: Dict[str, Dict]) -> str:
+    lines = [
+        "# Daniil Sedov",
+        "",
+        "Russia, GMT+3 | [Telegram](https://t.me/gusarich) | [Github](https://github.com/gusarich) | "
+        "[Email](mailto:gusarich@icloud.com) | [X](https://x.com/Gusarich)",
+        "",
+        "I work as an AI Research Engineer. I previously worked as a compiler engineer, and before that built and audited smart contracts.",
+        "",
+        "Posts with results of my research, as well as essays on other topics end up here.",
+        "",
+        "## Pages",
+        "",
+        "- [LLM Tier List](https://gusarich.com/llm-tierlist)",
+        "- [Codex Stats](https://gusarich.com/codex-stats)",
+        "",
+        "## Posts",
+        "",
+    ]
+
+    for slug in HOME_FEATURED_SLUGS:
+        post = posts_by_slug.get(slug)
+        if not post:
+            continue
+        lines.append(
+            f"- {format_date_markdown(post['date'])} - [{post['title']}]({_blog_post_md_url(slug)})"
+        )
+
+    lines += [
+        "",
+        "[More posts ->](/blog.md)",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _render_blog_markdown(posts_newest: List[Dict]) -> str:
+    lines = [
+        "# All Posts",
+        "",
+    ]
+    for post in posts_newest:
+        slug = post["id"]
+        lines.append(
+            f"- {format_date_markdown(post['date'])} - [{post['title']}]({_blog_post_md_url(slug)})"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _render_llms_txt(index_md_content: str, posts_newest: List[Dict]) -> str:
+    lines = [
+        index_md_content.rstrip(),
+        "",
+        "## Blog posts",
+        "",
+    ]
+    for post in posts_newest:
+        slug = post["id"]
+        title = post.get("title", slug)
+        lines.append(f"- [{title}]({_blog_post_md_url(slug)})")
+
+    lines += [
+        "",
+        "See also: /llms-full.txt",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _render_llms_full_txt(
+    index_md_content: str,
+    blog_md_content: str,
+    posts_newest: List[Dict],
+) -> str:
+    sep = "=" * 80
+
+    lines = [
+        "gusarich.com - full text dump",
+        "",
+        sep,
+        "PAGE: /index.md",
+        sep,
+        index_md_content.rstrip(),
+        "",
+        sep,
+        "PAGE: /blog.md",
+        sep,
+        blog_md_content.rstrip(),
+        "",
+    ]
+
+    for post in posts_newest:
+        slug = post["id"]
+        md_path = BLOG_DIR / f"{slug}.md"
+        if not md_path.exists():
+            continue
+
+        raw_content = md_path.read_text(encoding="utf-8")
+        frontmatter, markdown_content = parse_frontmatter(raw_content)
+
+        title = frontmatter.get("title") or post.get("title") or slug
+        date = frontmatter.get("date") or post.get("date") or ""
+        description = frontmatter.get("description") or post.get("summary") or ""
+        post_type = (frontmatter.get("type") or post.get("type") or "").strip()
+
+        lines.append(sep)
+        lines.append(f"PAGE: {_blog_post_md_url(slug)}")
+        lines.append(f"TITLE: {title}")
+        if date:
+            lines.append(f"DATE: {date}")
+        if post_type:
+            lines.append(f"TYPE: {post_type}")
+        if description:
+            lines.append(f"DESCRIPTION: {description}")
+        lines.append(sep)
+        lines.append(markdown_content.rstrip())
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def update_site_pages(posts_data: List[Dict]):
+    """Render and write the site's non-post pages and text endpoints."""
+    posts_newest = sorted(posts_data, key=lambda x: x["date"], reverse=True)
+    posts_by_slug = {p["id"]: p for p in posts_newest}
+    _update_html_pages(posts_newest, posts_by_slug)
+    _update_text_endpoints(posts_newest, posts_by_slug)
+    # Post pages are written before this runs, so the manifest covers them too.
+    update_preload_manifest()
+
+
+@timed("site pages")
+def _update_html_pages(posts_newest: List[Dict], posts_by_slug: Dict[str, Dict]):
+    common_replacements = load_common_partials()
+    home_posts = [posts_by_slug[slug] for slug in HOME_FEATURED_SLUGS if slug in posts_by_slug]
+    home_posts_html = "\n".join(_render_post_preview_html(p) for p in home_posts)
+    all_posts_html = "\n".join(_render_post_preview_html(p) for p in posts_newest)
+
+    if HOME_TEMPLATE_FILE.exists():
+        home_template = HOME_TEMPLATE_FILE.read_text(encoding="utf-8")
+        rendered_home = apply_template(
+            home_template,
+            {
+                **common_replacements,
+                "home_posts": home_posts_html,
+                "prefetch_hints": render_prefetch_hints([f"/blog/{p['id']}" for p in home_posts]),
+            },
+        )
+        write_if_changed(INDEX_HTML, rendered_home, "index.html")
+
+    if BLOG_INDEX_TEMPLATE_FILE.exists():
+        blog_index_template = BLOG_INDEX_TEMPLATE_FILE.read_text(encoding="utf-8")
+        rendered_blog_index = apply_template(
+            blog_index_template,
+            {
+                **common_replacements,
+                "all_posts": all_posts_html,
+                "prefetch_hints": render_prefetch_hints(
+                    [f"/blog/{p['id']}" for p in posts_newest[:PREFETCH_BLOG_TOP]]
+                ),
+            },
+        )
+        write_if_changed(BLOG_INDEX_HTML, rendered_blog_index, "blog.html")
+        blog_redirect_html = render_redirect_html("/blog", f"{SITE_URL}/blog")
+        write_if_changed(BLOG_INDEX_REDIRECT_HTML, blog_redirect_html, "blog/index.html")
+
+    if TIERLIST_TEMPLATE_FILE.exists():
+        tierlist_template = TIERLIST_TEMPLATE_FILE.read_text(encoding="utf-8")
+        rendered_tierlist = apply_template(
+            tierlist_template,
+            {**common_replacements, "tierlist_board": load_tierlist_stage()},
+        )
+        write_if_changed(TIERLIST_HTML, rendered_tierlist, "llm-tierlist.html")
+
+    if CODEX_STATS_TEMPLATE_FILE.exists():
+        codex_stats_template = CODEX_STATS_TEMPLATE_FILE.read_text(encoding="utf-8")
+        rendered_codex_stats = apply_template(
+            codex_stats_template,
+            {**common_replacements, "codex_activity": render_activity_graph()},
+        )
+        write_if_changed(CODEX_STATS_HTML, rendered_codex_stats, "codex-stats.html")
+
+    codex_stats_redirect_html = render_redirect_html(
+        "/codex-stats.html",
+        f"{SITE_URL}/codex-stats",
+    )
+    CODEX_STATS_REDIRECT_HTML.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(CODEX_STATS_REDIRECT_HTML, codex_stats_redirect_html, "codex-stats/index.html")
+
+    if NOT_FOUND_TEMPLATE_FILE.exists():
+        not_found_template = NOT_FOUND_TEMPLATE_FILE.read_text(encoding="utf-8")
+        rendered_not_found = apply_template(not_found_template, common_replacements)
+        write_if_changed(NOT_FOUND_HTML, rendered_not_found, "404.html")
+
+
+@timed("llms")
+def _update_text_endpoints(posts_newest: List[Dict], posts_by_slug: Dict[str, Dict]):
+    index_md_content = _render_index_markdown(posts_by_slug)
+    blog_md_content = _render_blog_markdown(posts_newest)
+
+    write_if_changed(INDEX_MD, index_md_content, "index.md")
+    write_if_changed(BLOG_MD, blog_md_content, "blog.md")
+    write_if_changed(
+        LLMS_TXT, _render_llms_txt(index_md_content, posts_newest), "llms.txt"
+    )
+    write_if_changed(
+        LLMS_FULL_TXT,
+        _render_llms_full_txt(index_md_content, blog_md_content, posts_newest),
+        "llms-full.txt",
+    )
@@ -0,0 +1,256 @@
+"""Per-post rendering and the full-site rebuild."""
+
+import sys
+from typing import Dict, List, Optional
+
+from .config import BLOG_DIR, BLOG_POST_TEMPLATE_FILE, ROOT_DIR, SITE_URL, WORDS_PER_MINUTE
+from .files import write_if_changed
+from .content import content_word_count, parse_frontmatter, process_markdown_content
+from .previews import generate_preview
+from .templates import fill_template, load_common_partials
+from .feeds import generate_feeds, update_posts_json
+from .hints import adjacent_post_ids, adjacent_post_urls, load_post_order
+from .sitemap import generate_sitemap_xml
+from .pages import looks_like_blog_post, render_redirect_html, update_site_pages
+from . import profiling
+from .profiling import stage
+from .images import add_image_attributes, load_image_cache, save_image_cache
+from .viewcounts import apply_view_counts, load_view_counts
+
+
+def process_blog_post(slug: str, force: bool = False):
+    """Process a single blog post from markdown to HTML.
+
+    The posts next to it by date, both in posts.json and after this change,
+    are re-rendered too, so their next/previous prefetch hints stay current.
+    """
+    template = BLOG_POST_TEMPLATE_FILE.read_text(encoding="utf-8")
+    common_replacements = load_common_partials()
+    previous_order = load_post_order()
+    post_order = _read_post_order(_post_slugs())
+
+    neighbors: List[str] = []
+    for order in (previous_order, post_order):
+        current = next((p for p in order if p["id"] == slug), None)
+        if current:
+            neighbors += adjacent_post_ids(slug, current, order)
+    published = {p["id"] for p in post_order}
+    neighbors = [n for n in dict.fromkeys(neighbors) if n in published]
+
+    image_cache = load_image_cache()
+    cached_images = len(image_cache)
+    with profiling.post(slug):
+        post_data = process_blog_post_with_template(
+            slug,
+            template,
+            common_replacements=common_replacements,
+            force=force,
+            post_order=post_order,
+            image_cache=image_cache,
+        )
+    for neighbor in neighbors:
+        with profiling.post(neighbor):
+            process_blog_post_with_template(
+                neighbor,
+                template,
+                common_replacements=common_replacements,
+                post_order=post_order,
+                image_cache=image_cache,
+            )
+    if len(image_cache) != cached_images:
+        save_image_cache(image_cache)
+    return post_data
+
+
+def process_blog_post_with_template(
+    slug: str,
+    template: str,
+    common_replacements: Optional[Dict[str, str]] = None,
+    force: bool = False,
+    post_order: Optional[List[Dict]] = None,
+    image_cache: Optional[Dict[str, Dict]] = None,
+):
+    """Process a single blog post from markdown to HTML, using a preloaded template.
+
+    `post_order` lists every post's id/date/datetime for the next/previous
+    prefetch hints; it defaults to the current posts.json. A caller passing
+    `image_cache` owns it and saves it once; otherwise it is loaded and saved here.
+    """
+    output_dir = BLOG_DIR / slug
+    markdown_file = BLOG_DIR / f"{slug}.md"
+    legacy_markdown_file = output_dir / f"{slug}.md"
+    output_html = BLOG_DIR / f"{slug}.html"
+    output_preview = output_dir / "preview.jpg"
+    output_redirect_html = output_dir / "index.html"
+    
+    print(f"\nProcessing: {slug}")
+    
+    # Check if markdown file exists
+    if not markdown_file.exists():
+        print(f"  ⚠ Warning: Markdown file not found: {markdown_file}")
+        return None
+    if legacy_markdown_file.exists():
+        print(f"Error: Duplicate markdown file found: {legacy_markdown_file}")
+        print(f"Keep only: {markdown_file}")
+        sys.exit(1)
+    
+    with stage("frontmatter"):
+        # Read markdown file
+        with open(markdown_file, 'r', encoding='utf-8') as f:
+            raw_content = f.read()
+
+        # Parse frontmatter and content
+        frontmatter, markdown_content = parse_frontmatter(raw_content)
+    
+    if not frontmatter:
+        print(f"  ⚠ Warning: No frontmatter found in {markdown_file}")
+        return None
+    
+    # Output directory should already exist since markdown is there
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Generate HTML
+    html_content = process_markdown_content(markdown_content)
+    with stage("post images"):
+        owns_cache = image_cache is None
+        if owns_cache:
+            image_cache = load_image_cache()
+        cached_images = len(image_cache)
+        html_content = add_image_attributes(html_content, image_cache)
+        if owns_cache and len(image_cache) != cached_images:
+            save_image_cache(image_cache)
+        word_count = content_word_count(html_content)
+
+    with stage("template"):
+        final_html = fill_template(
+            template,
+            frontmatter,
+            html_content,
+            slug,
+            common_replacements=common_replacements,
+            prefetch_urls=adjacent_post_urls(
+                slug, frontmatter, load_post_order() if post_order is None else post_order
+            ),
+        )
+    
+    with open(output_html, 'w', encoding='utf-8') as f:
+        f.write(final_html)
+    print(f"  ✓ Generated HTML: {output_html}")
+
+    redirect_html = render_redirect_html(
+        f"/blog/{slug}",
+        f"{SITE_URL}/blog/{slug}",
+    )
+    write_if_changed(output_redirect_html, redirect_html, f"blog/{slug}/index.html")
+    
+    # Determine preview background: post-specific or fallback.png at repo root
+    background_src = frontmatter.get('background')
+    if not background_src:
+        background_src = str(ROOT_DIR / 'fallback.png')
+
+    # Generate preview if needed or forced
+    if force or not output_preview.exists():
+        with stage("preview"):
+            generate_preview(
+                frontmatter.get('title', 'Untitled'),
+                frontmatter.get('date', '2025-01-01'),
+                output_preview,
+                background_src
+            )
+    
+    # Return metadata for posts.json and the feeds
+    # Determine post type (default to research)
+    post_type = frontmatter.get('type', 'research').strip().lower()
+    if post_type not in ('research', 'essay', 'project'):
+        post_type = 'research'
+
+    metadata = {
+        "id": slug,
+        "title": frontmatter.get('title', 'Untitled'),
+        "date": frontmatter.get('date', '2025-01-01'),
+        "summary": frontmatter.get('description', ''),
+        "type": post_type,
+        "word_count": word_count,
+        "reading_time": max(1, round(word_count / WORDS_PER_MINUTE)),
+    }
+    
+    # Include datetime if available
+    if 'datetime' in frontmatter:
+        metadata['datetime'] = frontmatter['datetime']
+    
+    return metadata
+
+def _post_slugs() -> List[str]:
+    """Slugs of every blog/<slug>.md post, sorted."""
+    return sorted(
+        markdown_file.stem
+        for markdown_file in BLOG_DIR.glob("*.md")
+        if looks_like_blog_post(markdown_file)
+    )
+
+
+def _read_post_order(slugs: List[str]) -> List[Dict]:
+    """Dates from each post's frontmatter, so neighbors are right even for new posts."""
+    order = []
+    for slug in slugs:
+        frontmatter, _ = parse_frontmatter((BLOG_DIR / f"{slug}.md").read_text(encoding="utf-8"))
+        if frontmatter:
+            order.append({"id": slug, "date": frontmatter.get("date", ""), "datetime": frontmatter.get("datetime")})
+    return order
+
+
+def process_all_posts(views_source: Optional[str] = None):
+    """Process all markdown files found in blog directory.
+
+    `views_source` (API base URL or JSON file) refreshes the view-count
+    snapshot; without it, counts already in posts.json are kept.
+    """
+    blog_posts = _post_slugs()
+    
+    if not blog_posts:
+        print(f"No blog posts found in {BLOG_DIR}")
+        legacy_posts = []
+        for item in BLOG_DIR.iterdir():
+            if not item.is_dir():
+                continue
+            legacy_md = item / f"{item.name}.md"
+            if legacy_md.exists():
+                legacy_posts.append(item.name)
+
+        if legacy_posts:
+            print("Found legacy blog markdown files (move them to blog/<slug>.md):")
+            for slug in sorted(legacy_posts):
+                print(f"  - blog/{slug}/{slug}.md -> blog/{slug}.md")
+        else:
+            print("Blog posts should be markdown files like blog/my-post.md")
+        return
+    
+    posts_data = []
+    template = BLOG_POST_TEMPLATE_FILE.read_text(encoding="utf-8")
+    common_replacements = load_common_partials()
+    post_order = _read_post_order(blog_posts)
+    image_cache = load_image_cache()
+    cached_images = len(image_cache)
+    for slug in blog_posts:
+        with profiling.post(slug):
+            post_data = process_blog_post_with_template(
+                slug,
+                template,
+                common_replacements=common_replacements,
+                post_order=post_order,
+                image_cache=image_cache,
+            )
+        if post_data:
+            posts_data.append(post_data)
+    if len(image_cache) != cached_images:
+        save_image_cache(image_cache)
+
+    apply_view_counts(posts_data, load_view_counts(views_source, [p["id"] for p in posts_data]))
+    
+    # Update posts.json, feeds, and sitemap.xml
+    update_posts_json(posts_data)
+    generate_feeds(posts_data)
+    update_site_pages(posts_data)
+    generate_sitemap_xml(posts_data)
+    
+    print(f"\n✅ Processed {len(posts_data)} blog posts")
@@ -0,0 +1,103 @@
+"""Social preview images (Pillow is imported on first use)."""
+
+import pathlib
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from .config import (
+    IBM_PLEX_BOLD,
+    IBM_PLEX_REGULAR,
+    PREVIEW_BG_COLOR,
+    PREVIEW_BG_DIM_ALPHA,
+    PREVIEW_FOOT_SIZE,
+    PREVIEW_HEIGHT,
+    PREVIEW_PADDING_X,
+    PREVIEW_STRIPE_BLUR,
+    PREVIEW_STRIPE_COLOR,
+    PREVIEW_STRIPE_SPACING,
+    PREVIEW_TITLE_SIZE,
+    PREVIEW_TOP_Y,
+    PREVIEW_WIDTH,
+)
+from .deps import require
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw, ImageFont
+
+
+def must_font(path: pathlib.Path, size: int) -> "ImageFont.FreeTypeFont":
+    ImageFont = require("PIL.ImageFont")
+    if not path.exists():
+        print(f"Warning: Font not found: {path}, using default")
+        return ImageFont.load_default()
+    return ImageFont.truetype(str(path), size)
+
+def wrap(text: str, font: "ImageFont.FreeTypeFont", max_width: int, draw: "ImageDraw.ImageDraw"):
+    words, line = text.split(), ""
+    for w in words:
+        test = f"{line} {w}".strip()
+        if draw.textlength(test, font=font) <= max_width:
+            line = test
+        else:
+            yield line
+            line = w
+    if line:
+        yield line
+
+def build_background(custom_path: Optional[pathlib.Path]) -> "Image.Image":
+    """Return a 1200×630 RGB image: custom if provided else procedural."""
+    Image = require("PIL.Image")
+    ImageDraw = require("PIL.ImageDraw")
+    ImageFilter = require("PIL.ImageFilter")
+    ImageOps = require("PIL.ImageOps")
+    if custom_path and custom_path.exists():
+        bg = Image.open(custom_path).convert("RGB")
+        bg = ImageOps.fit(bg, (PREVIEW_WIDTH, PREVIEW_HEIGHT), method=Image.Resampling.LANCZOS)
+        overlay = Image.new("RGB", (PREVIEW_WIDTH, PREVIEW_HEIGHT), "black")
+        bg = Image.blend(bg, overlay, PREVIEW_BG_DIM_ALPHA)
+        return bg
+
+    # Procedural navy gradient with diagonal stripes
+    bg = Image.new("RGB", (PREVIEW_WIDTH, PREVIEW_HEIGHT), PREVIEW_BG_COLOR)
+    tex = Image.new("RGB", (PREVIEW_WIDTH * 2, PREVIEW_HEIGHT), PREVIEW_BG_COLOR)
+    tdr = ImageDraw.Draw(tex)
+    for x in range(-PREVIEW_WIDTH, PREVIEW_WIDTH * 2, PREVIEW_STRIPE_SPACING):
+        tdr.line([(x, 0), (x + PREVIEW_HEIGHT, PREVIEW_HEIGHT)], fill=PREVIEW_STRIPE_COLOR, width=4)
+    tex = tex.filter(ImageFilter.GaussianBlur(PREVIEW_STRIPE_BLUR))
+    bg.paste(tex.crop((0, 0, PREVIEW_WIDTH, PREVIEW_HEIGHT)))
+    return bg
+
+def generate_preview(title: str, date_str: str, output_path: pathlib.Path, bg_path: Optional[str] = None):
+    """Generate preview image for a blog post."""
+    ImageDraw = require("PIL.ImageDraw")
+    # Format footer
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    footer = f"{date.day} {date.strftime('%B %Y')}  ·  by Daniil Sedov"
+    
+    # Build background
+    bg_full_path = None
+    if bg_path:
+        # Check if it's relative to the blog post directory
+        bg_full_path = output_path.parent / bg_path
+        if not bg_full_path.exists():
+            bg_full_path = pathlib.Path(bg_path)
+    
+    img = build_background(bg_full_path)
+    draw = ImageDraw.Draw(img)
+
+    f_title = must_font(IBM_PLEX_BOLD, PREVIEW_TITLE_SIZE)
+    f_footer = must_font(IBM_PLEX_REGULAR, PREVIEW_FOOT_SIZE)
+
+    max_w = PREVIEW_WIDTH - 2 * PREVIEW_PADDING_X
+    lines = list(wrap(title, f_title, max_w, draw))
+    y = PREVIEW_TOP_Y
+    for line in lines:
+        draw.text((PREVIEW_PADDING_X, y), line, font=f_title, fill="white")
+        y += PREVIEW_TITLE_SIZE + 12
+
+    y += 25
+    draw.text((PREVIEW_PADDING_X, y), footer, font=f_footer, fill="white")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    img.save(output_path, quality=90)
+    print(f"  ✓ Preview generated: {output_path}")
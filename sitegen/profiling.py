@@ -0,0 +1,216 @@
+"""Per-stage and per-post timing for `generate_blog.py --profile`.
+
+Stages wrap their work in `stage(name)` (or `@timed(name)`); posts wrap theirs
+in `post(slug)`. Both are no-ops until `start()` is called, so instrumented
+code costs nothing in normal builds.
+"""
+
+import cProfile
+import functools
+import json
+import pathlib
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+PROFILE_VERSION = 1
+
+
+class Profiler:
+    def __init__(self, cprofile_dir: Optional[pathlib.Path] = None):
+        self.cprofile_dir = cprofile_dir
+        self.stages: Dict[str, Dict] = {}  # stage -> totals across all calls
+        self.posts: Dict[str, Dict] = {}  # slug -> totals + per-stage breakdown
+        self.current_post: Optional[str] = None
+        self.peaks: List[int] = []  # running peak per open stage (innermost last)
+        self.overall_peak = 0
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.active_profiles: List[cProfile.Profile] = []
+        self.started_wall = time.perf_counter()
+        self.started_cpu = time.process_time()
+        tracemalloc.start()
+
+    def _enter_peak(self):
+        # tracemalloc has a single peak, so hand the outer stage what it saw so far.
+        peak = tracemalloc.get_traced_memory()[1]
+        self.overall_peak = max(self.overall_peak, peak)
+        if self.peaks:
+            self.peaks[-1] = max(self.peaks[-1], peak)
+        tracemalloc.reset_peak()
+        self.peaks.append(0)
+
+    def _exit_peak(self) -> int:
+        peak = max(self.peaks.pop(), tracemalloc.get_traced_memory()[1])
+        self.overall_peak = max(self.overall_peak, peak)
+        tracemalloc.reset_peak()
+        if self.peaks:
+            self.peaks[-1] = max(self.peaks[-1], peak)
+        return peak
+
+    def _enter_cprofile(self, name: str):
+        if not self.cprofile_dir:
+            return
+        # Only one profiler can be active at a time; nested stages take over.
+        if self.active_profiles:
+            self.active_profiles[-1].disable()
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        self.active_profiles.append(profile)
+        profile.enable()
+
+    def _exit_cprofile(self):
+        if not self.cprofile_dir:
+            return
+        self.active_profiles.pop().disable()
+        if self.active_profiles:
+            self.active_profiles[-1].enable()
+
+    @staticmethod
+    def _add(totals: Dict, wall: float, cpu: float, peak: int):
+        totals["calls"] = totals.get("calls", 0) + 1
+        totals["wall_ms"] = totals.get("wall_ms", 0.0) + wall * 1000
+        totals["cpu_ms"] = totals.get("cpu_ms", 0.0) + cpu * 1000
+        totals["peak_bytes"] = max(totals.get("peak_bytes", 0), peak)
+
+    @contextmanager
+    def stage(self, name: str):
+        self._enter_peak()
+        self._enter_cprofile(name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._exit_cprofile()
+            peak = self._exit_peak()
+            self._add(self.stages.setdefault(name, {}), wall, cpu, peak)
+            if self.current_post:
+                post_stages = self.posts[self.current_post]["stages"]
+                self._add(post_stages.setdefault(name, {}), wall, cpu, peak)
+
+    @contextmanager
+    def post(self, slug: str):
+        self.posts.setdefault(slug, {"stages": {}})
+        previous, self.current_post = self.current_post, slug
+        self._enter_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            peak = self._exit_peak()
+            self._add(self.posts[slug], wall, cpu, peak)
+            self.current_post = previous
+
+    def report(self) -> Dict:
+        peak = max(self.overall_peak, tracemalloc.get_traced_memory()[1], *self.peaks)
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        def rounded(totals: Dict) -> Dict:
+            return {
+                key: round(value, 3) if isinstance(value, float) else value
+                for key, value in totals.items()
+                if key != "stages"
+            }
+
+        return {
+            "version": PROFILE_VERSION,
+            "command": sys.argv,
+            "commit": commit,
+            "total": {
+                "wall_ms": round((time.perf_counter() - self.started_wall) * 1000, 3),
+                "cpu_ms": round((time.process_time() - self.started_cpu) * 1000, 3),
+                "peak_bytes": peak,
+            },
+            "stages": {
+                name: rounded(totals)
+                for name, totals in sorted(self.stages.items(), key=lambda kv: -kv[1]["wall_ms"])
+            },
+            "posts": {
+                slug: {
+                    **rounded(totals),
+                    "stages": {name: rounded(t) for name, t in totals["stages"].items()},
+                }
+                for slug, totals in sorted(self.posts.items(), key=lambda kv: -kv[1].get("wall_ms", 0.0))
+            },
+        }
+
+    def finish(self, json_path: pathlib.Path, top_posts: int = 10):
+        report = self.report()
+        tracemalloc.stop()
+
+        if self.cprofile_dir:
+            self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+            for name, profile in self.profiles.items():
+                profile.dump_stats(str(self.cprofile_dir / f"{_file_safe(name)}.prof"))
+
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+        total = report["total"]
+        print(
+            f"\nProfile: {total['wall_ms']:.0f} ms wall, {total['cpu_ms']:.0f} ms CPU, "
+            f"peak {total['peak_bytes'] / 1024 / 1024:.1f} MiB traced"
+        )
+        print(f"  {'stage':<24} {'calls':>5} {'wall ms':>10} {'cpu ms':>10} {'peak KiB':>10}")
+        for name, totals in report["stages"].items():
+            print(
+                f"  {name:<24} {totals['calls']:>5} {totals['wall_ms']:>10.1f} "
+                f"{totals['cpu_ms']:>10.1f} {totals['peak_bytes'] / 1024:>10.0f}"
+            )
+        if report["posts"]:
+            print("  Slowest posts:")
+            for slug, totals in list(report["posts"].items())[:top_posts]:
+                slowest = max(totals["stages"].items(), key=lambda kv: kv[1]["wall_ms"], default=None)
+                detail = f" (mostly {slowest[0]})" if slowest else ""
+                print(f"  {totals['wall_ms']:>10.1f} ms  {slug}{detail}")
+        print(f"  ✓ Wrote {json_path}" + (f" and cProfile dumps to {self.cprofile_dir}" if self.cprofile_dir else ""))
+
+
+def _file_safe(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_." else "-" for ch in name)
+
+
+_profiler: Optional[Profiler] = None
+
+
+def start(cprofile_dir: Optional[pathlib.Path] = None) -> Profiler:
+    global _profiler
+    _profiler = Profiler(cprofile_dir)
+    return _profiler
+
+
+@contextmanager
+def stage(name: str):
+    if _profiler is None:
+        yield
+        return
+    with _profiler.stage(name):
+        yield
+
+
+@contextmanager
+def post(slug: str):
+    if _profiler is None:
+        yield
+        return
+    with _profiler.post(slug):
+        yield
+
+
+def timed(name: str):
+    """Decorator form of `stage(name)`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,151 @@
+"""Service worker and precache manifest (export only)."""
+
+import hashlib
+import json
+import pathlib
+import re
+from typing import Dict, List, Set, Tuple
+
+from .config import (
+    FINGERPRINT_HASH_LENGTH,
+    HEADERS_FILE_NAME,
+    POSTS_JSON,
+    PRECACHE_MANIFEST_NAME,
+    PRECACHE_MANIFEST_VERSION,
+    SW_CACHE_CONTROL,
+    SW_FILE_NAME,
+    SW_PRECACHE_FILES,
+    SW_PRECACHE_PAGES,
+    SW_RECENT_POSTS,
+    SW_RUNTIME_MAX_ENTRIES,
+    SW_TEMPLATE_FILE,
+)
+from .export import (
+    ExportOverlay,
+    iter_publishable_files,
+    load_deploy_ignore,
+    read_export_file,
+)
+from .fingerprint import CSS_URL_REF_RE, QUOTED_ASSET_REF_RE, resolve_asset_ref
+from .profiling import timed
+from .templates import apply_template
+
+
+SW_META_TAG = f'<meta name="service-worker" content="/{SW_FILE_NAME}">'
+# src/href values in pages, quoted or not (this stage runs after --minify-html).
+HTML_ASSET_ATTR_RE = re.compile(
+    r"""\s(?:src|href)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))"""
+)
+PRECACHE_ASSET_EXTENSIONS = (".css", ".js", ".json")
+
+
+def _page_url(relpath: str) -> str:
+    """URL a page is served at: clean URLs, except the 404 page itself."""
+    if relpath == "index.html":
+        return "/"
+    if relpath.endswith("/index.html"):
+        return "/" + relpath[: -len("index.html")]
+    if relpath.endswith(".html") and relpath != "404.html":
+        return "/" + relpath[: -len(".html")]
+    return "/" + relpath
+
+
+def _recent_post_slugs() -> List[str]:
+    if not POSTS_JSON.exists():
+        return []
+    posts = json.loads(POSTS_JSON.read_text(encoding="utf-8"))
+    posts.sort(key=lambda p: (p.get("date", ""), p.get("datetime") or ""), reverse=True)
+    return [p["id"] for p in posts[:SW_RECENT_POSTS]]
+
+
+def _asset_refs(text: str, relpath: str) -> Set[str]:
+    """Local CSS/JS/JSON files referenced from a page, stylesheet or script."""
+    refs = set(m.group(2) for m in QUOTED_ASSET_REF_RE.finditer(text))
+    if relpath.endswith(".html"):
+        refs.update(next(g for g in m.groups() if g is not None) for m in HTML_ASSET_ATTR_RE.finditer(text))
+    elif relpath.endswith(".css"):
+        refs.update(m.group(1) for m in CSS_URL_REF_RE.finditer(text))
+
+    targets = set()
+    for ref in refs:
+        ref = ref.split("#", 1)[0].split("?", 1)[0]
+        if "//" in ref or ":" in ref or not ref.endswith(PRECACHE_ASSET_EXTENSIONS):
+            continue
+        targets.add(resolve_asset_ref(ref, relpath))
+    return targets
+
+
+def _inject_meta_tag(overlay: ExportOverlay, pages: List[str]) -> int:
+    injected = 0
+    for relpath in pages:
+        html = read_export_file(relpath, overlay).decode("utf-8")
+        if SW_META_TAG in html or "</head>" not in html:
+            continue
+        overlay[relpath] = html.replace("</head>", SW_META_TAG + "</head>", 1).encode("utf-8")
+        injected += 1
+    return injected
+
+
+@timed("export: service worker")
+def generate_service_worker(overlay: ExportOverlay, skip_dirs: Tuple[pathlib.Path, ...] = ()) -> Dict:
+    """Add sw.js and its precache manifest to `overlay`.
+
+    Runs after every other export stage, so each entry's revision is the hash
+    of the bytes actually deployed. Pages get a meta tag that js/offline.js
+    registers the worker from; dev servers never see it.
+    """
+    publishable = set(iter_publishable_files(load_deploy_ignore(), skip_dirs)) | set(overlay)
+    html_pages = sorted(p for p in publishable if p.endswith(".html"))
+    injected = _inject_meta_tag(overlay, html_pages)
+
+    slugs = _recent_post_slugs()
+    pages = [p for p in SW_PRECACHE_PAGES if p in publishable]
+    pages += [f"blog/{slug}.html" for slug in slugs if f"blog/{slug}.html" in publishable]
+    files = [p for p in SW_PRECACHE_FILES if p in publishable]
+    files += [f"blog/{slug}.md" for slug in slugs if f"blog/{slug}.md" in publishable]
+
+    # Shell assets: everything the precached pages load, followed transitively.
+    assets: Set[str] = set()
+    queue = list(pages)
+    while queue:
+        relpath = queue.pop()
+        text = read_export_file(relpath, overlay).decode("utf-8")
+        for target in sorted(_asset_refs(text, relpath) - assets):
+            if target in publishable:
+                assets.add(target)
+                if target.endswith((".css", ".js")):
+                    queue.append(target)
+
+    entries = {}
+    for relpath in sorted(set(pages) | set(files) | assets):
+        url = _page_url(relpath) if relpath in pages else "/" + relpath
+        entries[url] = hashlib.sha256(read_export_file(relpath, overlay)).hexdigest()[:FINGERPRINT_HASH_LENGTH]
+    manifest = {"version": PRECACHE_MANIFEST_VERSION, "entries": dict(sorted(entries.items()))}
+
+    overlay[PRECACHE_MANIFEST_NAME] = (json.dumps(manifest, indent=2) + "\n").encode("utf-8")
+    sw_template = SW_TEMPLATE_FILE.read_text(encoding="utf-8")
+    manifest_json = json.dumps(manifest, separators=(",", ":"))
+    # Names this version's precache, so installing never touches the cache
+    # the active worker is still serving from.
+    precache_version = hashlib.sha256((sw_template + manifest_json).encode("utf-8")).hexdigest()
+    overlay[SW_FILE_NAME] = apply_template(
+        sw_template,
+        {
+            "precache_manifest": manifest_json,
+            "precache_version": precache_version[:FINGERPRINT_HASH_LENGTH],
+            "runtime_max_entries": str(SW_RUNTIME_MAX_ENTRIES),
+            "hash_length": str(FINGERPRINT_HASH_LENGTH),
+        },
+    ).encode("utf-8")
+
+    # The worker itself must always be revalidated, or updates never land.
+    headers = read_export_file(HEADERS_FILE_NAME, overlay).decode("utf-8") if HEADERS_FILE_NAME in publishable else ""
+    if f"/{SW_FILE_NAME}" not in (line.strip() for line in headers.splitlines()):
+        headers += f"/{SW_FILE_NAME}\n  Cache-Control: {SW_CACHE_CONTROL}\n"
+        overlay[HEADERS_FILE_NAME] = headers.encode("utf-8")
+
+    print(
+        f"  ✓ Service worker precaches {len(entries)} entries "
+        f"({len(pages)} pages, {len(assets)} assets); tagged {injected} pages"
+    )
+    return manifest
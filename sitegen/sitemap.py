@@ -0,0 +1,184 @@
+"""sitemap.xml with lastmod values derived from hashes of each page's sources."""
+
+import hashlib
+import json
+import pathlib
+import re
+from datetime import datetime
+from html import escape as html_escape
+from typing import Dict, List
+
+from .config import (
+    BLOG_DIR,
+    BLOG_INDEX_TEMPLATE_FILE,
+    BUILD_MANIFEST,
+    BUILD_MANIFEST_VERSION,
+    CODEX_STATS_JSON,
+    CODEX_STATS_TEMPLATE_FILE,
+    HOME_TEMPLATE_FILE,
+    ROOT_DIR,
+    SITEMAP_MAX_BYTES,
+    SITEMAP_MAX_URLS,
+    SITEMAP_SHARD_DIR,
+    SITEMAP_URLSET_CLOSE,
+    SITEMAP_URLSET_OPEN,
+    SITEMAP_XML,
+    SITE_URL,
+    TIERLIST_JSON,
+    TIERLIST_TEMPLATE_FILE,
+)
+from .files import write_if_changed
+from .pages import HOME_FEATURED_SLUGS
+from .profiling import timed
+
+
+def _load_build_manifest() -> Dict:
+    if BUILD_MANIFEST.exists():
+        manifest = json.loads(BUILD_MANIFEST.read_text(encoding="utf-8"))
+        if manifest.get("version") == BUILD_MANIFEST_VERSION:
+            return manifest
+    return {"version": BUILD_MANIFEST_VERSION, "pages": {}}
+
+
+def _sitemap_lastmod_seeds() -> Dict[str, str]:
+    """lastmod values from the sitemap being replaced, for URLs with no hash history yet."""
+    if not SITEMAP_XML.exists():
+        return {}
+    text = SITEMAP_XML.read_text(encoding="utf-8")
+    return dict(re.findall(r"<loc>([^<]+)</loc>\s*<lastmod>([^<]+)</lastmod>", text))
+
+
+def _file_bytes(path: pathlib.Path) -> bytes:
+    return path.read_bytes() if path.exists() else b""
+
+
+def _template_content(template_file: pathlib.Path) -> bytes:
+    """A page template's <main> region; head and chrome changes are not content."""
+    text = template_file.read_text(encoding="utf-8") if template_file.exists() else ""
+    match = re.search(r"<main\b.*?</main>", text, flags=re.DOTALL)
+    return (match.group(0) if match else text).encode("utf-8")
+
+
+def _post_listing(posts: List[Dict]) -> bytes:
+    """What a post list shows, minus volatile bits such as view counts."""
+    return json.dumps([[p["id"], p.get("title", ""), p.get("date", "")] for p in posts]).encode("utf-8")
+
+
+def _sitemap_shards(entries: List[str]) -> List[List[str]]:
+    """Split `<url>` blocks so no shard exceeds the sitemap URL or byte limits."""
+    overhead = len(SITEMAP_URLSET_OPEN.encode("utf-8")) + len(SITEMAP_URLSET_CLOSE.encode("utf-8"))
+    shards: List[List[str]] = [[]]
+    size = overhead
+    for entry in entries:
+        entry_size = len(entry.encode("utf-8"))
+        if shards[-1] and (len(shards[-1]) >= SITEMAP_MAX_URLS or size + entry_size > SITEMAP_MAX_BYTES):
+            shards.append([])
+            size = overhead
+        shards[-1].append(entry)
+        size += entry_size
+    return shards
+
+
+@timed("sitemap")
+def generate_sitemap_xml(posts_data: List[Dict]):
+    """Generate sitemap.xml for SEO.
+
+    Each URL's `lastmod` is the date its sources last changed: the post's
+    markdown (with frontmatter), or a page template's <main> region plus the
+    data it lists. Hashes are tracked in BUILD_MANIFEST. Rendered chrome,
+    baked view counts and prefetch hints never bump lastmod. Past
+    the sitemap protocol limits, sitemap.xml becomes an index over shards in
+    SITEMAP_SHARD_DIR. Files are only rewritten when their content changes.
+    """
+    today = datetime.now().strftime('%Y-%m-%d')
+    manifest = _load_build_manifest()
+    history: Dict[str, Dict] = manifest["pages"]
+    seeds = _sitemap_lastmod_seeds()
+
+    # Blog posts sorted by date (newer posts get higher priority)
+    posts_sorted = sorted(posts_data, key=lambda x: x['date'], reverse=True)
+    posts_by_slug = {p["id"]: p for p in posts_sorted}
+    featured = [posts_by_slug[slug] for slug in HOME_FEATURED_SLUGS if slug in posts_by_slug]
+
+    # (url, sources, changefreq, priority, fallback lastmod)
+    pages = [
+        (f'{SITE_URL}/', [_template_content(HOME_TEMPLATE_FILE), _post_listing(featured)], 'weekly', '1.0', today),
+        (f'{SITE_URL}/blog', [_template_content(BLOG_INDEX_TEMPLATE_FILE), _post_listing(posts_sorted)], 'weekly', '0.9', today),
+        (f'{SITE_URL}/llm-tierlist', [_template_content(TIERLIST_TEMPLATE_FILE), _file_bytes(TIERLIST_JSON)], 'monthly', '0.7', today),
+        (f'{SITE_URL}/codex-stats', [_template_content(CODEX_STATS_TEMPLATE_FILE), _file_bytes(CODEX_STATS_JSON)], 'daily', '0.7', today),
+    ]
+    for i, post in enumerate(posts_sorted):
+        priority = max(0.4, 0.8 - (i * 0.1))
+        pages.append((
+            f"{SITE_URL}/blog/{post['id']}",
+            [_file_bytes(BLOG_DIR / f"{post['id']}.md")],
+            'monthly',
+            f"{priority:.1f}",
+            post['date'],
+        ))
+
+    entries = []
+    lastmods = []
+    current_history: Dict[str, Dict] = {}
+    for url, sources, freq, priority, fallback in pages:
+        digest = hashlib.sha256()
+        for source in sources:
+            digest.update(len(source).to_bytes(8, "big") + source)
+        sha256 = digest.hexdigest()
+
+        previous = history.get(url)
+        if previous and previous["sha256"] == sha256:
+            lastmod = previous["lastmod"]
+        elif previous:
+            lastmod = today
+        else:
+            lastmod = seeds.get(url, fallback)
+        current_history[url] = {"sha256": sha256, "lastmod": lastmod}
+
+        entries.append(f'''  <url>
+    <loc>{html_escape(url, quote=False)}</loc>
+    <lastmod>{lastmod}</lastmod>
+    <changefreq>{freq}</changefreq>
+    <priority>{priority}</priority>
+  </url>
+''')
+        lastmods.append(lastmod)
+
+    shards = _sitemap_shards(entries)
+    written = set()
+    if len(shards) == 1:
+        write_if_changed(SITEMAP_XML, SITEMAP_URLSET_OPEN + "".join(entries) + SITEMAP_URLSET_CLOSE, "sitemap.xml")
+    else:
+        index = ['<?xml version="1.0" encoding="UTF-8"?>\n',
+                 '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+        offset = 0
+        for number, shard in enumerate(shards, start=1):
+            relpath = f"{SITEMAP_SHARD_DIR}/sitemap-{number}.xml"
+            path = ROOT_DIR / relpath
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(path, SITEMAP_URLSET_OPEN + "".join(shard) + SITEMAP_URLSET_CLOSE, relpath)
+            written.add(relpath)
+            lastmod = max(lastmods[offset:offset + len(shard)])
+            offset += len(shard)
+            index.append(f"  <sitemap>\n    <loc>{SITE_URL}/{relpath}</loc>\n    <lastmod>{lastmod}</lastmod>\n  </sitemap>\n")
+        index.append("</sitemapindex>\n")
+        write_if_changed(SITEMAP_XML, "".join(index), "sitemap.xml")
+
+    # Drop shards left over from a larger sitemap.
+    shard_dir = ROOT_DIR / SITEMAP_SHARD_DIR
+    if shard_dir.is_dir():
+        for stale in shard_dir.iterdir():
+            relpath = f"{SITEMAP_SHARD_DIR}/{stale.name}"
+            if relpath not in written:
+                stale.unlink()
+                print(f"  ✓ Removed {relpath}")
+        if not any(shard_dir.iterdir()):
+            shard_dir.rmdir()
+
+    manifest["pages"] = current_history
+    write_if_changed(BUILD_MANIFEST, json.dumps(manifest, indent=2, sort_keys=True), BUILD_MANIFEST.name)
+
+    print(
+        f"  ✓ Generated sitemap.xml with {len(pages)} URLs"
+        + (f" across {len(shards)} shards" if len(shards) > 1 else "")
+    )
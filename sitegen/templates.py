@@ -0,0 +1,114 @@
+"""Template loading and {{token}} substitution."""
+
+import pathlib
+import re
+from typing import Dict, List, Optional
+
+from .config import ANALYTICS_PARTIAL, THEME_INIT_PARTIAL
+from .content import format_date_display, format_date_iso
+from .hints import render_prefetch_hints
+
+
+def apply_template(template: str, replacements: Dict[str, str]) -> str:
+    """Apply {{token}} replacements to a template string.
+
+    For multiline replacements, if the placeholder appears on its own line, the
+    inserted block is auto-indented to match the placeholder indentation.
+    """
+    result = template
+
+    for token, raw_value in replacements.items():
+        value = str(raw_value)
+        placeholder = f"{{{{{token}}}}}"
+
+        if "\n" in value:
+            pattern = re.compile(
+                rf"^(?P<indent>[ \t]*){re.escape(placeholder)}[ \t]*$",
+                flags=re.MULTILINE,
+            )
+
+            def replace_block(match: re.Match) -> str:
+                indent = match.group("indent")
+                lines = value.splitlines()
+                return "\n".join(
+                    (indent + line if line.strip() else line) for line in lines
+                )
+
+            result = pattern.sub(replace_block, result)
+
+        result = result.replace(placeholder, value)
+
+    return result
+
+
+def load_common_partials() -> Dict[str, str]:
+    def read_optional(path: pathlib.Path) -> str:
+        if not path.exists():
+            return ""
+        return path.read_text(encoding="utf-8").rstrip() + "\n"
+
+    return {
+        "theme_init": read_optional(THEME_INIT_PARTIAL),
+        "analytics": read_optional(ANALYTICS_PARTIAL),
+    }
+
+
+def fill_template(
+    template: str,
+    frontmatter: Dict,
+    content: str,
+    slug: str,
+    common_replacements: Optional[Dict[str, str]] = None,
+    prefetch_urls: Optional[List[str]] = None,
+) -> str:
+    """Fill the HTML template with content and metadata.
+
+    `prefetch_urls` are pages a reader is likely to open next (see hints.py).
+    """
+    # Prepare all replacements
+    # Determine post type for template usage
+    post_type = frontmatter.get('type', 'research').strip().lower()
+    if post_type not in ('research', 'essay', 'project'):
+        post_type = 'research'
+
+    replacements: Dict[str, str] = {}
+    if common_replacements:
+        replacements.update(common_replacements)
+
+    replacements.update({
+        'title': frontmatter.get('title', 'Untitled'),
+        'description': frontmatter.get('description', ''),
+        'slug': slug,
+        'formatted_date': format_date_display(frontmatter.get('date', '2025-01-01')),
+        'iso_date': format_date_iso(
+            frontmatter.get('date', '2025-01-01'),
+            frontmatter.get('datetime')  # Pass the datetime if available
+        ),
+        'content': content,
+        'extra_scripts': '',
+        'post_type': post_type,
+        'prefetch_hints': render_prefetch_hints(prefetch_urls or []),
+    })
+    
+    # Check if we need theme-aware image scripts
+    if 'theme_aware_images' in frontmatter and frontmatter['theme_aware_images'] == 'true':
+        extra_script = """<script>
+    // Set initial image sources based on theme
+    document.addEventListener('DOMContentLoaded', function () {
+        const isDark = document.documentElement.classList.contains('dark-mode');
+        const images = document.querySelectorAll('img[data-base-src]');
+        images.forEach((img) => {
+            const baseSrc = img.getAttribute('data-base-src');
+            if (baseSrc) {
+                const themeSrc = baseSrc.replace(
+                    '.png',
+                    isDark ? '_dark.png' : '_light.png'
+                );
+                img.src = themeSrc;
+            }
+        });
+    });
+</script>"""
+        replacements['extra_scripts'] = extra_script
+
+    return apply_template(template, replacements)
@@ -0,0 +1,289 @@
+"""Prerendered LLM tier board (llm-tierlist.html) from assets/llm-tierlist.json.
+
+This mirrors the snapshot logic in js/llm-tierlist.js, so the page ships the
+latest board as HTML and the script only adds the timeline and model details.
+Keep the markup in sync with `buildStageFragment()` there.
+"""
+
+import json
+import re
+from html import escape
+from typing import Dict, List, Optional
+
+from .config import TIERLIST_JSON, TIERLIST_MAX_MODELS_PER_TIER
+from .content import format_date_markdown
+
+TIER_ACCENT_VARS = {
+    "sunflower": "var(--sunflower)",
+    "deep-sea": "var(--deep-sea)",
+    "rust": "var(--rust)",
+    "neutral": "var(--vibe-neutral)",
+}
+
+
+def _slugify(text) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", str(text or "").strip().lower()).strip("-")
+
+
+def _format_date(date_str: str) -> str:
+    """'2026-01-19' -> '19 January 2026' (en-GB long form, as the JS renders it)."""
+    try:
+        return format_date_markdown(str(date_str))
+    except ValueError:
+        return str(date_str or "")
+
+
+def _snapshots_from_changes(changes_raw: List[Dict], tier_ids: List[str]) -> List[Dict]:
+    """Replay schema-v2 `changes` into one snapshot per day (buildSnapshotsFromChanges)."""
+    models_by_id: Dict[str, Dict] = {}
+    tier_contents: Dict[str, List[str]] = {tier_id: [] for tier_id in tier_ids}
+
+    def remove_from_all_tiers(model_id: str):
+        for contents in tier_contents.values():
+            if model_id in contents:
+                contents.remove(model_id)
+
+    def upsert_model(model: Optional[Dict]):
+        model_id = str(model.get("id") or "") if model else ""
+        if not model_id:
+            return
+        prev = models_by_id.get(model_id, {})
+        models_by_id[model_id] = {
+            key: str(model[key]) if key in model else prev.get(key)
+            for key in ("name", "vendor", "summary")
+        }
+
+    def place_model(action: Dict):
+        model_id = str(action.get("id") or "")
+        tier_id = str(action.get("tier") or "")
+        if not model_id or tier_id not in tier_contents:
+            return
+        remove_from_all_tiers(model_id)
+        target = tier_contents[tier_id]
+        position = action.get("position")
+
+        if position == "top":
+            target.insert(0, model_id)
+        elif position in ("bottom", None):
+            target.append(model_id)
+        elif isinstance(position, (int, float)) and not isinstance(position, bool):
+            target.insert(max(0, min(len(target), int(position))), model_id)
+        elif action.get("before") and str(action["before"]) in target:
+            target.insert(target.index(str(action["before"])), model_id)
+        elif action.get("after") and str(action["after"]) in target:
+            target.insert(target.index(str(action["after"])) + 1, model_id)
+        else:
+            target.append(model_id)
+
+    def apply_action(action: Dict):
+        kind = str(action.get("type") or "")
+        if kind == "upsert_model":
+            upsert_model(action.get("model"))
+        elif kind == "place":
+            place_model(action)
+        elif kind == "remove":
+            model_id = str(action.get("id") or "")
+            if model_id:
+                remove_from_all_tiers(model_id)
+                if action.get("purge") is True:
+                    models_by_id.pop(model_id, None)
+
+    changes = sorted(
+        (change for change in changes_raw if isinstance(change, dict) and change.get("at")),
+        key=lambda change: str(change["at"]),
+    )
+
+    # One snapshot per day: merge change entries with the same `at`.
+    days: List[Dict] = []
+    for change in changes:
+        actions = change.get("actions") if isinstance(change.get("actions"), list) else []
+        if days and days[-1]["at"] == str(change["at"]):
+            day = days[-1]
+            day["label"] = str(change.get("label") or "") or day["label"]
+            day["note"] = str(change.get("note") or "") or day["note"]
+            day["actions"].extend(actions)
+        else:
+            days.append({
+                "at": str(change["at"]),
+                "label": str(change.get("label") or ""),
+                "note": str(change.get("note") or ""),
+                "actions": list(actions),
+            })
+
+    snapshots = []
+    for day_index, day in enumerate(days):
+        for action in day["actions"]:
+            if isinstance(action, dict):
+                apply_action(action)
+        tiers_out = {}
+        for tier_id in tier_ids:
+            tiers_out[tier_id] = []
+            for model_id in tier_contents[tier_id]:
+                meta = models_by_id.get(model_id, {})
+                tiers_out[tier_id].append({
+                    "id": model_id,
+                    "name": meta.get("name") or model_id,
+                    "vendor": meta.get("vendor") or "",
+                    "summary": meta.get("summary") or "",
+                })
+        snapshots.append({
+            "id": f"{day['at']}-{day_index}",
+            "date": day["at"],
+            "label": day["label"] or day["at"],
+            "note": day["note"],
+            "tiers": tiers_out,
+        })
+    return snapshots
+
+
+def normalize_tierlist(raw: Dict) -> Dict:
+    """Tiers plus date-ordered snapshots, as normalizeTierlistData() builds them."""
+    tiers = [
+        {
+            "id": str(tier.get("id") or ""),
+            "label": str(tier.get("label") or tier.get("id") or ""),
+            "accent": str(tier.get("accent") or "neutral"),
+        }
+        for tier in raw.get("tiers") or []
+        if isinstance(tier, dict) and tier.get("id")
+    ]
+    changes = raw.get("changes") if isinstance(raw.get("changes"), list) else []
+
+    if (raw.get("schemaVersion") or 1) >= 2 or changes:
+        snapshots = _snapshots_from_changes(changes, [tier["id"] for tier in tiers])
+    else:
+        snapshots = sorted(
+            (
+                {
+                    "id": snapshot.get("id") or snapshot["date"],
+                    "date": snapshot["date"],
+                    "label": snapshot.get("label") or snapshot["date"],
+                    "note": snapshot.get("note") or "",
+                    "tiers": snapshot.get("tiers") or {},
+                }
+                for snapshot in raw.get("snapshots") or []
+                if isinstance(snapshot, dict) and snapshot.get("date")
+            ),
+            key=lambda snapshot: str(snapshot["date"]),
+        )
+    return {"tiers": tiers, "snapshots": snapshots}
+
+
+def _location_map(snapshot: Dict, tiers: List[Dict]) -> Dict[str, tuple]:
+    locations = {}
+    for tier_index, tier in enumerate(tiers):
+        for position, model in enumerate(snapshot["tiers"].get(tier["id"]) or []):
+            model_id = str(model.get("id") or "") or _slugify(model.get("name"))
+            locations[model_id] = (tier_index, position)
+    return locations
+
+
+def _delta_badge(previous: Optional[Dict], current: Dict, model_id: str) -> Optional[Dict]:
+    """Badge for a model's move since the previous snapshot (computeDeltas + formatDelta)."""
+    if previous is None:
+        return None
+    if model_id not in previous:
+        return {"text": "new", "className": "tierlist-delta tierlist-delta-new", "aria": "New in this snapshot"}
+
+    # Moves within a tier are not badged.
+    delta = previous[model_id][0] - current[model_id][0]
+    if delta == 0:
+        return None
+    count = abs(delta)
+    return {
+        "text": f"{'▲' if delta > 0 else '▼'}{count}",
+        "className": f"tierlist-delta tierlist-delta-{'up' if delta > 0 else 'down'}",
+        "aria": f"{'Moved up' if delta > 0 else 'Moved down'} {count} tier{'' if count == 1 else 's'} since last snapshot",
+    }
+
+
+def _render_model_card(model: Dict, badge: Optional[Dict], full_width: bool) -> str:
+    vendor, summary = model.get("vendor") or "", model.get("summary") or ""
+    classes = "tierlist-model" + (" tierlist-model-changed" if badge else "")
+    style = ' style="grid-column: 1 / -1;"' if full_width else ""
+    badge_html = (
+        f'\n    <span class="{badge["className"]}" aria-label="{escape(badge["aria"])}">{badge["text"]}</span>'
+        if badge else ""
+    )
+    return (
+        f'<button class="{classes}" type="button" aria-haspopup="dialog" data-model-id="{escape(model["id"])}"{style}>\n'
+        f'    <div class="tierlist-model-top">\n'
+        f'        <div class="tierlist-model-name">{escape(model.get("name") or "Unnamed model")}</div>\n'
+        f'        <div class="tierlist-model-vendor text-muted{"" if vendor else " is-empty"}">{escape(vendor or "—")}</div>\n'
+        f'    </div>\n'
+        f'    <div class="tierlist-model-summary{"" if summary else " is-empty"}">{escape(summary or "—")}</div>'
+        f'{badge_html}\n'
+        f'</button>'
+    )
+
+
+PLACEHOLDER_CARD = """<div class="tierlist-model tierlist-model-placeholder" aria-hidden="true" style="grid-column: 1 / -1;">
+    <div class="tierlist-model-top">
+        <div class="tierlist-model-name text-muted">—</div>
+        <div class="tierlist-model-vendor text-muted is-empty">—</div>
+    </div>
+    <div class="tierlist-model-summary is-empty">—</div>
+</div>"""
+
+
+def render_tierlist_stage(data: Dict) -> str:
+    """HTML for the latest snapshot's stage, or "" when there is nothing to show."""
+    tiers, snapshots = data["tiers"], data["snapshots"]
+    if not tiers or not snapshots:
+        return ""
+
+    snapshot = snapshots[-1]
+    current = _location_map(snapshot, tiers)
+    previous = _location_map(snapshots[-2], tiers) if len(snapshots) > 1 else None
+
+    tier_blocks = []
+    for tier in tiers:
+        models = []
+        for raw in (snapshot["tiers"].get(tier["id"]) or [])[:TIERLIST_MAX_MODELS_PER_TIER]:
+            model_id = str(raw.get("id") or "") or _slugify(raw.get("name"))
+            models.append(({**raw, "id": model_id}, _delta_badge(previous, current, model_id)))
+
+        if models:
+            cards = [_render_model_card(model, badge, len(models) == 1) for model, badge in models]
+        else:
+            cards = [PLACEHOLDER_CARD]
+        accent = TIER_ACCENT_VARS.get(tier["accent"], TIER_ACCENT_VARS["neutral"])
+        tier_blocks.append(
+            f'<div class="tierlist-tier" data-tier-id="{escape(tier["id"])}" style="--tier-accent: {accent};">\n'
+            f'    <div class="tierlist-tier-label">{escape(tier["label"])}</div>\n'
+            f'    <div class="tierlist-tier-content">\n'
+            + "\n".join(_indent(card, 8) for card in cards)
+            + "\n    </div>\n</div>"
+        )
+
+    note = snapshot.get("note") or ""
+    return (
+        '<div class="tierlist-snapshot tierlist-stage" role="region" aria-label="Tier list">\n'
+        f'    <div class="tierlist-snapshot-header" data-snapshot-id="{escape(snapshot["id"])}">\n'
+        '        <div class="tierlist-snapshot-title-wrap">\n'
+        f'            <h3 class="tierlist-snapshot-title">{escape(snapshot["label"] or _format_date(snapshot["date"]))}</h3>\n'
+        f'            <div class="tierlist-snapshot-date text-muted">{escape(_format_date(snapshot["date"]))}</div>\n'
+        '        </div>\n'
+        '        <div class="tierlist-latest-badge">Latest</div>\n'
+        '    </div>\n'
+        f'    <p class="tierlist-snapshot-note text-muted{"" if note else " is-empty"}">{escape(note)}</p>\n'
+        '    <div class="tierlist-board">\n'
+        + "\n".join(_indent(block, 8) for block in tier_blocks)
+        + "\n    </div>\n</div>"
+    )
+
+
+def _indent(block: str, spaces: int) -> str:
+    return "\n".join(" " * spaces + line for line in block.splitlines())
+
+
+def load_tierlist_stage() -> str:
+    """Render the board from TIERLIST_JSON ("" if the file is missing or invalid)."""
+    if not TIERLIST_JSON.exists():
+        return ""
+    try:
+        raw = json.loads(TIERLIST_JSON.read_text(encoding="utf-8"))
+    except ValueError as e:
+        print(f"  ⚠ Warning: Skipping tier list prerender: {TIERLIST_JSON.name} is not valid JSON ({e})")
+        return ""
+    return render_tierlist_stage(normalize_tierlist(raw))
@@ -0,0 +1,83 @@
+"""Build-time view-count snapshots for posts.json and the post lists.
+
+A snapshot is `{slug: views}`. `--views SOURCE` takes it from the batched API
+(`GET <base>/api/viewcount?ids=a,b,c` -> `{"views": {slug: n}}`) or from a JSON
+file, so builds work offline. Without `--views`, counts already in posts.json
+are carried forward, so a plain rebuild never resets them.
+"""
+
+import json
+import pathlib
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from .config import POSTS_JSON, VIEWCOUNT_BATCH_LIMIT, VIEWCOUNT_TIMEOUT
+from .profiling import timed
+
+
+def format_views(count: int) -> str:
+    """Same text as ViewCount.format() in js/viewcount.js."""
+    return "1&nbsp;view" if count == 1 else f"{count}&nbsp;views"
+
+
+def _parse_counts(data) -> Dict[str, int]:
+    # Accept the API response shape as well as a bare {slug: views} mapping.
+    if isinstance(data, dict) and isinstance(data.get("views"), dict):
+        data = data["views"]
+    if not isinstance(data, dict):
+        raise ValueError("expected an object mapping slugs to view counts")
+    return {str(slug): int(views) for slug, views in data.items() if isinstance(views, (int, float))}
+
+
+def _fetch_counts(base_url: str, slugs: List[str]) -> Dict[str, int]:
+    import urllib.request  # Only --views with a URL needs it; keeps --pages startup light
+
+    counts: Dict[str, int] = {}
+    for start in range(0, len(slugs), VIEWCOUNT_BATCH_LIMIT):
+        ids = ",".join(quote(slug, safe="") for slug in slugs[start:start + VIEWCOUNT_BATCH_LIMIT])
+        url = f"{base_url.rstrip('/')}/api/viewcount?ids={ids}"
+        with urllib.request.urlopen(url, timeout=VIEWCOUNT_TIMEOUT) as response:
+            counts.update(_parse_counts(json.load(response)))
+    return counts
+
+
+def previous_view_counts() -> Dict[str, int]:
+    """Counts baked into the current posts.json (empty if there are none)."""
+    if not POSTS_JSON.exists():
+        return {}
+    try:
+        posts = json.loads(POSTS_JSON.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {p["id"]: p["views"] for p in posts if isinstance(p.get("views"), int)}
+
+
+@timed("view counts")
+def load_view_counts(source: Optional[str], slugs: List[str]) -> Dict[str, int]:
+    """Return a snapshot for `slugs` from an API base URL or a JSON file.
+
+    Falls back to the counts in posts.json when the source is unavailable, so
+    a flaky API never fails (or zeroes) a build.
+    """
+    previous = previous_view_counts()
+    if not source:
+        return previous
+
+    try:
+        if source.startswith(("http://", "https://")):
+            fetched = _fetch_counts(source, slugs)
+        else:
+            fetched = _parse_counts(json.loads(pathlib.Path(source).read_text(encoding="utf-8")))
+    except (OSError, ValueError) as e:  # URLError is an OSError
+        print(f"  ⚠ Warning: View counts unavailable from {source} ({e}); keeping previous snapshot")
+        return previous
+
+    print(f"  ✓ Loaded view counts for {len(fetched)} posts from {source}")
+    return {**previous, **fetched}
+
+
+def apply_view_counts(posts_data: List[Dict], counts: Dict[str, int]):
+    """Set `views` on each post that has a count; posts without one are left as is."""
+    for post in posts_data:
+        if post["id"] in counts:
+            post["views"] = counts[post["id"]]
@@ -0,0 +1,145 @@
+// Service worker written by `generate_blog.py --export DIR --service-worker`.
+// The precache manifest is filled in from the export's file hashes; any change
+// to it changes this file, which is what makes browsers install an update.
+// Each version installs into its own precache, so the worker still serving
+// pages keeps its cache intact until the new one activates. Only entries
+// whose revision changed are downloaded again; the rest are copied over.
+
+const PRECACHE_MANIFEST = {{precache_manifest}};
+const PRECACHE_PREFIX = 'precache-';
+const PRECACHE = PRECACHE_PREFIX + '{{precache_version}}';
+const RUNTIME = 'runtime-v1';
+const REVISIONS_KEY = '/__precache-revisions';
+const RUNTIME_MAX_ENTRIES = {{runtime_max_entries}};
+const OFFLINE_FALLBACK = '/404.html';
+// Content-hashed names from `--fingerprint` (e.g. /js/main.0123abcdef.js)
+// never change, so they are served cache-first.
+const FINGERPRINTED_RE = /\.[0-9a-f]{{{hash_length}}}\.(?:css|js|json)$/;
+
+const ENTRIES = new Map(Object.entries(PRECACHE_MANIFEST.entries)); // url -> revision
+
+// Redirected responses can't be replayed for navigations; store a plain copy.
+function cacheable(response) {
+    if (!response.redirected) return response;
+    return new Response(response.body, {
+        status: response.status,
+        statusText: response.statusText,
+        headers: response.headers
+    });
+}
+
+async function trimCache(cache, maxEntries) {
+    const keys = await cache.keys();
+    for (const request of keys.slice(0, Math.max(0, keys.length - maxEntries))) {
+        await cache.delete(request);
+    }
+}
+
+// Responses in earlier precaches, keyed by "revision url".
+async function previousEntries() {
+    const previous = new Map();
+    for (const name of await caches.keys()) {
+        if (!name.startsWith(PRECACHE_PREFIX)) continue;
+        const cache = await caches.open(name);
+        const stored = await cache.match(REVISIONS_KEY);
+        const revisions = stored ? await stored.json() : {};
+        for (const [url, revision] of Object.entries(revisions)) {
+            previous.set(`${revision} ${url}`, cache);
+        }
+    }
+    return previous;
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const previous = await previousEntries();
+        const cache = await caches.open(PRECACHE);
+        const revisions = {};
+
+        await Promise.all([...ENTRIES].map(async ([url, revision]) => {
+            const reused = await previous.get(`${revision} ${url}`)?.match(url);
+            if (reused) {
+                await cache.put(url, reused);
+                revisions[url] = revision;
+                return;
+            }
+            try {
+                const response = await fetch(url, { cache: FINGERPRINTED_RE.test(url) ? 'default' : 'no-cache' });
+                if (!response.ok) return;
+                await cache.put(url, cacheable(response));
+                revisions[url] = revision;
+            } catch {
+                // Left uncached; the next install retries it.
+            }
+        }));
+
+        await cache.put(REVISIONS_KEY, new Response(JSON.stringify(revisions), {
+            headers: { 'Content-Type': 'application/json' }
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+// Earlier precaches are only dropped once this version takes over.
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        for (const name of await caches.keys()) {
+            if (name !== PRECACHE && name !== RUNTIME) await caches.delete(name);
+        }
+        await self.clients.claim();
+    })());
+});
+
+async function cacheFirst(request) {
+    const cached = await caches.match(request);
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    if (response.ok) {
+        const cache = await caches.open(RUNTIME);
+        await cache.put(request, cacheable(response.clone()));
+        await trimCache(cache, RUNTIME_MAX_ENTRIES);
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, request) {
+    const url = new URL(request.url);
+    const key = url.origin + url.pathname; // Query strings (utm_*, ?post=) share one entry
+    const precached = ENTRIES.has(url.pathname);
+    const cache = await caches.open(precached ? PRECACHE : RUNTIME);
+    const cached = await cache.match(key);
+
+    const network = fetch(request).then(async (response) => {
+        if (response.ok && response.type === 'basic') {
+            await cache.put(key, cacheable(response.clone()));
+            if (!precached) await trimCache(cache, RUNTIME_MAX_ENTRIES);
+        }
+        return response;
+    });
+
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+    try {
+        return await network;
+    } catch (error) {
+        const fallback = request.mode === 'navigate' ? await caches.match(OFFLINE_FALLBACK) : null;
+        if (fallback) return fallback;
+        throw error;
+    }
+}
+
+self.addEventListener('fetch', (event) => {
+    const { request } = event;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (FINGERPRINTED_RE.test(url.pathname)) {
+        event.respondWith(cacheFirst(request));
+    } else if (request.mode === 'navigate' || ENTRIES.has(url.pathname)) {
+        event.respondWith(staleWhileRevalidate(event, request));
+    }
+});
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Startup budget for page-only rebuilds.
+
+Runs `generate_blog.py --pages` under `python -X importtime` and checks that:
+- markdown and Pillow are never imported (they belong to post/image stages),
+- the import phase stays under --import-budget milliseconds,
+- the whole run stays under --run-budget milliseconds (median of --runs).
+
+Exits non-zero when a budget is blown, so it can run in CI; `--json` prints
+the measurements for tracking over time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("markdown", "PIL")
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_imports(command: list[str]) -> tuple[float, list[tuple[str, float]], set[str]]:
+    """Return (total import ms, [(top-level module, cumulative ms)], every module imported)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *command],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    top_level = []
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        imported.add(match.group(4))
+        # Only sum outermost imports; nested ones are included in their parent.
+        if len(match.group(3)) == 1:
+            top_level.append((match.group(4), int(match.group(2)) / 1000))
+    return sum(ms for _, ms in top_level), top_level, imported
+
+
+def measure_run(command: list[str], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *command], cwd=ROOT, capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--import-budget", type=float, default=100.0, help="Max import time in ms")
+    parser.add_argument("--run-budget", type=float, default=250.0, help="Max median wall time in ms")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print measurements as JSON")
+    args = parser.parse_args()
+
+    command = ["generate_blog.py", "--pages"]
+    import_ms, modules, imported = measure_imports(command)
+    heavy = sorted(name for name in imported if name.split(".")[0] in HEAVY_MODULES)
+    run_ms = measure_run(command, args.runs)
+
+    failures = []
+    if heavy:
+        failures.append(f"heavy modules imported: {', '.join(heavy)}")
+    if import_ms > args.import_budget:
+        failures.append(f"imports took {import_ms:.1f} ms (budget {args.import_budget:.0f} ms)")
+    if run_ms > args.run_budget:
+        failures.append(f"run took {run_ms:.1f} ms (budget {args.run_budget:.0f} ms)")
+
+    if args.json:
+        print(json.dumps({
+            "command": " ".join(command),
+            "import_ms": round(import_ms, 1),
+            "run_ms": round(run_ms, 1),
+            "heavy_modules": heavy,
+            "slowest_imports": [
+                {"module": name, "ms": round(ms, 1)}
+                for name, ms in sorted(modules, key=lambda item: item[1], reverse=True)[:10]
+            ],
+            "ok": not failures,
+        }, indent=2))
+    else:
+        print(f"{' '.join(command)}: imports {import_ms:.1f} ms, run {run_ms:.1f} ms (median of {args.runs})")
+        for name, ms in sorted(modules, key=lambda item: item[1], reverse=True)[:10]:
+            print(f"  {ms:7.1f} ms  {name}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
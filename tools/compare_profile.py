@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare two `generate_blog.py --profile` reports (e.g. main vs. a PR).
+
+Prints stages and posts whose wall time grew by more than --threshold percent
+and --min-ms milliseconds, plus the slowest posts of the new run. Exits
+non-zero when anything regressed, so CI can flag it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+
+
+def load(path: str) -> dict:
+    return json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+
+
+def regressions(old: dict, new: dict, threshold: float, min_ms: float) -> list[tuple[str, float, float]]:
+    found = []
+    for name, totals in new.items():
+        before = old.get(name, {}).get("wall_ms")
+        after = totals["wall_ms"]
+        if before is None:
+            continue
+        if after - before >= min_ms and after > before * (1 + threshold / 100):
+            found.append((name, before, after))
+    return sorted(found, key=lambda item: item[2] - item[1], reverse=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline", help="Profile JSON from the base commit")
+    parser.add_argument("current", help="Profile JSON from the commit under test")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Allowed slowdown in percent")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="Ignore changes smaller than this")
+    parser.add_argument("--top", type=int, default=5, help="Slowest posts to list")
+    args = parser.parse_args()
+
+    old, new = load(args.baseline), load(args.current)
+    print(
+        f"{(old.get('commit') or '?')[:10]} -> {(new.get('commit') or '?')[:10]}: "
+        f"{old['total']['wall_ms']:.0f} ms -> {new['total']['wall_ms']:.0f} ms wall"
+    )
+
+    failed = False
+    for label, key in (("stage", "stages"), ("post", "posts")):
+        for name, before, after in regressions(old[key], new[key], args.threshold, args.min_ms):
+            failed = True
+            print(f"REGRESSION {label} {name}: {before:.1f} ms -> {after:.1f} ms (+{(after / before - 1) * 100:.0f}%)")
+
+    print("Slowest posts:")
+    for slug, totals in list(new["posts"].items())[:args.top]:
+        print(f"  {totals['wall_ms']:>10.1f} ms  {slug}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,239 @@ Small local dev server for this repo.
 Why not `python3 -m http.server`?
 - On some systems `.md` is served as `application/octet-stream`, which makes
   browsers show it as "binary"/garbled instead of readable text.
+- Pages are served with `Link: rel=preload` headers for their CSS/JS (from
+  preload-manifest.json, written by generate_blog.py); `--early-hints` also
+  sends them ahead of the response as `103 Early Hints`.
+- `--access-log FILE` replaces the per-request stderr line with structured
+  records (JSON or logfmt) buffered in memory and written in batches by a
+  background thread to a size-rotated file. `--log-sample` keeps a fraction of
+  them; requests slower than `--slow-ms` always go to a separate slow log.
+
+    python3 tools/serve.py --port 8000 --access-log .build-cache/access.log --log-sample 0.1
 """
 
 from __future__ import annotations
 
 import argparse
+import collections
+import json
 import os
 import pathlib
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
-from urllib.parse import urlsplit, urlunsplit
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+PRELOAD_MANIFEST_NAME = "preload-manifest.json"  # PRELOAD_MANIFEST in sitegen/config.py
+LOG_FLUSH_INTERVAL = 1.0  # Seconds between background flushes
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotate a log file past this size
+LOG_BACKUP_COUNT = 5  # Rotated files kept (FILE.1 ... FILE.5)
+
+
+def _format_link(entry: dict) -> str:
+    value = f"<{entry['href']}>; rel={entry['rel']}"
+    if entry.get("as"):
+        value += f"; as={entry['as']}"
+    return value
+
+
+class PreloadManifest:
+    """Page relpath -> `Link` header value, reloaded whenever the generator rewrites it."""
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.mtime_ns: int | None = None
+        self.links: dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def link_header(self, relpath: str) -> str | None:
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+        with self.lock:
+            if mtime_ns != self.mtime_ns:
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    data = {}
+                self.links = {
+                    page: ", ".join(_format_link(entry) for entry in entries)
+                    for page, entries in data.items()
+                }
+                self.mtime_ns = mtime_ns
+            return self.links.get(relpath)
+
+
+def _logfmt_value(value) -> str:
+    text = "-" if value is None else str(value)
+    if not text or any(c in text for c in ' "=\\'):
+        return json.dumps(text)
+    return text
+
+
+def format_record(record: dict, fmt: str) -> str:
+    if fmt == "logfmt":
+        return " ".join(f"{key}={_logfmt_value(value)}" for key, value in record.items())
+    return json.dumps(record, separators=(",", ":"))
+
+
+class RotatingFile:
+    """Append-only file that rolls over to FILE.1 ... FILE.N past `max_bytes`."""
+
+    def __init__(self, path: pathlib.Path, max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.stream = open(path, "a", encoding="utf-8")
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+        if self.stream.tell() >= self.max_bytes:
+            self._rollover()
+
+    def _rollover(self) -> None:
+        self.stream.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backup_count:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self.stream = open(self.path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+class AccessLog:
+    """Ring-buffered access records, formatted and written off the request path.
+
+    Request threads only append a dict to a bounded deque (oldest records are
+    dropped if the writer falls behind); a daemon thread drains both buffers
+    every LOG_FLUSH_INTERVAL, or sooner once one is half full.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        slow_path: pathlib.Path,
+        fmt: str = "json",
+        sample_rate: float = 1.0,
+        slow_ms: float = 500.0,
+        capacity: int = 10_000,
+    ):
+        self.fmt = fmt
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.capacity = capacity
+        self.files = {"access": RotatingFile(path), "slow": RotatingFile(slow_path)}
+        self.buffers = {name: collections.deque(maxlen=capacity) for name in self.files}
+        self.dropped = 0
+        self.wake = threading.Event()
+        self.stopping = False
+        self.writer = threading.Thread(target=self._run, name="access-log", daemon=True)
+        self.writer.start()
+
+    def record(self, record: dict) -> None:
+        targets = []
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            targets.append("access")
+        if record["duration_ms"] >= self.slow_ms:
+            targets.append("slow")
+        for name in targets:
+            buffer = self.buffers[name]
+            if len(buffer) == self.capacity:
+                self.dropped += 1
+            buffer.append(record)
+            if len(buffer) >= self.capacity // 2:
+                self.wake.set()
+
+    def _flush(self) -> None:
+        for name, buffer in self.buffers.items():
+            lines = []
+            while buffer:
+                lines.append(format_record(buffer.popleft(), self.fmt))
+            if lines:
+                self.files[name].write("\n".join(lines) + "\n")
+
+    def _run(self) -> None:
+        while not self.stopping:
+            self.wake.wait(LOG_FLUSH_INTERVAL)
+            self.wake.clear()
+            self._flush()
+
+    def close(self) -> None:
+        self.stopping = True
+        self.wake.set()
+        self.writer.join()
+        self._flush()
+        for file in self.files.values():
+            file.close()
+        if self.dropped:
+            print(f"access log: dropped {self.dropped} records (buffer full)", file=sys.stderr)
 
 
 class Handler(SimpleHTTPRequestHandler):
+    preloads: PreloadManifest
+    early_hints = False
+    access_log: AccessLog | None = None
+    _link_header: str | None = None
+
+    def handle_one_request(self) -> None:
+        if not self.access_log:
+            super().handle_one_request()
+            return
+
+        # Per request: keep-alive connections reuse the handler.
+        self.command = None
+        self._status: int | None = None
+        self._response_headers: dict[str, str] = {}
+        started = time.perf_counter()
+        super().handle_one_request()
+        if not self.command or self._status is None:
+            return  # Connection closed without a request
+        self.access_log.record({
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "method": self.command,
+            "path": self._request_path,
+            "status": self._status,
+            "bytes": int(self._response_headers.get("content-length", 0)),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            # Conditional GETs answered from the client's cache.
+            "cache": "hit" if self._status == 304 else "miss",
+            "encoding": self._response_headers.get("content-encoding", "identity"),
+        })
+
+    def parse_request(self) -> bool:
+        ok = super().parse_request()
+        # Before the clean-URL rewrite, so records show what was asked for.
+        self._request_path = getattr(self, "path", "")
+        return ok
+
+    def send_response_only(self, code: int, message: str | None = None) -> None:
+        if self.access_log and code >= 200:
+            self._status = code
+            self._response_headers = {}
+        super().send_response_only(code, message)
+
+    def send_header(self, keyword: str, value: str) -> None:
+        if self.access_log:
+            self._response_headers[keyword.lower()] = value
+        super().send_header(keyword, value)
+
+    def log_message(self, format: str, *args) -> None:
+        # Structured records replace the synchronous stderr line.
+        if not self.access_log:
+            super().log_message(format, *args)
+
     def guess_type(self, path: str):
         if path.endswith(".md"):
             return "text/markdown; charset=utf-8"
@@ -45,6 +266,26 @@ class Handler(SimpleHTTPRequestHandler):
             ("", "", candidate_path + ".html", split.query, split.fragment)
         )
 
+    def _page_relpath(self) -> str:
+        path = unquote(urlsplit(self.path).path)
+        if path.endswith("/"):
+            path += "index.html"
+        return path.lstrip("/")
+
+    def send_head(self):
+        self._link_header = self.preloads.link_header(self._page_relpath())
+        if self._link_header and self.early_hints and self.request_version != "HTTP/1.0":
+            self.send_response_only(103)
+            self.send_header("Link", self._link_header)
+            super().end_headers()
+        return super().send_head()
+
+    def end_headers(self) -> None:
+        if self._link_header:
+            self.send_header("Link", self._link_header)
+            self._link_header = None
+        super().end_headers()
+
     def do_GET(self) -> None:
         self._maybe_add_html_suffix()
         super().do_GET()
@@ -57,9 +298,35 @@ class Handler(SimpleHTTPRequestHandler):
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--port", type=int, default=80)
+    parser.add_argument("--early-hints", action="store_true", help="Send 103 Early Hints (switches to HTTP/1.1)")
+    parser.add_argument("--access-log", metavar="FILE", help="Write buffered structured access records to FILE instead of stderr")
+    parser.add_argument("--log-format", choices=["json", "logfmt"], default="json")
+    parser.add_argument("--log-sample", type=float, default=1.0, metavar="RATE", help="Fraction of requests to log (0-1)")
+    parser.add_argument("--log-buffer", type=int, default=10_000, metavar="N", help="Records held in memory between flushes")
+    parser.add_argument("--slow-ms", type=float, default=500.0, help="Always log requests at least this slow to the slow log")
+    parser.add_argument("--slow-log", metavar="FILE", help="Slow-request log (default: FILE.slow next to --access-log)")
     args = parser.parse_args()
+    if not args.access_log and (args.slow_log or args.log_sample != 1.0):
+        parser.error("--slow-log and --log-sample require --access-log")
+    if not 0 <= args.log_sample <= 1:
+        parser.error("--log-sample must be between 0 and 1")
 
     root = pathlib.Path(__file__).resolve().parents[1]
+    Handler.preloads = PreloadManifest(root / PRELOAD_MANIFEST_NAME)
+    if args.early_hints:
+        # 103 is an HTTP/1.1 status; file responses carry Content-Length, so keep-alive is safe.
+        Handler.protocol_version = "HTTP/1.1"
+        Handler.early_hints = True
+    if args.access_log:
+        access_path = pathlib.Path(args.access_log)
+        Handler.access_log = AccessLog(
+            access_path,
+            pathlib.Path(args.slow_log) if args.slow_log else access_path.with_name(access_path.name + ".slow"),
+            fmt=args.log_format,
+            sample_rate=args.log_sample,
+            slow_ms=args.slow_ms,
+            capacity=args.log_buffer,
+        )
 
     server = ThreadingHTTPServer(
         ("0.0.0.0", args.port),
@@ -68,7 +335,14 @@ def main() -> None:
         ),
     )
     print(f"Serving {root} on http://localhost:{args.port}")
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if Handler.access_log:
+            Handler.access_log.close()
 
 
 if __name__ == "__main__":
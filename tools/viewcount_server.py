@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the view-count API, for offline work on the site and builds.
+
+Endpoints (same contract as api.gusarich.com):
+- GET /api/viewcount/<slug>       -> {"views": 12}
+- GET /api/viewcount?ids=a,b,c    -> {"views": {"a": 12, "b": 0, "c": 3}}
+
+Counts come from a JSON file (`{slug: views}`, re-read on cache misses) or,
+with --upstream, from another server's batched endpoint. Either way they are
+kept in a per-slug TTL cache, so a list page costs at most one upstream call
+per TTL window.
+
+    python3 tools/viewcount_server.py --data views.json --port 8001
+    python3 generate_blog.py --pages --views http://localhost:8001
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+MAX_IDS = 100  # Matches VIEWCOUNT_BATCH_LIMIT in sitegen/config.py
+
+
+def _parse_counts(data) -> dict[str, int]:
+    # Same rules as sitegen/viewcounts.py: the API shape or a bare {slug: views}.
+    if isinstance(data, dict) and isinstance(data.get("views"), dict):
+        data = data["views"]
+    if not isinstance(data, dict):
+        raise ValueError("expected an object mapping slugs to view counts")
+    return {str(slug): int(views) for slug, views in data.items() if isinstance(views, (int, float))}
+
+
+class ViewCountStore:
+    def __init__(self, data_file: pathlib.Path | None, upstream: str | None, ttl: float):
+        self.data_file = data_file
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.ttl = ttl
+        self.cache: dict[str, tuple[float, int]] = {}  # slug -> (expires at, views)
+        self.lock = threading.Lock()
+
+    def _load(self, slugs: list[str]) -> dict[str, int]:
+        if self.upstream:
+            ids = ",".join(quote(slug, safe="") for slug in slugs)
+            with urllib.request.urlopen(f"{self.upstream}/api/viewcount?ids={ids}", timeout=10) as response:
+                data = _parse_counts(json.load(response))
+        elif self.data_file and self.data_file.exists():
+            data = _parse_counts(json.loads(self.data_file.read_text(encoding="utf-8")))
+        else:
+            data = {}
+        return {slug: data.get(slug, 0) for slug in slugs}
+
+    def get_many(self, slugs: list[str]) -> dict[str, int]:
+        now = time.monotonic()
+        with self.lock:
+            fresh = {slug: entry[1] for slug in slugs if (entry := self.cache.get(slug)) and entry[0] > now}
+        missing = [slug for slug in slugs if slug not in fresh]
+        if missing:
+            loaded = self._load(missing)
+            with self.lock:
+                for slug, views in loaded.items():
+                    self.cache[slug] = (now + self.ttl, views)
+            fresh.update(loaded)
+        return {slug: fresh[slug] for slug in slugs}
+
+
+class Handler(BaseHTTPRequestHandler):
+    store: ViewCountStore
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        # Only answers are cacheable; errors must not outlive the problem.
+        self.send_header("Cache-Control", f"public, max-age={int(self.store.ttl)}" if status == 200 else "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        try:
+            self._route()
+        except (OSError, ValueError) as e:  # URLError and timeouts are OSErrors
+            self._send_json(502, {"error": f"view counts unavailable: {e}"})
+
+    def _route(self) -> None:
+        split = urlsplit(self.path)
+        path = split.path.rstrip("/")
+
+        if path == "/api/viewcount":
+            raw_ids = parse_qs(split.query).get("ids", [""])[0]
+            slugs = list(dict.fromkeys(slug for slug in raw_ids.split(",") if slug))
+            if not slugs or len(slugs) > MAX_IDS:
+                self._send_json(400, {"error": f"ids must list 1-{MAX_IDS} slugs"})
+                return
+            self._send_json(200, {"views": self.store.get_many(slugs)})
+        elif path.startswith("/api/viewcount/"):
+            slug = unquote(path[len("/api/viewcount/"):])
+            self._send_json(200, {"views": self.store.get_many([slug])[slug]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8001)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--data", metavar="FILE", help="JSON file mapping slugs to view counts")
+    source.add_argument("--upstream", metavar="URL", help="Proxy another view-count API's batched endpoint")
+    parser.add_argument("--ttl", type=float, default=300.0, help="Seconds to cache each count")
+    args = parser.parse_args()
+
+    Handler.store = ViewCountStore(pathlib.Path(args.data) if args.data else None, args.upstream, args.ttl)
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), Handler)
+    print(f"Serving view counts from {args.upstream or args.data or 'zeros'} on http://localhost:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()